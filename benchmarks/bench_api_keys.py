@@ -0,0 +1,88 @@
+# pylint: disable=protected-access
+"""Crawl throughput with one client spreading its requests over 1, 2, ... API keys.
+
+Worker threads look up match ids for `--seconds` against the local mock server, which advertises an application limit
+of `--app_limit` requests per second per key. Throughput should grow linearly with the number of keys.
+
+Usage:
+python -m benchmarks.bench_api_keys --max_keys 4 --app_limit 20 --workers 16 --seconds 5
+"""
+
+import os
+import threading
+import time
+
+from absl import app
+from absl import flags
+from loguru import logger
+
+from benchmarks import mock_server
+from riot import client
+from riot.utils import api_keys
+from riot.utils import connection_pool
+from riot.utils import platform_and_region
+from riot.utils import types
+
+flags.DEFINE_integer("max_keys", 4, "largest number of API keys to crawl with")
+flags.DEFINE_integer("app_limit", 20, "requests per second per key the mock server advertises")
+flags.DEFINE_integer("workers", 16, "crawling threads")
+flags.DEFINE_float("seconds", 5.0, "duration of every run")
+
+FLAGS = flags.FLAGS
+
+_REGION_CONFIG = {
+    "game_type": types.GameType.TFT,
+    "version_type": types.VersionType.V1,
+    "region": platform_and_region.Region.ASIA,
+}
+
+
+def _run(server: mock_server.MockRiotServer, keys: int) -> float:
+    riot_api_client = client.RiotApiClient(
+        api_key_pool=api_keys.ApiKeyPool([f"RGAPI-{keys}-{i}" for i in range(keys)]),
+        pool_config=connection_pool.PoolConfig(max_connections=FLAGS.workers),
+    )
+    riot_api_client._api_base = server.api_base
+    # Learn the advertised limits of every key before timing anything.
+    for i in range(keys):
+        riot_api_client._get_match_ids_by_puuid(
+            f"warm-up-{i}", start=0, start_time=0, end_time=1, count=20, **_REGION_CONFIG
+        )
+    # Then wait for the windows the warm-up requests counted against to end.
+    time.sleep(1.0)
+
+    deadline = time.perf_counter() + FLAGS.seconds
+    calls = []
+
+    def crawl(worker: int) -> None:
+        i = worker
+        while time.perf_counter() < deadline:
+            riot_api_client._get_match_ids_by_puuid(
+                f"puuid-{i}", start=0, start_time=0, end_time=1, count=20, **_REGION_CONFIG
+            )
+            calls.append(i)
+            i += FLAGS.workers
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=crawl, args=(i,)) for i in range(FLAGS.workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(calls) / (time.perf_counter() - started)
+
+
+def main(_):
+    os.environ.setdefault("RIOT_API_KEY", "benchmark")
+    logger.disable("riot")
+    with mock_server.MockRiotServer(latency=0.005, app_rate_limit=f"{FLAGS.app_limit}:1") as server:
+        logger.info(f"{FLAGS.workers} workers, {FLAGS.app_limit} requests/s per key")
+        baseline = None
+        for keys in range(1, FLAGS.max_keys + 1):
+            throughput = _run(server, keys)
+            baseline = baseline or throughput
+            logger.info(f"{keys} key(s): {throughput:6.1f} calls/s  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,193 @@
+# pylint: disable=protected-access
+"""Client throughput, latency and parse cost against a local mock Riot API server.
+
+Every case drives one client method through the real `_request` / `_fetch` / DTO path. Parse cost is the JSON
+decode and DTO time reported by the client's metrics hooks.
+
+Usage:
+python -m benchmarks.bench_client --calls 500 --workers 8 --latency_ms 20 --throttle_every 50
+"""
+
+import asyncio
+from concurrent import futures
+import contextvars
+import dataclasses
+import os
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+from absl import app
+from absl import flags
+from loguru import logger
+
+from benchmarks import mock_server
+from riot import async_client
+from riot import client
+from riot.utils import connection_pool
+from riot.utils import metrics
+from riot.utils import platform_and_region
+from riot.utils import search
+from riot.utils import types
+
+flags.DEFINE_integer("calls", 500, "calls per client method")
+flags.DEFINE_integer("workers", 8, "concurrent callers (threads for the sync client, tasks for the async client)")
+flags.DEFINE_float("latency_ms", 20.0, "server-side latency of every response")
+flags.DEFINE_integer("throttle_every", 0, "answer every n-th request with a 429, never if 0")
+flags.DEFINE_float("retry_after", 0.0, "Retry-After seconds of injected 429s")
+flags.DEFINE_bool("warm_up", False, "open every client's connections before its first timed call")
+
+FLAGS = flags.FLAGS
+
+_PLATFORM_CONFIG = {
+    "game_type": types.GameType.TFT,
+    "version_type": types.VersionType.V1,
+    "platform": platform_and_region.Platform.KR,
+}
+_REGION_CONFIG = {
+    "game_type": types.GameType.TFT,
+    "version_type": types.VersionType.V1,
+    "region": platform_and_region.Region.ASIA,
+}
+_SEARCH_CONFIG = search.SearchConfig.load_default_config(
+    platform=platform_and_region.Platform.KR, region=platform_and_region.Region.ASIA
+)
+
+
+_PARSE_TIME = contextvars.ContextVar("parse_time", default=0.0)
+
+
+class _ParseTimer(metrics.MetricsHook):
+    """Accumulates JSON decode and DTO parse time of the current call (thread or task)."""
+
+    def on_request(self, event: metrics.RequestEvent) -> None:
+        _PARSE_TIME.set(_PARSE_TIME.get() + event.decode_time)
+
+    def on_fetch(self, event: metrics.FetchEvent) -> None:
+        _PARSE_TIME.set(_PARSE_TIME.get() + event.parse_time)
+
+
+@dataclasses.dataclass
+class _Timings:
+    latencies: list[float] = dataclasses.field(default_factory=list)
+    parse_times: list[float] = dataclasses.field(default_factory=list)
+
+    def record(self, started: float) -> None:
+        self.latencies.append(time.perf_counter() - started)
+        self.parse_times.append(_PARSE_TIME.get())
+
+    def report(self, name: str, elapsed: float, requests: int) -> None:
+        percentiles = statistics.quantiles(self.latencies, n=100)
+        parse = statistics.fmean(self.parse_times)
+        logger.info(
+            f"{name:<36} {len(self.latencies) / elapsed:8.1f} calls/s {requests / elapsed:8.1f} req/s  "
+            f"p50 {percentiles[49] * 1e3:7.1f} ms  p99 {percentiles[98] * 1e3:7.1f} ms  parse {parse * 1e6:8.1f} us"
+        )
+
+
+def _pool_config() -> connection_pool.PoolConfig:
+    return connection_pool.PoolConfig(max_connections=FLAGS.workers)
+
+
+def _report_pools(pool_stats: list[connection_pool.PoolStats]) -> None:
+    opened = sum(stats.connections_opened for stats in pool_stats)
+    requests = sum(stats.requests for stats in pool_stats)
+    logger.info(f"{'':<36} {opened} connections opened for {requests} requests")
+
+
+def _run_sync(server: mock_server.MockRiotServer, name: str, call: Callable[[client.RiotApiClient, int], Any]) -> None:
+    riot_api_client = client.RiotApiClient(metrics_hooks=[_ParseTimer()], pool_config=_pool_config())
+    riot_api_client._api_base = server.api_base
+    if FLAGS.warm_up:
+        riot_api_client.warm_up(_SEARCH_CONFIG)
+    timings = _Timings()
+
+    def one(i: int) -> None:
+        _PARSE_TIME.set(0.0)
+        started = time.perf_counter()
+        call(riot_api_client, i)
+        timings.record(started)
+
+    requests_before = server.stats()["requests"]
+    started = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=FLAGS.workers) as executor:
+        list(executor.map(one, range(FLAGS.calls)))
+    elapsed = time.perf_counter() - started
+    timings.report(name, elapsed, server.stats()["requests"] - requests_before)
+    _report_pools(riot_api_client.pool_stats())
+
+
+def _run_async(
+    server: mock_server.MockRiotServer,
+    name: str,
+    call: Callable[[async_client.AsyncRiotApiClient, int], Awaitable[Any]],
+) -> None:
+    async def run() -> tuple[_Timings, float, list[connection_pool.PoolStats]]:
+        timings = _Timings()
+        # Same number of concurrent callers as the sync benchmark, so latencies do not include queueing.
+        callers = asyncio.Semaphore(FLAGS.workers)
+        async with async_client.AsyncRiotApiClient(
+            max_concurrency=FLAGS.workers, metrics_hooks=[_ParseTimer()], pool_config=_pool_config()
+        ) as riot_api_client:
+            riot_api_client._api_base = server.api_base
+            if FLAGS.warm_up:
+                await riot_api_client.warm_up(_SEARCH_CONFIG)
+
+            async def one(i: int) -> None:
+                async with callers:
+                    _PARSE_TIME.set(0.0)
+                    started = time.perf_counter()
+                    await call(riot_api_client, i)
+                    timings.record(started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(FLAGS.calls)))
+            return timings, time.perf_counter() - started, riot_api_client.pool_stats()
+
+    requests_before = server.stats()["requests"]
+    timings, elapsed, pool_stats = asyncio.run(run())
+    timings.report(name, elapsed, server.stats()["requests"] - requests_before)
+    _report_pools(pool_stats)
+
+
+def main(_):
+    os.environ.setdefault("RIOT_API_KEY", "benchmark")
+    # Injected 429s would log a retry warning each.
+    logger.disable("riot")
+    sync_cases = {
+        "get_league_entries_by_tier(master)": lambda c, i: c.get_league_entries_by_tier(
+            types.TierType.MASTER, **_PLATFORM_CONFIG
+        ),
+        "get_league_entries_by_tier(GOLD)": lambda c, i: c.get_league_entries_by_tier(
+            types.TierType.GOLD, page=i % 3 + 1, **_PLATFORM_CONFIG
+        ),
+        "_get_summoner_data_by_summoner_id": lambda c, i: c._get_summoner_data_by_summoner_id(
+            f"summoner-{i}", **_PLATFORM_CONFIG
+        ),
+        "_get_match_ids_by_puuid": lambda c, i: c._get_match_ids_by_puuid(
+            f"puuid-{i}", start=0, start_time=0, end_time=1, count=20, **_REGION_CONFIG
+        ),
+        "_get_match_data_by_match_id": lambda c, i: c._get_match_data_by_match_id(f"KR_{i}", **_REGION_CONFIG),
+        # Callers racing for the same few matches share in-flight requests.
+        "_get_match_data_by_match_id(hot)": lambda c, i: c._get_match_data_by_match_id(f"KR_{i % 4}", **_REGION_CONFIG),
+    }
+    async_cases = {
+        "async _get_match_data_by_match_id": lambda c, i: c._get_match_data_by_match_id(f"KR_{i}", **_REGION_CONFIG),
+    }
+
+    with mock_server.MockRiotServer(
+        latency=FLAGS.latency_ms / 1e3, throttle_every=FLAGS.throttle_every, retry_after=FLAGS.retry_after
+    ) as server:
+        logger.info(
+            f"{FLAGS.calls} calls per method, {FLAGS.workers} workers, {FLAGS.latency_ms} ms latency, "
+            f"429 every {FLAGS.throttle_every or 'never'}"
+        )
+        for name, call in sync_cases.items():
+            _run_sync(server, name, call)
+        for name, call in async_cases.items():
+            _run_async(server, name, call)
+        logger.info(f"Server: {server.stats()}")
+
+
+if __name__ == "__main__":
+    app.run(main)
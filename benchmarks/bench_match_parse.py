@@ -0,0 +1,152 @@
+"""Per-match decode + DTO construction cost, and the cost of a filter reading a few fields eagerly, lazily or projected.
+
+Usage:
+python -m benchmarks.bench_match_parse --iterations 2000 --batch 500
+"""
+
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from absl import app
+from absl import flags
+from loguru import logger
+import orjson
+
+from benchmarks import payloads
+from riot.utils import dto
+
+flags.DEFINE_integer("iterations", 2000, "number of matches to parse per measurement")
+flags.DEFINE_integer("batch", 500, "matches held at once when measuring the filter's peak memory")
+
+FLAGS = flags.FLAGS
+
+
+def _legacy_match_from_dict(d: dict) -> dto.MatchDto:
+    """The previous decoding path: every field converted by hand in Python, then validated by pydantic."""
+    info = d["info"]
+    return dto.MatchDto(
+        metadata=dto.MetadataDto(
+            data_version=d["metadata"]["data_version"],
+            match_id=d["metadata"]["match_id"],
+            participants_puuids=d["metadata"]["participants"],
+        ),
+        info=dto.InfoDto(
+            game_datetime=float(info["game_datetime"]),
+            game_length=float(info["game_length"]),
+            game_variation=info.get("game_variation", None),
+            game_version=info["game_version"],
+            participants=[
+                dto.ParticipantDto(
+                    augments=p.get("augments", []),
+                    gold_left=int(p["gold_left"]),
+                    last_round=int(p["last_round"]),
+                    level=int(p["level"]),
+                    placement=int(p["placement"]),
+                    players_eliminated=int(p["players_eliminated"]),
+                    puuid=p["puuid"],
+                    riot_id_game_name=p.get("riotIdGameName", None),
+                    riot_id_tag_line=p.get("riotIdTagline", None),
+                    time_eliminated=float(p["time_eliminated"]),
+                    total_damage_to_players=int(p["total_damage_to_players"]),
+                    traits=[
+                        dto.TraitDto(
+                            name=t["name"],
+                            num_units=int(t["num_units"]),
+                            style=int(t["style"]),
+                            tier_current=int(t["tier_current"]),
+                            tier_total=int(t["tier_total"]),
+                        )
+                        for t in p["traits"]
+                    ],
+                    units=[
+                        dto.UnitDto(
+                            items=u.get("items", []),
+                            item_names=u["itemNames"],
+                            character_id=u["character_id"],
+                            chosen=u.get("chosen", None),
+                            name=u["name"],
+                            rarity=int(u["rarity"]),
+                            tier=int(u["tier"]),
+                        )
+                        for u in p["units"]
+                    ],
+                )
+                for p in info["participants"]
+            ],
+            queue_id=int(info["queue_id"]),
+            tft_set_number=int(info["tft_set_number"]),
+        ),
+    )
+
+
+def _filter(match: Any) -> tuple[str, list[int]]:
+    """A typical filtering job: the patch and every placement."""
+    return match.info.game_version, [participant.placement for participant in match.info.participants]
+
+
+def _peak_memory(parse: Callable[[dict], Any], raws: list[bytes]) -> int:
+    """Peak bytes allocated decoding and filtering `raws`, results kept like a bulk fetch keeps them."""
+    tracemalloc.start()
+    matches = []
+    for raw in raws:
+        match = parse(orjson.loads(raw))
+        _filter(match)
+        matches.append(match)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _bench_filter(raw: bytes) -> None:
+    parsers = {
+        "MatchDto.from_dict": dto.MatchDto.from_dict,
+        "LazyMatchDto.from_dict": dto.LazyMatchDto.from_dict,
+        "MatchProjection.from_dict": dto.MatchProjection(["game_version", "placement"]).from_dict,
+    }
+    expected = _filter(dto.MatchDto.from_dict(orjson.loads(raw)))
+    assert all(_filter(parse(orjson.loads(raw))) == expected for parse in parsers.values())
+
+    logger.info(f"Filtering on game_version + placements, peak memory of {FLAGS.batch} matches")
+    baseline = None
+    raws = [orjson.dumps(payloads.make_match_payload(f"KR_{i}")) for i in range(FLAGS.batch)]
+    for name, parse in parsers.items():
+        per_match = (
+            min(timeit.repeat(lambda parse=parse: _filter(parse(orjson.loads(raw))), number=FLAGS.iterations, repeat=3))
+            / FLAGS.iterations
+        )
+        baseline = baseline or per_match
+        peak = _peak_memory(parse, raws)
+        logger.info(
+            f"{'orjson.loads(bytes) + ' + name:<50} {per_match * 1e6:8.1f} us/match  {baseline / per_match:4.1f}x"
+            f"  peak {peak / 2**20:6.1f} MiB"
+        )
+
+
+def main(_):
+    raw = orjson.dumps(payloads.make_match_payload("KR_7348987032"))
+    text = raw.decode()
+    assert _legacy_match_from_dict(json.loads(text)) == dto.MatchDto.from_json(raw)
+
+    candidates = {
+        "before: json.loads(text) + hand conversion": lambda: _legacy_match_from_dict(json.loads(text)),
+        "orjson.loads(bytes) + MatchDto.from_dict": lambda: dto.MatchDto.from_dict(orjson.loads(raw)),
+        "orjson.loads(bytes) + MatchDto.from_dict(strict)": lambda: dto.MatchDto.from_dict(
+            orjson.loads(raw), strict=True
+        ),
+        "MatchDto.from_json(bytes)": lambda: dto.MatchDto.from_json(raw),
+    }
+
+    logger.info(f"Parsing a {len(raw) / 1024:.1f} KiB match payload {FLAGS.iterations} times")
+    baseline = None
+    for name, fn in candidates.items():
+        per_match = min(timeit.repeat(fn, number=FLAGS.iterations, repeat=3)) / FLAGS.iterations
+        baseline = baseline or per_match
+        logger.info(f"{name:<50} {per_match * 1e6:8.1f} us/match  {baseline / per_match:4.1f}x")
+
+    _bench_filter(raw)
+
+
+if __name__ == "__main__":
+    app.run(main)
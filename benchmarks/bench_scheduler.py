@@ -0,0 +1,110 @@
+# pylint: disable=protected-access
+"""Interactive latency while a backfill saturates the rate budget, with and without a `RequestScheduler`.
+
+Backfill threads fetch matches in a loop through one client, an interactive caller looks up match ids of the same
+routing host through a second client sharing the rate limiter. Both run against the local mock server, which
+advertises an application limit of `--app_limit` requests per second.
+
+Usage:
+python -m benchmarks.bench_scheduler --backfill_workers 16 --app_limit 50 --interactive_calls 20
+"""
+
+import os
+import statistics
+import threading
+import time
+
+from absl import app
+from absl import flags
+from loguru import logger
+
+from benchmarks import mock_server
+from riot import client
+from riot.utils import connection_pool
+from riot.utils import platform_and_region
+from riot.utils import rate_limit
+from riot.utils import scheduler
+from riot.utils import types
+
+flags.DEFINE_integer("backfill_workers", 16, "threads fetching matches at backfill priority")
+flags.DEFINE_integer("app_limit", 50, "requests per second the mock server advertises as the application limit")
+flags.DEFINE_integer("interactive_calls", 20, "interactive lookups per run")
+flags.DEFINE_float("interactive_interval_ms", 250.0, "pause between interactive lookups")
+
+FLAGS = flags.FLAGS
+
+_REGION_CONFIG = {
+    "game_type": types.GameType.TFT,
+    "version_type": types.VersionType.V1,
+    "region": platform_and_region.Region.ASIA,
+}
+
+
+def _run(server: mock_server.MockRiotServer, use_scheduler: bool) -> None:
+    rate_limiter = rate_limit.RateLimiter()
+    request_scheduler = scheduler.RequestScheduler(rate_limiter) if use_scheduler else None
+
+    def make_client() -> client.RiotApiClient:
+        riot_api_client = client.RiotApiClient(
+            rate_limiter=rate_limiter,
+            request_scheduler=request_scheduler,
+            pool_config=connection_pool.PoolConfig(max_connections=FLAGS.backfill_workers),
+        )
+        riot_api_client._api_base = server.api_base
+        return riot_api_client
+
+    backfill_client, interactive_client = make_client(), make_client()
+    # Learn the advertised limits before timing anything.
+    interactive_client._get_match_ids_by_puuid("warm-up", start=0, start_time=0, end_time=1, count=20, **_REGION_CONFIG)
+
+    stop = threading.Event()
+    backfilled = []
+
+    def backfill(worker: int) -> None:
+        with scheduler.priority(scheduler.Priority.BACKFILL, flow="backfill"):
+            i = worker
+            while not stop.is_set():
+                backfill_client._get_match_data_by_match_id(f"KR_{i}", **_REGION_CONFIG)
+                backfilled.append(i)
+                i += FLAGS.backfill_workers
+
+    workers = [threading.Thread(target=backfill, args=(i,)) for i in range(FLAGS.backfill_workers)]
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    latencies = []
+    with scheduler.priority(scheduler.Priority.INTERACTIVE):
+        for i in range(FLAGS.interactive_calls):
+            time.sleep(FLAGS.interactive_interval_ms / 1e3)
+            call_started = time.perf_counter()
+            interactive_client._get_match_ids_by_puuid(
+                f"puuid-{i}", start=0, start_time=0, end_time=1, count=20, **_REGION_CONFIG
+            )
+            latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{'scheduler' if use_scheduler else 'shared limiter only':<20} interactive p50 {percentiles[49] * 1e3:7.1f} ms"
+        f"  p99 {percentiles[98] * 1e3:7.1f} ms  backfill {len(backfilled) / elapsed:6.1f} calls/s"
+    )
+
+
+def main(_):
+    os.environ.setdefault("RIOT_API_KEY", "benchmark")
+    logger.disable("riot")
+    with mock_server.MockRiotServer(latency=0.005, app_rate_limit=f"{FLAGS.app_limit}:1") as server:
+        logger.info(
+            f"{FLAGS.backfill_workers} backfill workers, {FLAGS.app_limit} requests/s, "
+            f"{FLAGS.interactive_calls} interactive calls"
+        )
+        _run(server, use_scheduler=False)
+        _run(server, use_scheduler=True)
+
+
+if __name__ == "__main__":
+    app.run(main)
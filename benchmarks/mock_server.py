@@ -0,0 +1,209 @@
+"""Local stand-in for the Riot API serving synthetic TFT payloads, for offline client benchmarks.
+
+The server runs in a forked process, so its request handling does not compete with the client under test for the
+GIL. Point a client at it through `api_base`:
+
+    with mock_server.MockRiotServer(latency=0.02) as server:
+        riot_api_client = client.RiotApiClient()
+        riot_api_client._api_base = server.api_base
+        ...
+        logger.info(server.stats())
+"""
+
+from http import server as http_server
+import multiprocessing
+import re
+import threading
+import time
+from typing import Any
+from urllib import parse
+from urllib import request
+import zlib
+
+import orjson
+
+from benchmarks import payloads
+
+_MATCH_POOL_SIZE = 32
+
+_ROUTES = [
+    ("apex_league", re.compile(r"^/[^/]+/tft/league/v1/(?P<tier>challenger|grandmaster|master)$")),
+    ("league_entries_by_summoner", re.compile(r"^/[^/]+/tft/league/v1/entries/by-summoner/(?P<summoner_id>[^/]+)$")),
+    ("league_entries", re.compile(r"^/[^/]+/tft/league/v1/entries/(?P<tier>[A-Z]+)/(?P<division>[IV]+)$")),
+    ("match_ids_by_puuid", re.compile(r"^/[^/]+/tft/match/v1/matches/by-puuid/(?P<puuid>[^/]+)/ids$")),
+    ("match", re.compile(r"^/[^/]+/tft/match/v1/matches/(?P<match_id>[^/]+)$")),
+]
+
+
+def _format_counts(limits: str, counts: dict[int, int]) -> str:
+    return ",".join(f"{counts.get(int(limit.split(':')[1]), 0)}:{limit.split(':')[1]}" for limit in limits.split(","))
+
+
+class MockRiotServer:
+    """Serves league, summoner, match id and match payloads with configurable latency and throttling.
+
+    Args:
+        latency: Seconds every response is delayed by.
+        app_rate_limit: `X-App-Rate-Limit` header value, counts are reported in `X-App-Rate-Limit-Count`. Like the
+            method limit it applies per API key (`X-Riot-Token`).
+        method_rate_limit: `X-Method-Rate-Limit` header value, counts are reported in `X-Method-Rate-Limit-Count`.
+        throttle_every: Answer every n-th request with a 429, never if 0.
+        retry_after: `Retry-After` seconds of injected 429s.
+        league_pages: Non-empty pages of every `entries/{tier}/{division}` listing.
+        page_size: Entries per league page.
+        match_ids: Match ids listed per puuid.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        app_rate_limit: str = "100000:1,1000000:120",
+        method_rate_limit: str = "100000:10",
+        throttle_every: int = 0,
+        retry_after: float = 0.0,
+        league_pages: int = 3,
+        page_size: int = 205,
+        match_ids: int = 100,
+    ):
+        self.latency = latency
+        self.app_rate_limit = app_rate_limit
+        self.method_rate_limit = method_rate_limit
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.league_pages = league_pages
+        self.page_size = page_size
+        self.match_ids = match_ids
+
+        # Rendered up front: match ids are served from a pool of payloads instead of generating one per request.
+        self._match_pool = [orjson.dumps(payloads.make_match_payload(f"KR_{i}")) for i in range(_MATCH_POOL_SIZE)]
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled": 0}
+        self._windows: dict[tuple[str, int], tuple[float, int]] = {}
+        self._httpd: http_server.ThreadingHTTPServer | None = None
+        self._process: multiprocessing.Process | None = None
+
+    def __enter__(self) -> "MockRiotServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def api_base(self) -> str:
+        """Replacement for `BaseRiotApiClient._api_base`, routing every platform and region to this server."""
+        return f"http://127.0.0.1:{self.port}/{{platform_or_region}}"
+
+    def start(self) -> None:
+        mock = self
+
+        class Handler(http_server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes, Nagle + delayed ACKs would add ~40 ms to every response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                status, headers, body = mock.handle(self.path, self.headers.get("X-Riot-Token", ""))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):  # pylint: disable=invalid-name
+                # Connection warm-up: answered without touching the stats or rate limit windows.
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        self._httpd = http_server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._process = multiprocessing.get_context("fork").Process(target=self._httpd.serve_forever, daemon=True)
+        self._process.start()
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+        if self._httpd is not None:
+            self._httpd.server_close()
+
+    def stats(self) -> dict[str, int]:
+        """Requests served and 429s injected so far, fetched from the server process."""
+        with request.urlopen(f"http://127.0.0.1:{self.port}/_stats") as response:
+            return orjson.loads(response.read())
+
+    def _count(self, api_key: str) -> tuple[int, dict[int, int]]:
+        """Count a request, returning the request number and the counts of every rate limit window of `api_key`."""
+        now = time.monotonic()
+        with self._lock:
+            self._stats["requests"] += 1
+            windows = {
+                int(limit.split(":")[1]) for limit in f"{self.app_rate_limit},{self.method_rate_limit}".split(",")
+            }
+            counts = {}
+            for window in windows:
+                started, count = self._windows.get((api_key, window), (now, 0))
+                if now - started >= window:
+                    started, count = now, 0
+                self._windows[(api_key, window)] = (started, count + 1)
+                counts[window] = count + 1
+            return self._stats["requests"], counts
+
+    def handle(self, path: str, api_key: str = "") -> tuple[int, dict[str, str], bytes]:
+        url = parse.urlsplit(path)
+        if url.path == "/_stats":
+            with self._lock:
+                return 200, {}, orjson.dumps(self._stats)
+
+        number, counts = self._count(api_key)
+        if self.latency:
+            time.sleep(self.latency)
+        headers = {
+            "X-App-Rate-Limit": self.app_rate_limit,
+            "X-App-Rate-Limit-Count": _format_counts(self.app_rate_limit, counts),
+            "X-Method-Rate-Limit": self.method_rate_limit,
+            "X-Method-Rate-Limit-Count": _format_counts(self.method_rate_limit, counts),
+        }
+        if self.throttle_every and number % self.throttle_every == 0:
+            with self._lock:
+                self._stats["throttled"] += 1
+            headers.update({"Retry-After": str(self.retry_after), "X-Rate-Limit-Type": "application"})
+            return 429, headers, orjson.dumps({"status": {"message": "Rate limit exceeded", "status_code": 429}})
+
+        for route, pattern in _ROUTES:
+            if match := pattern.match(url.path):
+                return 200, headers, self._body(route, match.groupdict(), parse.parse_qs(url.query))
+        return 404, headers, orjson.dumps({"status": {"message": "Data not found", "status_code": 404}})
+
+    def _body(self, route: str, args: dict[str, str], query: dict[str, list[str]]) -> bytes:
+        if route == "match":
+            return self._match_pool[zlib.crc32(args["match_id"].encode()) % _MATCH_POOL_SIZE]
+
+        body: Any
+        if route == "apex_league":
+            body = payloads.make_league_list_payload(args["tier"], self.page_size)
+        elif route == "league_entries":
+            page = int(query.get("page", ["1"])[0])
+            body = []
+            if page <= self.league_pages:
+                body = [
+                    payloads.make_league_entry_payload(
+                        f"{args['tier']}-{args['division']}-{page}-{i}", args["tier"], args["division"]
+                    )
+                    for i in range(self.page_size)
+                ]
+        elif route == "league_entries_by_summoner":
+            body = [payloads.make_league_entry_payload(args["summoner_id"])]
+        else:
+            start, count = int(query.get("start", ["0"])[0]), int(query.get("count", ["20"])[0])
+            body = [f"KR_{i}" for i in range(start, min(start + count, self.match_ids))]
+        return orjson.dumps(body)
@@ -0,0 +1,118 @@
+"""Synthetic Riot API payloads shaped like real responses, for offline benchmarks."""
+
+import random
+
+_TRAITS = [f"TFT12_Trait{i}" for i in range(30)]
+_UNITS = [f"TFT12_Champion{i}" for i in range(60)]
+_ITEMS = [f"TFT_Item_Item{i}" for i in range(50)]
+_AUGMENTS = [f"TFT12_Augment_Augment{i}" for i in range(200)]
+
+
+def make_match_payload(match_id: str, rng: random.Random | None = None) -> dict:
+    """Build a `tft/match/v1/matches/{id}` payload with 8 participants, ~9 units and ~10 traits each."""
+    rng = rng or random.Random(match_id)
+    participants = []
+    for placement in range(1, 9):
+        participants.append(
+            {
+                "augments": rng.sample(_AUGMENTS, 3),
+                "companion": {"content_ID": "00000000-0000-0000-0000-000000000000", "item_ID": 1, "skin_ID": 1},
+                "gold_left": rng.randint(0, 60),
+                "last_round": rng.randint(20, 40),
+                "level": rng.randint(6, 10),
+                "missions": {"PlayerScore2": rng.randint(0, 200)},
+                "placement": placement,
+                "players_eliminated": rng.randint(0, 3),
+                "puuid": f"{match_id}-puuid-{placement}-" + "x" * 50,
+                "riotIdGameName": f"player{placement}",
+                "riotIdTagline": "KR1",
+                "time_eliminated": rng.uniform(900, 2400),
+                "total_damage_to_players": rng.randint(0, 200),
+                "traits": [
+                    {
+                        "name": name,
+                        "num_units": rng.randint(1, 6),
+                        "style": rng.randint(0, 4),
+                        "tier_current": rng.randint(0, 3),
+                        "tier_total": 4,
+                    }
+                    for name in rng.sample(_TRAITS, 10)
+                ],
+                "units": [
+                    {
+                        "character_id": character_id,
+                        "itemNames": rng.sample(_ITEMS, rng.randint(0, 3)),
+                        "name": "",
+                        "rarity": rng.randint(0, 6),
+                        "tier": rng.randint(1, 3),
+                    }
+                    for character_id in rng.sample(_UNITS, 9)
+                ],
+            }
+        )
+
+    return {
+        "metadata": {
+            "data_version": "5",
+            "match_id": match_id,
+            "participants": [p["puuid"] for p in participants],
+        },
+        "info": {
+            "endOfGameResult": "GameComplete",
+            "gameCreation": 1730419000000,
+            "gameId": 7348987032,
+            "game_datetime": 1730419200000,
+            "game_length": rng.uniform(1800, 2400),
+            "game_version": "Linux Version 14.21.626.1234 (Oct 18 2024/12:00:00) [PUBLIC] <Releases/14.21>",
+            "mapId": 22,
+            "participants": participants,
+            "queue_id": 1100,
+            "queueId": 1100,
+            "tft_game_type": "standard",
+            "tft_set_core_name": "TFTSet12",
+            "tft_set_number": 12,
+        },
+    }
+
+
+def make_league_entry_payload(summoner_id: str, tier: str = "GOLD", rank: str = "I") -> dict:
+    """Build a `tft/league/v1/entries/...` item."""
+    return {
+        "puuid": f"puuid-{summoner_id}-" + "x" * 50,
+        "leagueId": "00000000-0000-0000-0000-000000000000",
+        "summonerId": summoner_id,
+        "queueType": "RANKED_TFT",
+        "tier": tier,
+        "rank": rank,
+        "leaguePoints": 42,
+        "wins": 30,
+        "losses": 70,
+        "hotStreak": False,
+        "veteran": False,
+        "freshBlood": False,
+        "inactive": False,
+    }
+
+
+def make_league_list_payload(tier: str, num_entries: int) -> dict:
+    """Build a `tft/league/v1/{challenger,grandmaster,master}` payload."""
+    return {
+        "leagueId": "00000000-0000-0000-0000-000000000000",
+        "tier": tier.upper(),
+        "name": "Synthetic League",
+        "queue": "RANKED_TFT",
+        "entries": [
+            {
+                "summonerId": f"{tier}-summoner-{i}",
+                "leaguePoints": 1000 - i,
+                "rank": "I",
+                "wins": 100,
+                "losses": 80,
+                "veteran": True,
+                "inactive": False,
+                "freshBlood": False,
+                "hotStreak": False,
+            }
+            for i in range(num_entries)
+        ],
+    }
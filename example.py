@@ -15,6 +15,7 @@ from loguru import logger
 import tqdm
 
 from riot import client
+from riot.utils import frontier
 from riot.utils import search
 from riot.utils import types
 
@@ -74,11 +75,14 @@ def main(_):
     # 5. Collect puuids from summoner data
     puuids = [d.puuid for d in summoner_data]
 
-    # 6. Get Match Ids by puuids.
-    match_ids = riot_api_client.get_match_ids_by_puuids(puuids, **default_search_config.as_dict())
+    # 6. Get Match Ids by puuids, merged into a frontier so that shared matches are fetched once.
+    match_frontier = frontier.MatchFrontier()
+    match_ids = riot_api_client.get_match_ids_by_puuids(
+        puuids, match_frontier=match_frontier, **default_search_config.as_dict()
+    )
 
-    # 7. Get Match Datas by match ids
-    match_data = riot_api_client.get_match_data_by_match_ids(match_ids[0], **default_search_config.as_dict())
+    # 7. Get Match Datas for every unique match id
+    match_data = riot_api_client.get_match_data_by_frontier(match_frontier, **default_search_config.as_dict())
 
     logger.info(
         f"""
@@ -0,0 +1,502 @@
+import asyncio
+import copy
+import functools
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+import aiohttp
+from loguru import logger
+import orjson
+from tqdm import asyncio as tqdm_asyncio
+
+from riot import client
+from riot.utils import cache
+from riot.utils import connection_pool
+from riot.utils import dto
+from riot.utils import errors
+from riot.utils import frontier
+from riot.utils import platform_and_region
+from riot.utils import rate_limit
+from riot.utils import search
+from riot.utils import single_flight
+from riot.utils import types
+
+_DEFAULT_MAX_CONCURRENCY = 10
+
+
+class _ConnectionCounter:
+    """Counts connections opened and requests sent through one session via aiohttp's tracing signals."""
+
+    def __init__(self):
+        self.connections_opened = 0
+        self.requests = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_request_start.append(self._on_request_start)
+        return trace_config
+
+    async def _on_connection_create_end(self, *_) -> None:
+        self.connections_opened += 1
+
+    async def _on_request_start(self, *_) -> None:
+        self.requests += 1
+
+
+class AsyncRiotApiClient(client.BaseRiotApiClient):
+    """Asyncio counterpart of `RiotApiClient`.
+
+    Bulk methods fan out over one shared `aiohttp.ClientSession` per routing host, bounded by `max_concurrency`,
+    so wall-clock time is driven by the rate limit instead of per-request latency.
+
+    Usage:
+        async with AsyncRiotApiClient() as riot_api_client:
+            match_data = await riot_api_client.get_match_data_by_match_ids(match_ids, **config.as_dict())
+    """
+
+    def __init__(self, max_concurrency: int = _DEFAULT_MAX_CONCURRENCY, **kwargs):
+        super().__init__(**kwargs)
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._sessions: dict[str | None, aiohttp.ClientSession] = {}
+        self._connection_counters: dict[str | None, _ConnectionCounter] = {}
+        self._single_flight = single_flight.AsyncSingleFlight() if self._coalesce_requests else None
+
+    async def __aenter__(self) -> "AsyncRiotApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _max_connections(self, routing_value: str | None) -> int:
+        return self._pool_config.max_connections_for(routing_value, self._max_concurrency)
+
+    def _get_session(self, routing_value: str | None = None) -> aiohttp.ClientSession:
+        """Session holding the connection pool of `routing_value`'s host."""
+        session = self._sessions.get(routing_value)
+        if session is None or session.closed:
+            timeout = aiohttp.ClientTimeout(total=client._DEFAULT_REQUEST_TIMEOUT)  # pylint: disable=protected-access
+            keep_alive = (
+                {"keepalive_timeout": self._pool_config.keep_alive_timeout}
+                if self._pool_config.keep_alive
+                else {"force_close": True}
+            )
+            counter = self._connection_counters[routing_value] = _ConnectionCounter()
+            session = self._sessions[routing_value] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections(routing_value), **keep_alive),
+                timeout=timeout,
+                trace_configs=[counter.trace_config()],
+            )
+        return session
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+
+    async def warm_up(self, config: search.SearchConfig, connections: int | None = None) -> None:
+        """Open connections to the hosts a crawl with `config` will use, so its first requests skip the handshakes.
+
+        Warm-up requests are unauthenticated `HEAD /` requests, they do not count against the API key's rate limits.
+
+        Args:
+            config: Search config of the crawl.
+            connections: Connections to open per host, its pool size by default.
+        """
+        for routing_value in self._routing_values(config):
+            url = self._host_url(routing_value)
+            session = self._get_session(routing_value)
+            count = connections or self._max_connections(routing_value)
+            await asyncio.gather(*(self._warm_up_request(session, url) for _ in range(count)))
+
+    @staticmethod
+    async def _warm_up_request(session: aiohttp.ClientSession, url: str) -> None:
+        try:
+            async with session.head(url) as response:
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            logger.warning(f"Warming up {url} failed: {err}")
+
+    def pool_stats(self) -> list[connection_pool.PoolStats]:
+        """Connections opened and requests sent per routing host."""
+        return [
+            connection_pool.PoolStats(
+                host=routing_value,
+                max_connections=self._max_connections(routing_value),
+                connections_opened=counter.connections_opened,
+                requests=counter.requests,
+            )
+            for routing_value, counter in self._connection_counters.items()
+        ]
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        rate_limit_key: rate_limit.RateLimitKey | None = None,
+        query_type: types.QueryType | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        policy = self._retry_policy(rate_limit_key)
+        routing_value = rate_limit_key.routing_value if rate_limit_key else None
+        requested_key, headers = rate_limit_key, kwargs.pop("headers", None)
+        rejected: dict[rate_limit.RateLimitKey, int] = {}
+        attempt = 0
+        while True:
+            rate_limit_key = self._api_key_for(requested_key, rejected)
+            async with self._semaphore:
+                limiter_wait = await self._slots.acquire_async(rate_limit_key) if rate_limit_key else 0.0
+                started = time.perf_counter()
+                try:
+                    async with self._get_session(routing_value).request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        headers=self._auth_headers(rate_limit_key, headers),
+                        **kwargs,
+                    ) as response:
+                        body = await response.read()
+                        latency = time.perf_counter() - started
+                        if rate_limit_key:
+                            self._rate_limiter.update_from_headers(rate_limit_key, response.headers)
+                        if response.ok:
+                            payload = orjson.loads(body)
+                            self._report_request(
+                                query_type,
+                                rate_limit_key,
+                                attempt,
+                                limiter_wait,
+                                latency,
+                                status_code=response.status,
+                                response_bytes=len(body),
+                                decode_time=time.perf_counter() - started - latency,
+                            )
+                            self._disable_rejected_keys(rejected)
+                            return payload
+
+                        self._report_request(
+                            query_type,
+                            rate_limit_key,
+                            attempt,
+                            limiter_wait,
+                            latency,
+                            status_code=response.status,
+                            response_bytes=len(body),
+                        )
+                        if self._retry_with_another_key(rate_limit_key, response.status, rejected):
+                            attempt += 1
+                            continue
+                        delay = policy.next_delay(attempt, response.status, response.headers)
+                        if delay is None:
+                            logger.error(errors.err_code_to_err_msg(response.status))
+                            response.raise_for_status()
+                        self._on_retryable_response(rate_limit_key, response.status, response.headers, delay)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                    self._report_request(
+                        query_type, rate_limit_key, attempt, limiter_wait, time.perf_counter() - started
+                    )
+                    if (delay := policy.next_delay(attempt, None)) is None:
+                        raise err
+                    logger.warning(f"{err.__class__.__name__} on {url}, retrying in {delay:.1f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        return await self._request(
+            "GET",
+            url,
+            params=params,
+            headers=headers,
+            **kwargs,
+        )
+
+    async def _get_and_cache(
+        self,
+        url: str,
+        params: dict | None,
+        query_type: types.QueryType,
+        rate_limit_key: rate_limit.RateLimitKey,
+        match_id: str | None,
+    ) -> Any:
+        payload = await self._get(url=url, params=params, rate_limit_key=rate_limit_key, query_type=query_type)
+        self._cache_response(query_type, url, params, match_id, payload)
+        return payload
+
+    async def _fetch(
+        self,
+        game_type: types.GameType,
+        query_type: types.QueryType,
+        version_type: types.VersionType,
+        platform: platform_and_region.Platform | None = None,
+        region: platform_and_region.Region | None = None,
+        extra_url: str | None = None,
+        params: dict | None = None,
+        endpoint: types.EndpointType | None = None,
+        parse: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        started = time.perf_counter()
+        url = self._resolve_url(
+            game_type=game_type,
+            query_type=query_type,
+            version_type=version_type,
+            platform=platform,
+            region=region,
+            extra_url=extra_url,
+        )
+
+        match_id = self._match_store_key(endpoint, extra_url)
+        payload = self._cached_response(query_type, url, params, match_id)
+        cached, coalesced = payload is not None, False
+        if not cached:
+            request = functools.partial(
+                self._get_and_cache,
+                url,
+                params,
+                query_type,
+                self._rate_limit_key(query_type, platform=platform, region=region, endpoint=endpoint),
+                match_id,
+            )
+            if self._single_flight is None:
+                payload = await request()
+            else:
+                payload, coalesced = await self._single_flight.do(cache.make_key(url, params), request)
+                if parse is None:
+                    # Unparsed payloads are returned as is, every caller, the leader included, gets its own copy of
+                    # the shared one.
+                    payload = copy.copy(payload)
+
+        fetched = time.perf_counter()
+        result = parse(payload) if parse else payload
+        self._report_fetch(
+            query_type,
+            endpoint,
+            str(platform or region),
+            fetched - started,
+            time.perf_counter() - fetched,
+            cached,
+            coalesced,
+        )
+        return result
+
+    async def get_league_entries_by_tier(
+        self,
+        tier: types.TierType,
+        game_type: types.GameType,
+        version_type: types.VersionType,
+        platform: platform_and_region.Platform,
+        division: types.DivisionType = types.DivisionType.I,
+        queue: str = "RANKED_TFT",
+        page: int = 1,
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> list[dto.LeagueEntryDto | dto.LeagueItemDto]:
+        if tier.lower() in [types.TierType.CHALLENGER, types.TierType.GRANDMASTER, types.TierType.MASTER]:
+            league = await self._fetch(
+                game_type=game_type,
+                query_type=types.QueryType.LEAGUE,
+                version_type=version_type,
+                platform=platform,
+                extra_url=tier.lower(),
+                params={"queue": queue},
+                endpoint=types.EndpointType.APEX_LEAGUE,
+                parse=dto.LeagueListDto.from_dict,
+            )
+            return league.entries
+
+        return await self._fetch(
+            game_type=game_type,
+            query_type=types.QueryType.LEAGUE,
+            version_type=version_type,
+            platform=platform,
+            extra_url=f"entries/{tier.upper()}/{division}",
+            params={"queue": queue, "page": page},
+            endpoint=types.EndpointType.LEAGUE_ENTRIES,
+            parse=self._parse_league_entries,
+        )
+
+    async def iter_league_entries_by_tier(
+        self,
+        tier: types.TierType,
+        divisions: Iterable[types.DivisionType] | None = None,
+        prefetch: bool = False,
+        **kwargs,
+    ) -> AsyncIterator[dto.LeagueEntryDto | dto.LeagueItemDto]:
+        kwargs.pop("division", None)
+        kwargs.pop("page", None)
+        if tier.lower() in [types.TierType.CHALLENGER, types.TierType.GRANDMASTER, types.TierType.MASTER]:
+            for entry in await self.get_league_entries_by_tier(tier, **kwargs):
+                yield entry
+            return
+
+        for division in divisions or types.DivisionType:
+            fetch_page = functools.partial(self.get_league_entries_by_tier, tier, division=division, **kwargs)
+            page = 1
+            entries = await fetch_page(page=page)
+            while entries:
+                next_entries = asyncio.create_task(fetch_page(page=page + 1)) if prefetch else None
+                try:
+                    for entry in entries:
+                        yield entry
+                except GeneratorExit:
+                    if next_entries:
+                        next_entries.cancel()
+                    raise
+
+                page += 1
+                entries = await next_entries if next_entries else await fetch_page(page=page)
+
+    async def _get_summoner_data_by_summoner_id(
+        self,
+        summoner_id: str,
+        game_type: types.GameType,
+        version_type: types.VersionType,
+        platform: platform_and_region.Platform,
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> dto.LeagueEntryDto:
+        return await self._fetch(
+            game_type=game_type,
+            query_type=types.QueryType.LEAGUE,
+            version_type=version_type,
+            platform=platform,
+            extra_url=f"entries/by-summoner/{summoner_id}",
+            endpoint=types.EndpointType.LEAGUE_ENTRIES_BY_SUMMONER,
+            parse=self._parse_ranked_tft_entry,
+        )
+
+    async def _get_match_ids_by_puuid(
+        self,
+        puuid: str,
+        game_type: types.GameType,
+        version_type: types.VersionType,
+        region: platform_and_region.Region,
+        start: int,
+        start_time: int,
+        end_time: int,
+        count: int,
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> list[str]:
+        return await self._fetch(
+            game_type=game_type,
+            query_type=types.QueryType.MATCH,
+            version_type=version_type,
+            region=region,
+            extra_url=f"matches/by-puuid/{puuid}/ids",
+            params={
+                "start": start,
+                "startTime": start_time,
+                "endTime": end_time,
+                "count": count,
+            },
+            endpoint=types.EndpointType.MATCH_IDS_BY_PUUID,
+        )
+
+    async def _fetch_many(
+        self,
+        fetch: Callable[..., Awaitable[Any]],
+        keys: list[str],
+        desc: str | None = None,
+        **kwargs,
+    ) -> errors.BulkResult:
+        """Run `fetch(key, **kwargs)` concurrently for every key, collecting failures instead of aborting."""
+
+        async def fetch_or_failure(key: str) -> Any:
+            try:
+                return await fetch(key, **kwargs)
+            except aiohttp.ClientResponseError as err:
+                return errors.FetchFailure(key=key, status_code=err.status, message=str(err))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                return errors.FetchFailure(key=key, status_code=None, message=str(err))
+
+        outcomes = await tqdm_asyncio.tqdm.gather(*[fetch_or_failure(key) for key in keys], desc=desc, disable=not desc)
+        result = errors.BulkResult(
+            [o for o in outcomes if not isinstance(o, errors.FetchFailure)],
+            failures=[o for o in outcomes if isinstance(o, errors.FetchFailure)],
+        )
+
+        if result.failures:
+            logger.warning(f"{len(result.failures)} of {len(outcomes)} requests failed")
+        return result
+
+    async def iter_match_ids_by_puuid(
+        self,
+        puuid: str,
+        start: int,
+        count: int,
+        max_match_ids: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        if count < 1:
+            raise ValueError(f"count must be at least 1, got {count}")
+        yielded = 0
+        while max_match_ids is None or yielded < max_match_ids:
+            page_size = count if max_match_ids is None else min(count, max_match_ids - yielded)
+            page = await self._get_match_ids_by_puuid(puuid, start=start, count=page_size, **kwargs)
+            for match_id in page:
+                yield match_id
+
+            yielded += len(page)
+            start += len(page)
+            if len(page) < page_size:
+                return
+
+    async def get_match_ids_by_puuids(
+        self,
+        puuids: list[str],
+        match_frontier: frontier.MatchFrontier | None = None,
+        **kwargs,
+    ) -> errors.BulkResult:
+        match_ids = await self._fetch_many(self._get_match_ids_by_puuid, puuids, **kwargs)
+        if match_frontier is not None:
+            failed = {failure.key for failure in match_ids.failures}
+            match_frontier.extend(match_ids, puuids=[puuid for puuid in puuids if puuid not in failed])
+        return match_ids
+
+    async def get_summoner_data_by_summoner_ids(self, summoner_ids: list[str], **kwargs) -> errors.BulkResult:
+        return await self._fetch_many(
+            self._get_summoner_data_by_summoner_id, summoner_ids, desc="Getting summoner data...", **kwargs
+        )
+
+    async def _get_match_data_by_match_id(
+        self,
+        match_id: str,
+        game_type: types.GameType,
+        version_type: types.VersionType,
+        region: platform_and_region.Region,
+        lazy: bool = False,
+        projection: dto.MatchProjection | None = None,
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> Any:
+        """Get a match as a `MatchDto`.
+
+        With `lazy`, as a `LazyMatchDto` validating fields on access, for jobs reading a few of them. With
+        `projection`, as a slim record of the projected fields only, for jobs keeping many matches in memory.
+        """
+        match_dto = dto.match_parser(lazy, projection)
+        return await self._fetch(
+            game_type=game_type,
+            query_type=types.QueryType.MATCH,
+            version_type=version_type,
+            region=region,
+            extra_url=f"matches/{match_id}",
+            endpoint=types.EndpointType.MATCH,
+            parse=functools.partial(match_dto.from_dict, strict=self._strict_validation),
+        )
+
+    async def get_match_data_by_match_ids(self, match_ids: list[str], **kwargs) -> errors.BulkResult:
+        return await self._fetch_many(
+            self._get_match_data_by_match_id, match_ids, desc="Getting match data...", **kwargs
+        )
+
+    async def get_match_data_by_frontier(self, match_frontier: frontier.MatchFrontier, **kwargs) -> errors.BulkResult:
+        match_data = await self.get_match_data_by_match_ids(match_frontier.pending(), **kwargs)
+        for match in match_data:
+            match_frontier.mark_fetched(match)
+        return match_data
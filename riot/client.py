@@ -1,55 +1,451 @@
-import json
-from typing import Any
+from concurrent import futures
+import contextlib
+import copy
+import functools
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
 from loguru import logger
+import orjson
+import requests
+from requests import adapters
 from requests.exceptions import HTTPError
-import requests_ratelimiter
 import tqdm
 
 from riot import settings
+from riot.utils import api_keys as api_keys_lib
+from riot.utils import archive
+from riot.utils import cache
+from riot.utils import connection_pool
 from riot.utils import dto
 from riot.utils import errors
+from riot.utils import frontier
+from riot.utils import match_store as match_store_lib
+from riot.utils import metrics
 from riot.utils import platform_and_region
+from riot.utils import rate_limit
+from riot.utils import retry
+from riot.utils import scheduler
+from riot.utils import search
+from riot.utils import single_flight
 from riot.utils import types
 
 _DEFAULT_REQUEST_TIMEOUT = 30
-_RATE_LIMIT_PER_SECOND = 20
-_RATE_LIMIT_PER_MINUTE = 45
 
 
-class RiotApiClient:
+class BaseRiotApiClient:
+    """Transport-agnostic parts of the Riot API client shared by sync and async clients."""
+
     _api_base = "https://{platform_or_region}.api.riotgames.com"
 
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: rate_limit.RateLimiter | None = None,
+        retry_policies: dict[types.EndpointType, retry.RetryPolicy] | None = None,
+        default_retry_policy: retry.RetryPolicy = retry.DEFAULT_RETRY_POLICY,
+        match_store: match_store_lib.MatchStore | None = None,
+        response_cache: cache.ResponseCache | None = None,
+        strict_validation: bool = False,
+        match_archive: archive.MatchArchiveWriter | None = None,
+        metrics_hooks: Iterable[metrics.MetricsHook] = (),
+        pool_config: connection_pool.PoolConfig | None = None,
+        coalesce_requests: bool = True,
+        request_scheduler: scheduler.RequestScheduler | None = None,
+        api_key_pool: api_keys_lib.ApiKeyPool | None = None,
+    ):
+        """
+        Args:
+            rate_limiter: Limiter to share with other clients, a new one is created if not given. Defaults to the
+                limiter of `request_scheduler` if one is given.
+            retry_policies: Retry policy overrides per endpoint.
+            default_retry_policy: Retry policy for endpoints without an override.
+            match_store: Persistent store serving `matches/{id}` payloads without touching the network.
+            response_cache: In-memory TTL cache for league / summoner responses.
+            strict_validation: Reject match payloads whose values have the wrong JSON type instead of coercing them.
+            match_archive: Archive every `matches/{id}` payload fetched from the network is appended to.
+            metrics_hooks: Sinks receiving a `RequestEvent` per HTTP attempt and a `FetchEvent` per fetch.
+            pool_config: Connection pool size and keep-alive per routing host.
+            coalesce_requests: Let concurrent fetches of the same URL and params share one in-flight request and its
+                decoded payload. Every caller still parses its own result, or gets its own copy of unparsed payloads.
+            request_scheduler: Scheduler handing out rate limit slots by `scheduler.priority`, to share with other
+                clients of the same key.
+            api_key_pool: API keys requests are spread over, to share with other clients. Built from the `api_key`
+                and `api_keys` settings if not given.
+        """
         self._settings = settings.load_settings()
-        self._api_key = self._settings.api_key
-        self._session = requests_ratelimiter.LimiterSession(
-            per_second=_RATE_LIMIT_PER_SECOND,
-            per_minute=_RATE_LIMIT_PER_MINUTE,
+        self._api_key_pool = api_key_pool or api_keys_lib.ApiKeyPool(self._settings.all_api_keys)
+        if request_scheduler is not None and rate_limiter not in (None, request_scheduler.rate_limiter):
+            raise ValueError("request_scheduler must schedule the slots of rate_limiter")
+        self._rate_limiter = rate_limiter or (
+            request_scheduler.rate_limiter if request_scheduler is not None else rate_limit.RateLimiter()
         )
+        # Hands out rate limit slots: through the scheduler's queue if there is one.
+        self._slots = self._rate_limiter if request_scheduler is None else request_scheduler
+        self._retry_policies = retry_policies or {}
+        self._default_retry_policy = default_retry_policy
+        self._match_store = match_store
+        self._response_cache = response_cache
+        self._strict_validation = strict_validation
+        self._match_archive = match_archive
+        self._metrics_hooks = list(metrics_hooks)
+        self._pool_config = pool_config or connection_pool.PoolConfig()
+        self._coalesce_requests = coalesce_requests
 
-    @property
-    def _headers(self) -> dict[str, str]:
+    def _auth_headers(
+        self, rate_limit_key: rate_limit.RateLimitKey | None, headers: dict[str, str] | None
+    ) -> dict[str, str]:
         return {
-            "X-Riot-Token": self._api_key,
+            **(headers or {}),
+            "X-Riot-Token": self._api_key_pool.api_key(rate_limit_key),
         }
 
+    def _api_key_for(
+        self,
+        rate_limit_key: rate_limit.RateLimitKey | None,
+        rejected: dict[rate_limit.RateLimitKey, int],
+    ) -> rate_limit.RateLimitKey | None:
+        """`rate_limit_key` bound to the API key of the next attempt, skipping the keys that rejected the request."""
+        if rate_limit_key is None:
+            return None
+        return self._api_key_pool.choose(self._rate_limiter, rate_limit_key, exclude=rejected)
+
+    def _retry_with_another_key(
+        self,
+        rate_limit_key: rate_limit.RateLimitKey | None,
+        status_code: int,
+        rejected: dict[rate_limit.RateLimitKey, int],
+    ) -> bool:
+        """Whether to retry a 401 / 403 right away with another key.
+
+        The rejecting key is only taken out of rotation once another key succeeded, see `_disable_rejected_keys`:
+        a request every key gets a 403 for is at fault itself.
+        """
+        if rate_limit_key is None or not self._api_key_pool.is_rejection(status_code):
+            return False
+        rejected[rate_limit_key] = status_code
+        return self._api_key_for(rate_limit_key, rejected) is not None
+
+    def _disable_rejected_keys(self, rejected: dict[rate_limit.RateLimitKey, int]) -> None:
+        for rate_limit_key, status_code in rejected.items():
+            self._api_key_pool.disable(rate_limit_key, status_code)
+
+    def _build_request_url(
+        self,
+        platform_or_region: str,
+        game_type: str,
+        query_type: str,
+        version_type: str,
+    ) -> str:
+        return "/".join(
+            [
+                self._api_base.format(platform_or_region=platform_or_region),
+                game_type,
+                query_type,
+                version_type,
+            ]
+        )
+
+    def _resolve_url(
+        self,
+        game_type: types.GameType,
+        query_type: types.QueryType,
+        version_type: types.VersionType,
+        platform: platform_and_region.Platform | None = None,
+        region: platform_and_region.Region | None = None,
+        extra_url: str | None = None,
+    ) -> str:
+        if (platform and region) or (not platform and not region):
+            logger.error("Only one of platform or region must be specified")
+        platform_or_region = platform or region
+
+        url = self._build_request_url(
+            platform_or_region=str(platform_or_region),
+            game_type=game_type,
+            query_type=query_type,
+            version_type=version_type,
+        )
+
+        if extra_url:
+            url = url + "/" + extra_url
+
+        return url
+
+    def _host_url(self, routing_value: str) -> str:
+        return self._api_base.format(platform_or_region=routing_value) + "/"
+
+    @staticmethod
+    def _routing_values(config: search.SearchConfig) -> list[str]:
+        """Routing hosts a crawl with `config` talks to: the platform for league data, the region for matches."""
+        return [str(config.platform), str(config.region)]
+
+    def _rate_limit_key(
+        self,
+        query_type: types.QueryType,
+        platform: platform_and_region.Platform | None = None,
+        region: platform_and_region.Region | None = None,
+        endpoint: types.EndpointType | None = None,
+    ) -> rate_limit.RateLimitKey:
+        return rate_limit.RateLimitKey(routing_value=str(platform or region), endpoint=str(endpoint or query_type))
+
+    def _match_store_key(self, endpoint: types.EndpointType | None, extra_url: str | None) -> str | None:
+        """Match id of a `matches/{id}` request to look up in the match store or archive, None for other requests."""
+        if self._match_store is None and self._match_archive is None:
+            return None
+        if endpoint != types.EndpointType.MATCH or not extra_url:
+            return None
+        return extra_url.rsplit("/", 1)[-1]
+
+    def _cached_response(
+        self,
+        query_type: types.QueryType,
+        url: str,
+        params: dict | None,
+        match_id: str | None,
+    ) -> dict[str, Any] | list | None:
+        if match_id and self._match_store is not None and (payload := self._match_store.get(match_id)) is not None:
+            return payload
+        if self._response_cache is not None and self._response_cache.ttl(query_type) > 0:
+            return self._response_cache.get(cache.make_key(url, params))
+        return None
+
+    def _cache_response(
+        self,
+        query_type: types.QueryType,
+        url: str,
+        params: dict | None,
+        match_id: str | None,
+        payload: dict[str, Any] | list,
+    ) -> None:
+        if match_id and self._match_store is not None:
+            self._match_store.put(match_id, payload)
+        if match_id and self._match_archive is not None:
+            self._match_archive.append(match_id, payload)
+        if self._response_cache is not None:
+            self._response_cache.put(cache.make_key(url, params), payload, query_type)
+
+    @staticmethod
+    def _parse_league_entries(entries: list[dict]) -> list[dto.LeagueEntryDto]:
+        return [dto.LeagueEntryDto.from_dict(e) for e in entries]
+
+    @staticmethod
+    def _parse_ranked_tft_entry(entries: list[dict]) -> dto.LeagueEntryDto:
+        tft_rank_entries = filter(lambda x: x["queueType"] == "RANKED_TFT", entries)
+        return dto.LeagueEntryDto.from_dict(list(tft_rank_entries)[0])
+
+    def _retry_policy(self, rate_limit_key: rate_limit.RateLimitKey | None) -> retry.RetryPolicy:
+        if rate_limit_key is None:
+            return self._default_retry_policy
+        return self._retry_policies.get(rate_limit_key.endpoint, self._default_retry_policy)
+
+    def _on_retryable_response(
+        self,
+        rate_limit_key: rate_limit.RateLimitKey | None,
+        status_code: int,
+        headers: Mapping[str, str],
+        delay: float,
+    ) -> None:
+        rate_limit_type = headers.get(retry.RATE_LIMIT_TYPE_HEADER)
+        if status_code == 429 and rate_limit_key:
+            self._rate_limiter.penalize(rate_limit_key, delay, rate_limit_type)
+        logger.warning(
+            f"{errors.err_code_to_err_msg(status_code)} ({status_code}"
+            f"{', ' + rate_limit_type if rate_limit_type else ''}), retrying in {delay:.1f}s"
+        )
+
+    def add_metrics_hook(self, hook: metrics.MetricsHook) -> None:
+        self._metrics_hooks.append(hook)
+
+    def _emit(self, event: metrics.RequestEvent | metrics.FetchEvent) -> None:
+        for hook in self._metrics_hooks:
+            try:
+                if isinstance(event, metrics.RequestEvent):
+                    hook.on_request(event)
+                else:
+                    hook.on_fetch(event)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning(f"Metrics hook {hook!r} failed: {err}")
+
+    def _report_request(
+        self,
+        query_type: types.QueryType | None,
+        rate_limit_key: rate_limit.RateLimitKey | None,
+        attempt: int,
+        limiter_wait: float,
+        latency: float,
+        status_code: int | None = None,
+        response_bytes: int = 0,
+        decode_time: float = 0.0,
+    ) -> None:
+        if not self._metrics_hooks:
+            return
+        self._emit(
+            metrics.RequestEvent(
+                query_type=str(query_type or ""),
+                endpoint=rate_limit_key.endpoint if rate_limit_key else "",
+                host=rate_limit_key.routing_value if rate_limit_key else "",
+                attempt=attempt,
+                limiter_wait=limiter_wait,
+                latency=latency,
+                status_code=status_code,
+                response_bytes=response_bytes,
+                decode_time=decode_time,
+            )
+        )
+
+    def _report_fetch(
+        self,
+        query_type: types.QueryType,
+        endpoint: types.EndpointType | None,
+        host: str,
+        latency: float,
+        parse_time: float,
+        cached: bool,
+        coalesced: bool = False,
+    ) -> None:
+        if not self._metrics_hooks:
+            return
+        self._emit(
+            metrics.FetchEvent(
+                query_type=str(query_type),
+                endpoint=str(endpoint or query_type),
+                host=host,
+                latency=latency,
+                parse_time=parse_time,
+                cached=cached,
+                coalesced=coalesced,
+            )
+        )
+
+
+class RiotApiClient(BaseRiotApiClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._session = requests.Session()
+        if not self._pool_config.keep_alive:
+            self._session.headers["Connection"] = "close"
+        self._adapters: dict[str | None, connection_pool.KeepAliveAdapter] = {}
+        self._adapters_lock = threading.Lock()
+        self._adapter(None)
+        self._single_flight = single_flight.SingleFlight() if self._coalesce_requests else None
+
+    def _adapter(self, routing_value: str | None) -> connection_pool.KeepAliveAdapter:
+        """Connection pool of `routing_value`'s host, mounted on the session on first use."""
+        adapter = self._adapters.get(routing_value)
+        if adapter is not None:
+            return adapter
+        with self._adapters_lock:
+            if routing_value not in self._adapters:
+                adapter = connection_pool.KeepAliveAdapter(
+                    pool_maxsize=self._pool_config.max_connections_for(routing_value, adapters.DEFAULT_POOLSIZE),
+                    pool_block=self._pool_config.block,
+                    keep_alive=self._pool_config.keep_alive,
+                    hosts=adapters.DEFAULT_POOLSIZE if routing_value is None else 1,
+                )
+                for prefix in ["https://", "http://"] if routing_value is None else [self._host_url(routing_value)]:
+                    self._session.mount(prefix, adapter)
+                self._adapters[routing_value] = adapter
+            return self._adapters[routing_value]
+
+    def warm_up(self, config: search.SearchConfig, connections: int | None = None) -> None:
+        """Open connections to the hosts a crawl with `config` will use, so its first requests skip the handshakes.
+
+        Warm-up requests are unauthenticated `HEAD /` requests, they do not count against the API key's rate limits.
+
+        Args:
+            config: Search config of the crawl.
+            connections: Connections to open per host, its pool size by default.
+        """
+        for routing_value in self._routing_values(config):
+            url = self._host_url(routing_value)
+            count = connections or self._adapter(routing_value).max_connections
+            with futures.ThreadPoolExecutor(max_workers=count) as executor:
+                list(executor.map(lambda _, url=url: self._warm_up_request(url), range(count)))
+
+    def _warm_up_request(self, url: str) -> None:
+        try:
+            self._session.head(url, timeout=_DEFAULT_REQUEST_TIMEOUT)
+        except requests.RequestException as err:
+            logger.warning(f"Warming up {url} failed: {err}")
+
+    def pool_stats(self) -> list[connection_pool.PoolStats]:
+        """Connections opened and requests sent per routing host."""
+        return [adapter.stats(routing_value) for routing_value, adapter in self._adapters.items()]
+
     def _request(
         self,
         method: str,
         url: str,
         params: dict | None = None,
         timeout: int = _DEFAULT_REQUEST_TIMEOUT,
+        rate_limit_key: rate_limit.RateLimitKey | None = None,
+        query_type: types.QueryType | None = None,
         **kwargs,
     ) -> dict[str, Any]:
-        try:
-            response = self._session.request(method=method, url=url, params=params, timeout=timeout, **kwargs)
-            response.raise_for_status()
-        except HTTPError as err:
-            logger.error(errors.err_code_to_err_msg(response.status_code))
-            raise err
+        policy = self._retry_policy(rate_limit_key)
+        requested_key, headers = rate_limit_key, kwargs.pop("headers", None)
+        rejected: dict[rate_limit.RateLimitKey, int] = {}
+        attempt = 0
+        while True:
+            rate_limit_key = self._api_key_for(requested_key, rejected)
+            limiter_wait = self._slots.acquire(rate_limit_key) if rate_limit_key else 0.0
+            if rate_limit_key:
+                self._adapter(rate_limit_key.routing_value)
+            started = time.perf_counter()
+            try:
+                response = self._session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    headers=self._auth_headers(rate_limit_key, headers),
+                    timeout=timeout,
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as err:
+                self._report_request(query_type, rate_limit_key, attempt, limiter_wait, time.perf_counter() - started)
+                if (delay := policy.next_delay(attempt, None)) is None:
+                    raise err
+                logger.warning(f"{err.__class__.__name__} on {url}, retrying in {delay:.1f}s")
+            else:
+                latency = time.perf_counter() - started
+                if rate_limit_key:
+                    self._rate_limiter.update_from_headers(rate_limit_key, response.headers)
+                if response.ok:
+                    payload = orjson.loads(response.content)
+                    self._report_request(
+                        query_type,
+                        rate_limit_key,
+                        attempt,
+                        limiter_wait,
+                        latency,
+                        status_code=response.status_code,
+                        response_bytes=len(response.content),
+                        decode_time=time.perf_counter() - started - latency,
+                    )
+                    self._disable_rejected_keys(rejected)
+                    return payload
 
-        return json.loads(response.text)
+                self._report_request(
+                    query_type,
+                    rate_limit_key,
+                    attempt,
+                    limiter_wait,
+                    latency,
+                    status_code=response.status_code,
+                    response_bytes=len(response.content),
+                )
+                if self._retry_with_another_key(rate_limit_key, response.status_code, rejected):
+                    attempt += 1
+                    continue
+
+                delay = policy.next_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    logger.error(errors.err_code_to_err_msg(response.status_code))
+                    response.raise_for_status()
+                self._on_retryable_response(rate_limit_key, response.status_code, response.headers, delay)
+
+            time.sleep(delay)
+            attempt += 1
 
     def _get(
         self,
@@ -68,21 +464,17 @@ class RiotApiClient:
             **kwargs,
         )
 
-    def _build_request_url(
+    def _get_and_cache(
         self,
-        platform_or_region: str,
-        game_type: str,
-        query_type: str,
-        version_type: str,
-    ) -> str:
-        return "/".join(
-            [
-                self._api_base.format(platform_or_region=platform_or_region),
-                game_type,
-                query_type,
-                version_type,
-            ]
-        )
+        url: str,
+        params: dict | None,
+        query_type: types.QueryType,
+        rate_limit_key: rate_limit.RateLimitKey,
+        match_id: str | None,
+    ) -> Any:
+        payload = self._get(url=url, params=params, rate_limit_key=rate_limit_key, query_type=query_type)
+        self._cache_response(query_type, url, params, match_id, payload)
+        return payload
 
     def _fetch(
         self,
@@ -93,22 +485,53 @@ class RiotApiClient:
         region: platform_and_region.Region | None = None,
         extra_url: str | None = None,
         params: dict | None = None,
-    ) -> dict[str, Any] | list:
-        if (platform and region) or (not platform and not region):
-            logger.error("Only one of platform or region must be specified")
-        platform_or_region = platform or region
-
-        url = self._build_request_url(
-            platform_or_region=str(platform_or_region),
+        endpoint: types.EndpointType | None = None,
+        parse: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """Get a payload from the caches or the API, and turn it into the result with `parse` if given."""
+        started = time.perf_counter()
+        url = self._resolve_url(
             game_type=game_type,
             query_type=query_type,
             version_type=version_type,
+            platform=platform,
+            region=region,
+            extra_url=extra_url,
         )
 
-        if extra_url:
-            url = url + "/" + extra_url
+        match_id = self._match_store_key(endpoint, extra_url)
+        payload = self._cached_response(query_type, url, params, match_id)
+        cached, coalesced = payload is not None, False
+        if not cached:
+            request = functools.partial(
+                self._get_and_cache,
+                url,
+                params,
+                query_type,
+                self._rate_limit_key(query_type, platform=platform, region=region, endpoint=endpoint),
+                match_id,
+            )
+            if self._single_flight is None:
+                payload = request()
+            else:
+                payload, coalesced = self._single_flight.do(cache.make_key(url, params), request)
+                if parse is None:
+                    # Unparsed payloads are returned as is, every caller, the leader included, gets its own copy of
+                    # the shared one.
+                    payload = copy.copy(payload)
 
-        return self._get(url=url, params=params, headers=self._headers)
+        fetched = time.perf_counter()
+        result = parse(payload) if parse else payload
+        self._report_fetch(
+            query_type,
+            endpoint,
+            str(platform or region),
+            fetched - started,
+            time.perf_counter() - fetched,
+            cached,
+            coalesced,
+        )
+        return result
 
     def get_league_entries_by_tier(
         self,
@@ -122,27 +545,61 @@ class RiotApiClient:
         **kwargs,  # pylint: disable=unused-argument
     ) -> list[dto.LeagueEntryDto | dto.LeagueItemDto]:
         if tier.lower() in [types.TierType.CHALLENGER, types.TierType.GRANDMASTER, types.TierType.MASTER]:
-            return dto.LeagueListDto.from_dict(
-                self._fetch(
-                    game_type=game_type,
-                    query_type=types.QueryType.LEAGUE,
-                    version_type=version_type,
-                    platform=platform,
-                    extra_url=tier.lower(),
-                    params={"queue": queue},
-                )
+            return self._fetch(
+                game_type=game_type,
+                query_type=types.QueryType.LEAGUE,
+                version_type=version_type,
+                platform=platform,
+                extra_url=tier.lower(),
+                params={"queue": queue},
+                endpoint=types.EndpointType.APEX_LEAGUE,
+                parse=dto.LeagueListDto.from_dict,
             ).entries
 
         else:
-            entries = self._fetch(
+            return self._fetch(
                 game_type=game_type,
                 query_type=types.QueryType.LEAGUE,
                 version_type=version_type,
                 platform=platform,
                 extra_url=f"entries/{tier.upper()}/{division}",
                 params={"queue": queue, "page": page},
+                endpoint=types.EndpointType.LEAGUE_ENTRIES,
+                parse=self._parse_league_entries,
             )
-            return [dto.LeagueEntryDto.from_dict(e) for e in entries]
+
+    def iter_league_entries_by_tier(
+        self,
+        tier: types.TierType,
+        divisions: Iterable[types.DivisionType] | None = None,
+        prefetch: bool = False,
+        **kwargs,
+    ) -> Iterator[dto.LeagueEntryDto | dto.LeagueItemDto]:
+        """Yield every entry of `tier`, walking all divisions and pages until an empty page comes back.
+
+        Args:
+            tier: Tier to walk. Apex tiers (master and above) are a single page.
+            divisions: Divisions to walk, all of them (I-IV) by default.
+            prefetch: Fetch the next page in a background thread while the current one is being consumed.
+            **kwargs: Forwarded to `get_league_entries_by_tier`.
+        """
+        kwargs.pop("division", None)
+        kwargs.pop("page", None)
+        if tier.lower() in [types.TierType.CHALLENGER, types.TierType.GRANDMASTER, types.TierType.MASTER]:
+            yield from self.get_league_entries_by_tier(tier, **kwargs)
+            return
+
+        with futures.ThreadPoolExecutor(max_workers=1) if prefetch else contextlib.nullcontext() as executor:
+            for division in divisions or types.DivisionType:
+                fetch_page = functools.partial(self.get_league_entries_by_tier, tier, division=division, **kwargs)
+                page = 1
+                entries = fetch_page(page=page)
+                while entries:
+                    next_entries = executor.submit(fetch_page, page=page + 1) if executor else None
+                    yield from entries
+
+                    page += 1
+                    entries = next_entries.result() if next_entries else fetch_page(page=page)
 
     def _get_summoner_data_by_summoner_id(
         self,
@@ -152,16 +609,15 @@ class RiotApiClient:
         platform: platform_and_region.Platform,
         **kwargs,  # pylint: disable=unused-argument
     ) -> dto.LeagueEntryDto:
-        entry = self._fetch(
+        return self._fetch(
             game_type=game_type,
             query_type=types.QueryType.LEAGUE,
             version_type=version_type,
             platform=platform,
             extra_url=f"entries/by-summoner/{summoner_id}",
+            endpoint=types.EndpointType.LEAGUE_ENTRIES_BY_SUMMONER,
+            parse=self._parse_ranked_tft_entry,
         )
-        tft_rank_entries = filter(lambda x: x["queueType"] == "RANKED_TFT", entry)
-
-        return dto.LeagueEntryDto.from_dict(list(tft_rank_entries)[0])
 
     def _get_match_ids_by_puuid(
         self,
@@ -187,20 +643,70 @@ class RiotApiClient:
                 "endTime": end_time,
                 "count": count,
             },
+            endpoint=types.EndpointType.MATCH_IDS_BY_PUUID,
         )
 
+    def _fetch_many(self, fetch: Callable[..., Any], keys: Iterable[str], **kwargs) -> errors.BulkResult:
+        """Call `fetch(key, **kwargs)` for every key, collecting failures instead of aborting the whole batch."""
+        result = errors.BulkResult()
+        for key in keys:
+            try:
+                result.append(fetch(key, **kwargs))
+            except HTTPError as err:
+                status_code = err.response.status_code if err.response is not None else None
+                result.failures.append(errors.FetchFailure(key=key, status_code=status_code, message=str(err)))
+            except requests.RequestException as err:
+                result.failures.append(errors.FetchFailure(key=key, status_code=None, message=str(err)))
+
+        if result.failures:
+            logger.warning(f"{len(result.failures)} of {len(result) + len(result.failures)} requests failed")
+        return result
+
+    def iter_match_ids_by_puuid(
+        self,
+        puuid: str,
+        start: int,
+        count: int,
+        max_match_ids: int | None = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """Yield every match id of `puuid` in the search window, one page at a time.
+
+        `start` is advanced by `count` until a short page comes back or `max_match_ids` ids were yielded. Pages are
+        fetched on demand, when the previous one is used up, so callers can stop early without fetching the rest.
+        """
+        if count < 1:
+            raise ValueError(f"count must be at least 1, got {count}")
+        yielded = 0
+        while max_match_ids is None or yielded < max_match_ids:
+            page_size = count if max_match_ids is None else min(count, max_match_ids - yielded)
+            page = self._get_match_ids_by_puuid(puuid, start=start, count=page_size, **kwargs)
+            yield from page
+
+            yielded += len(page)
+            start += len(page)
+            if len(page) < page_size:
+                return
+
     def get_match_ids_by_puuids(
         self,
         puuids: list[str],
+        match_frontier: frontier.MatchFrontier | None = None,
         **kwargs,
-    ) -> list[list[str]]:
-        return [self._get_match_ids_by_puuid(pid, **kwargs) for pid in puuids]
+    ) -> errors.BulkResult:
+        """Get match ids per puuid. If `match_frontier` is given, the lists are also merged into it."""
+        match_ids = self._fetch_many(self._get_match_ids_by_puuid, puuids, **kwargs)
+        if match_frontier is not None:
+            failed = {failure.key for failure in match_ids.failures}
+            match_frontier.extend(match_ids, puuids=[puuid for puuid in puuids if puuid not in failed])
+        return match_ids
 
-    def get_summoner_data_by_summoner_ids(self, summoner_ids: list[str], **kwargs) -> list[dto.LeagueEntryDto]:
-        summoner_data = []
-        for summoner_id in tqdm.tqdm(summoner_ids, desc="Getting summoner data..."):
-            summoner_data.append(self._get_summoner_data_by_summoner_id(summoner_id, **kwargs))
-        return summoner_data
+    def get_summoner_data_by_summoner_ids(self, summoner_ids: list[str], **kwargs) -> errors.BulkResult:
+        return self._fetch_many(
+            self._get_summoner_data_by_summoner_id,
+            tqdm.tqdm(summoner_ids, desc="Getting summoner data..."),
+            **kwargs,
+        )
 
     def _get_match_data_by_match_id(
         self,
@@ -208,20 +714,36 @@ class RiotApiClient:
         game_type: types.GameType,
         version_type: types.VersionType,
         region: platform_and_region.Region,
+        lazy: bool = False,
+        projection: dto.MatchProjection | None = None,
         **kwargs,  # pylint: disable=unused-argument
-    ) -> dto.MatchDto:
-        return dto.MatchDto.from_dict(
-            self._fetch(
-                game_type=game_type,
-                query_type=types.QueryType.MATCH,
-                version_type=version_type,
-                region=region,
-                extra_url=f"matches/{match_id}",
-            )
+    ) -> Any:
+        """Get a match as a `MatchDto`.
+
+        With `lazy`, as a `LazyMatchDto` validating fields on access, for jobs reading a few of them. With
+        `projection`, as a slim record of the projected fields only, for jobs keeping many matches in memory.
+        """
+        match_dto = dto.match_parser(lazy, projection)
+        return self._fetch(
+            game_type=game_type,
+            query_type=types.QueryType.MATCH,
+            version_type=version_type,
+            region=region,
+            extra_url=f"matches/{match_id}",
+            endpoint=types.EndpointType.MATCH,
+            parse=functools.partial(match_dto.from_dict, strict=self._strict_validation),
+        )
+
+    def get_match_data_by_match_ids(self, match_ids: list[str], **kwargs) -> errors.BulkResult:
+        return self._fetch_many(
+            self._get_match_data_by_match_id,
+            tqdm.tqdm(match_ids, desc="Getting match data..."),
+            **kwargs,
         )
 
-    def get_match_data_by_match_ids(self, match_ids: list[str], **kwargs) -> list[dto.MatchDto]:
-        match_data = []
-        for match_id in tqdm.tqdm(match_ids, desc="Getting match data..."):
-            match_data.append(self._get_match_data_by_match_id(match_id, **kwargs))
+    def get_match_data_by_frontier(self, match_frontier: frontier.MatchFrontier, **kwargs) -> errors.BulkResult:
+        """Fetch every pending match of `match_frontier` exactly once and mark it as fetched."""
+        match_data = self.get_match_data_by_match_ids(match_frontier.pending(), **kwargs)
+        for match in match_data:
+            match_frontier.mark_fetched(match)
         return match_data
@@ -0,0 +1,106 @@
+from http import server as http_server
+import json
+import threading
+from typing import Callable, Iterator
+
+import pytest
+
+
+def _make_match_payload(match_id: str = "KR_7348987032", placements: tuple[int, ...] = tuple(range(1, 9))) -> dict:
+    """Build a minimal but schema-complete `tft/match/v1/matches/{id}` payload."""
+    participants = [
+        {
+            "augments": ["TFT9_Augment_CyberneticBulk", "TFT9_Augment_Pandoras"],
+            "gold_left": 3,
+            "last_round": 30,
+            "level": 8,
+            "placement": placement,
+            "players_eliminated": 1,
+            "puuid": f"puuid-{match_id}-{placement}",
+            "riotIdGameName": f"player{placement}",
+            "riotIdTagline": "KR1",
+            "time_eliminated": 1800.5,
+            "total_damage_to_players": 120,
+            "traits": [
+                {"name": "Set12_Frost", "num_units": 3, "style": 1, "tier_current": 1, "tier_total": 4},
+                {"name": "Set12_Mage", "num_units": 4, "style": 2, "tier_current": 2, "tier_total": 4},
+            ],
+            "units": [
+                {
+                    "character_id": "TFT12_Ahri",
+                    "itemNames": ["TFT_Item_JeweledGauntlet", "TFT_Item_BlueBuff"],
+                    "name": "",
+                    "rarity": 4,
+                    "tier": 2,
+                },
+                {
+                    "character_id": "TFT12_Lux",
+                    "itemNames": [],
+                    "name": "",
+                    "rarity": 1,
+                    "tier": 3,
+                },
+            ],
+        }
+        for placement in placements
+    ]
+    return {
+        "metadata": {
+            "data_version": "5",
+            "match_id": match_id,
+            "participants": [p["puuid"] for p in participants],
+        },
+        "info": {
+            "game_datetime": 1730419200000,
+            "game_length": 2100.4,
+            "game_version": "Version 14.21.626.1234 (Oct 18 2024/12:00:00) [PUBLIC] ",
+            "participants": participants,
+            "queue_id": 1100,
+            "tft_set_number": 12,
+        },
+    }
+
+
+@pytest.fixture(name="make_match_payload")
+def setup_make_match_payload() -> Callable[..., dict]:
+    """Factory of match payloads, e.g. `make_match_payload("KR_1", placements=(1, 2))`."""
+    return _make_match_payload
+
+
+@pytest.fixture(name="match_payload")
+def setup_match_payload() -> dict:
+    return _make_match_payload()
+
+
+class _LocalApiHandler(http_server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, with_body: bool) -> None:
+        body = json.dumps(["KR_1", "KR_2"]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._send(with_body=True)
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        self._send(with_body=False)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="local_api_base")
+def setup_local_api_base() -> Iterator[str]:
+    """`_api_base` of a local keep-alive HTTP server answering every GET with a match id list."""
+    httpd = http_server.ThreadingHTTPServer(("127.0.0.1", 0), _LocalApiHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/{{platform_or_region}}"
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,388 @@
+"""Streaming crawl pipeline.
+
+Stages run in their own worker threads and are connected by bounded queues, so the first match detail fetch
+starts as soon as the first puuid resolves instead of after the whole ladder was collected. A full queue blocks
+the stage feeding it (backpressure), which keeps memory bounded regardless of ladder size.
+
+Usage:
+    crawl = pipeline.build_crawl_pipeline(client.RiotApiClient(), types.TierType.GOLD, search_config)
+    for match in crawl.run():
+        ...
+    crawl.log_report()
+"""
+
+import dataclasses
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from loguru import logger
+from requests.exceptions import HTTPError
+
+from riot import client
+from riot.utils import checkpoint
+from riot.utils import dto
+from riot.utils import errors
+from riot.utils import frontier
+from riot.utils import platform_and_region
+from riot.utils import search
+from riot.utils import types
+
+_DEFAULT_QUEUE_SIZE = 100
+_DONE = object()
+# How often threads blocked on a queue check whether the consumer stopped iterating.
+_STOP_POLL_INTERVAL = 0.1
+
+
+def _put_unless_stopped(out_queue: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=_STOP_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+@dataclasses.dataclass
+class Stage:
+    """A pipeline step turning one input item into zero or more output items."""
+
+    name: str
+    fn: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+
+
+@dataclasses.dataclass
+class StageStats:
+    name: str
+    consumed: int = 0
+    produced: int = 0
+    errors: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Consumed items per second."""
+        return self.consumed / self.elapsed if self.elapsed else 0.0
+
+
+class Pipeline:
+    def __init__(self, source: Iterable[Any], stages: list[Stage], queue_size: int = _DEFAULT_QUEUE_SIZE):
+        self._source = source
+        self._stages = stages
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.stats = [StageStats(name="source")] + [StageStats(name=stage.name) for stage in stages]
+
+    def _put(self, out_queue: queue.Queue, item: Any) -> bool:
+        """Put `item` once there is room. Returns False without putting it if the pipeline was stopped."""
+        return _put_unless_stopped(out_queue, item, self._stop)
+
+    def _get(self, in_queue: queue.Queue) -> Any:
+        """The next item of `in_queue`, `_DONE` if the pipeline was stopped."""
+        while not self._stop.is_set():
+            try:
+                return in_queue.get(timeout=_STOP_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, out_queue: queue.Queue, stats: StageStats) -> None:
+        stats.started_at = time.monotonic()
+        try:
+            for item in self._source:
+                if not self._put(out_queue, item):
+                    break
+                with self._lock:
+                    stats.consumed += 1
+                    stats.produced += 1
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.error(f"Pipeline source failed: {err}")
+            stats.errors += 1
+        finally:
+            stats.finished_at = time.monotonic()
+            self._put(out_queue, _DONE)
+
+    def _work(
+        self,
+        stage: Stage,
+        in_queue: queue.Queue,
+        out_queue: queue.Queue,
+        stats: StageStats,
+        running: list[int],
+    ) -> None:
+        while (item := self._get(in_queue)) is not _DONE:
+            try:
+                outputs = list(stage.fn(item))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning(f"Pipeline stage {stage.name} failed on {item!r}: {err}")
+                with self._lock:
+                    stats.consumed += 1
+                    stats.errors += 1
+                continue
+
+            with self._lock:
+                stats.consumed += 1
+                stats.produced += len(outputs)
+            for output in outputs:
+                if not self._put(out_queue, output):
+                    break
+
+        # Let the other workers of this stage see the end of input too; the last one closes the next queue.
+        self._put(in_queue, _DONE)
+        with self._lock:
+            running[0] -= 1
+            is_last = running[0] == 0
+        if is_last:
+            stats.finished_at = time.monotonic()
+            self._put(out_queue, _DONE)
+
+    def run(self) -> Iterator[Any]:
+        """Start all stages and yield the outputs of the last one as they are produced.
+
+        If the caller stops iterating early, the stages stop once their current item is done.
+        """
+        self._stop.clear()
+        queues = [queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages) + 1)]
+        threads = [
+            threading.Thread(target=self._feed, args=(queues[0], self.stats[0]), name="pipeline-source", daemon=True)
+        ]
+        for i, stage in enumerate(self._stages):
+            stats = self.stats[i + 1]
+            stats.started_at = time.monotonic()
+            running = [stage.workers]
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], queues[i + 1], stats, running),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                )
+                for n in range(stage.workers)
+            )
+
+        for thread in threads:
+            thread.start()
+        try:
+            while (item := queues[-1].get()) is not _DONE:
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def log_report(self) -> None:
+        for stats in self.stats:
+            logger.info(
+                f"{stats.name:>12}: consumed {stats.consumed}, produced {stats.produced}, errors {stats.errors}, "
+                f"{stats.throughput:.2f} items/s over {stats.elapsed:.1f}s"
+            )
+
+
+@dataclasses.dataclass(frozen=True)
+class _ResumedMatchId:
+    """Pending match id of an interrupted run, passed through to the match stage untouched."""
+
+    match_id: str
+
+
+def build_crawl_pipeline(
+    riot_api_client: client.RiotApiClient,
+    tier: types.TierType,
+    search_config: search.SearchConfig,
+    division: types.DivisionType | None = None,
+    workers: int = 4,
+    queue_size: int = _DEFAULT_QUEUE_SIZE,
+    max_match_ids_per_puuid: int | None = None,
+    checkpoint_store: checkpoint.CheckpointStore | None = None,
+) -> Pipeline:
+    """Tier -> active summoner ids -> puuids -> unique match ids -> `MatchDto`s.
+
+    Args:
+        riot_api_client: Client shared by all stages; its rate limiter throttles the whole pipeline.
+        tier: Tier to crawl.
+        search_config: Search window and routing.
+        division: Only crawl this division, all divisions if not given.
+        workers: Worker threads for each network-bound stage.
+        queue_size: Capacity of the queues between stages.
+        max_match_ids_per_puuid: Cap of match ids per player, no cap if not given.
+        checkpoint_store: If given, matches left pending by a previous run are fetched first, players are only
+            searched from their watermark on, and completed or permanently failed (404) matches are skipped.
+    """
+    config = search_config.as_dict()
+    match_frontier = frontier.MatchFrontier()
+    frontier_lock = threading.Lock()
+
+    resumed = []
+    if checkpoint_store is not None:
+        # Match ids are prefixed by their platform, e.g. `KR_7348987032`.
+        prefix = f"{str(search_config.platform).upper()}_"
+        resumed = [_ResumedMatchId(m) for m in checkpoint_store.pending() if m.startswith(prefix)]
+        match_frontier.add(item.match_id for item in resumed)
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} pending matches from checkpoint")
+
+    entries = riot_api_client.iter_league_entries_by_tier(
+        tier, divisions=[division] if division else None, prefetch=True, **config
+    )
+    summoner_ids = (entry.summoner_id for entry in entries if not entry.inactive)
+
+    def resolve_puuid(summoner_id: str | _ResumedMatchId) -> list[str | _ResumedMatchId]:
+        if isinstance(summoner_id, _ResumedMatchId):
+            return [summoner_id]
+        return [
+            riot_api_client._get_summoner_data_by_summoner_id(  # pylint: disable=protected-access
+                summoner_id, **config
+            ).puuid
+        ]
+
+    def new_match_ids(puuid: str | _ResumedMatchId) -> list[str]:
+        if isinstance(puuid, _ResumedMatchId):
+            return [puuid.match_id]
+
+        start_time = config["start_time"]
+        if checkpoint_store is not None:
+            start_time = checkpoint_store.start_time(puuid, default=start_time)
+        match_ids = list(
+            riot_api_client.iter_match_ids_by_puuid(
+                puuid, max_match_ids=max_match_ids_per_puuid, **{**config, "start_time": start_time}
+            )
+        )
+        with frontier_lock:
+            unseen = [match_id for match_id in match_ids if match_id not in match_frontier]
+            match_frontier.extend([unseen], puuids=[puuid])
+
+        if checkpoint_store is not None:
+            completed = checkpoint_store.completed(unseen)
+            unseen = [match_id for match_id in unseen if match_id not in completed]
+            # A capped listing may have left older matches of the window behind, keep the watermark then.
+            truncated = max_match_ids_per_puuid is not None and len(match_ids) >= max_match_ids_per_puuid
+            checkpoint_store.record_match_ids(puuid, unseen, end_time=start_time if truncated else config["end_time"])
+        return unseen
+
+    def fetch_match(match_id: str) -> list[dto.MatchDto]:
+        try:
+            match = riot_api_client._get_match_data_by_match_id(match_id, **config)  # pylint: disable=protected-access
+        except HTTPError as err:
+            status_code = err.response.status_code if err.response is not None else None
+            if checkpoint_store is not None and errors.is_permanent(status_code):
+                checkpoint_store.mark_failed(match_id)
+            raise
+        with frontier_lock:
+            match_frontier.mark_fetched(match)
+        if checkpoint_store is not None:
+            checkpoint_store.mark_completed(match_id)
+        return [match]
+
+    return Pipeline(
+        source=itertools.chain(resumed, summoner_ids),
+        stages=[
+            Stage(name="summoner", fn=resolve_puuid, workers=workers),
+            Stage(name="match_ids", fn=new_match_ids, workers=workers),
+            Stage(name="match", fn=fetch_match, workers=workers),
+        ],
+        queue_size=queue_size,
+    )
+
+
+class MultiPlatformCrawl:
+    """Runs one crawl pipeline per platform concurrently and merges their outputs.
+
+    Platforms are routed to separate hosts, and the client's rate limiter keeps a bucket per routing value, so the
+    crawls do not throttle each other: a global scrape takes about as long as the slowest region.
+    """
+
+    def __init__(self, pipelines: dict[platform_and_region.Platform, Pipeline], queue_size: int = _DEFAULT_QUEUE_SIZE):
+        self.pipelines = pipelines
+        self._queue_size = queue_size
+        self._stop = threading.Event()
+
+    def _drain(self, platform: platform_and_region.Platform, crawl: Pipeline, out_queue: queue.Queue) -> None:
+        outputs = crawl.run()
+        try:
+            for item in outputs:
+                if not _put_unless_stopped(out_queue, (platform, item), self._stop):
+                    break
+        finally:
+            # Stops the platform's stages if the consumer stopped iterating.
+            outputs.close()
+            _put_unless_stopped(out_queue, _DONE, self._stop)
+
+    def run(self) -> Iterator[tuple[platform_and_region.Platform, Any]]:
+        """Yield `(platform, match)` pairs as any platform produces them.
+
+        If the caller stops iterating early, every platform's pipeline stops once its current item is done.
+        """
+        self._stop.clear()
+        out_queue = queue.Queue(maxsize=self._queue_size)
+        threads = [
+            threading.Thread(
+                target=self._drain, args=(platform, crawl, out_queue), name=f"crawl-{platform}", daemon=True
+            )
+            for platform, crawl in self.pipelines.items()
+        ]
+        for thread in threads:
+            thread.start()
+
+        running = len(threads)
+        try:
+            while running:
+                item = out_queue.get()
+                if item is _DONE:
+                    running -= 1
+                    continue
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def log_report(self) -> None:
+        for platform, crawl in self.pipelines.items():
+            logger.info(f"[{platform}]")
+            crawl.log_report()
+
+
+def build_multi_platform_crawl(
+    riot_api_client: client.RiotApiClient,
+    tier: types.TierType,
+    platforms: Iterable[platform_and_region.Platform],
+    **kwargs,
+) -> MultiPlatformCrawl:
+    """Crawl `tier` on every platform in `platforms`, each routed to the region serving its matches.
+
+    Args:
+        riot_api_client: Client shared by all platforms.
+        tier: Tier to crawl.
+        platforms: Platforms to crawl.
+        **kwargs: Search config overrides (`start_time`, `end_time`, `count`, ...) and `build_crawl_pipeline`
+            arguments.
+    """
+    pipeline_kwargs = {
+        key: kwargs.pop(key)
+        for key in ["division", "workers", "queue_size", "max_match_ids_per_puuid", "checkpoint_store"]
+        if key in kwargs
+    }
+    return MultiPlatformCrawl(
+        {
+            platform: build_crawl_pipeline(
+                riot_api_client,
+                tier,
+                search.SearchConfig.load_platform_config(platform, **kwargs),
+                **pipeline_kwargs,
+            )
+            for platform in platforms
+        },
+        queue_size=pipeline_kwargs.get("queue_size", _DEFAULT_QUEUE_SIZE),
+    )
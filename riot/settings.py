@@ -1,14 +1,37 @@
+from typing import Annotated
+
+import pydantic
 import pydantic_settings
 
 
 class RiotApiSettings(pydantic_settings.BaseSettings):
-    api_key: str
+    api_key: str | None = None
+    # Comma separated in the environment, e.g. `RIOT_API_KEYS=RGAPI-first,RGAPI-second`.
+    api_keys: Annotated[list[str], pydantic_settings.NoDecode] = []
 
     model_config = pydantic_settings.SettingsConfigDict(
         env_prefix="RIOT_",
         env_file=".env.riot",
     )
 
+    @pydantic.field_validator("api_keys", mode="before")
+    @classmethod
+    def _split_api_keys(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            return [api_key.strip() for api_key in value.split(",") if api_key.strip()]
+        return value
+
+    @pydantic.model_validator(mode="after")
+    def _require_api_key(self) -> "RiotApiSettings":
+        if not self.all_api_keys:
+            raise ValueError("Set RIOT_API_KEY or RIOT_API_KEYS")
+        return self
+
+    @property
+    def all_api_keys(self) -> list[str]:
+        """`api_key` followed by `api_keys`, without duplicates."""
+        return list(dict.fromkeys([*([self.api_key] if self.api_key else []), *self.api_keys]))
+
 
 def load_settings() -> RiotApiSettings:
-    return RiotApiSettings()  # pylint: disable=no-value-for-parameter
+    return RiotApiSettings()
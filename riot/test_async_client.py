@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+
+from riot import async_client
+from riot.utils import api_keys
+from riot.utils import connection_pool
+from riot.utils import platform_and_region
+from riot.utils import search
+from riot.utils import types
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict | list, on_exit, status: int = 200):
+        self._payload = payload
+        self._on_exit = on_exit
+        self.status = status
+        self.ok = status < 400
+        self.headers = {}
+
+    async def __aenter__(self) -> "_FakeResponse":
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._on_exit()
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return json.dumps(self._payload).encode()
+
+
+@pytest.fixture(name="riot_client")
+def setup_client() -> async_client.AsyncRiotApiClient:
+    return async_client.AsyncRiotApiClient(max_concurrency=2)
+
+
+@pytest.fixture(name="test_config")
+def setup_config() -> dict[str, str]:
+    return {
+        "game_type": types.GameType.TFT,
+        "version_type": types.VersionType.V1,
+        "region": platform_and_region.Region.ASIA,
+        "platform": platform_and_region.Platform.KR,
+    }
+
+
+@pytest.mark.parametrize("match_ids", [["KR_1", "KR_2", "KR_3", "KR_4", "KR_5"]])
+def test_get_match_data_by_match_ids_keeps_order_and_bounds_concurrency(
+    mocker: MockerFixture,
+    riot_client: async_client.AsyncRiotApiClient,
+    test_config: dict[str, str],
+    match_payload: dict,
+    match_ids: list[str],
+):
+    in_flight, peak = 0, 0
+    requested_urls = []
+
+    def fake_request(method: str, url: str, **kwargs):  # pylint: disable=unused-argument
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        requested_urls.append(url)
+        return _FakeResponse(
+            {**match_payload, "metadata": {**match_payload["metadata"], "match_id": url[-4:]}}, on_exit=release
+        )
+
+    def release():
+        nonlocal in_flight
+        in_flight -= 1
+
+    fake_session = mocker.MagicMock()
+    fake_session.request.side_effect = fake_request
+    mocker.patch.object(riot_client, "_get_session", return_value=fake_session)
+
+    match_data = asyncio.run(riot_client.get_match_data_by_match_ids(match_ids, **test_config))
+
+    assert [m.metadata.match_id for m in match_data] == match_ids
+    assert peak <= 2
+    assert "https://asia.api.riotgames.com/tft/match/v1/matches/KR_1" in requested_urls
+
+
+def test_warm_up_opens_per_host_pools_reused_by_requests(local_api_base: str, test_config: dict[str, str]):
+    async def crawl() -> dict[str, connection_pool.PoolStats]:
+        async with async_client.AsyncRiotApiClient(
+            pool_config=connection_pool.PoolConfig(max_connections_per_host={"asia": 3})
+        ) as riot_client:
+            riot_client._api_base = local_api_base  # pylint: disable=protected-access
+            await riot_client.warm_up(search.SearchConfig.load_default_config())
+            warmed = {stats.host: stats for stats in riot_client.pool_stats()}
+            for _ in range(5):
+                await riot_client._get_match_ids_by_puuid(  # pylint: disable=protected-access
+                    "puuid", start=0, start_time=0, end_time=1, count=20, **test_config
+                )
+            return warmed, {stats.host: stats for stats in riot_client.pool_stats()}
+
+    warmed, crawled = asyncio.run(crawl())
+
+    assert warmed["kr"].max_connections == 10 and warmed["asia"].max_connections == 3
+    assert warmed["asia"].connections_opened == 3
+    assert crawled["asia"].connections_opened == 3
+    assert crawled["asia"].requests == warmed["asia"].requests + 5
+
+
+def test_api_keys_rejected_with_401_leave_the_rotation(mocker: MockerFixture, test_config: dict[str, str]):
+    pool = api_keys.ApiKeyPool(["RGAPI-expired", "RGAPI-valid"])
+    riot_client = async_client.AsyncRiotApiClient(api_key_pool=pool)
+    tokens = []
+
+    def fake_request(method: str, url: str, headers: dict[str, str], **kwargs):  # pylint: disable=unused-argument
+        tokens.append(headers["X-Riot-Token"])
+        if headers["X-Riot-Token"] == "RGAPI-expired":
+            return _FakeResponse({}, on_exit=lambda: None, status=401)
+        return _FakeResponse(["KR_1"], on_exit=lambda: None)
+
+    fake_session = mocker.MagicMock()
+    fake_session.request.side_effect = fake_request
+    mocker.patch.object(riot_client, "_get_session", return_value=fake_session)
+
+    async def crawl() -> list[list[str]]:
+        return [
+            await riot_client._get_match_ids_by_puuid(  # pylint: disable=protected-access
+                f"puuid-{i}", start=0, start_time=0, end_time=1, count=20, **test_config
+            )
+            for i in range(4)
+        ]
+
+    assert asyncio.run(crawl()) == [["KR_1"]] * 4
+    assert pool.active == [api_keys.fingerprint("RGAPI-valid")]
+    assert tokens.count("RGAPI-expired") == 1
@@ -1,10 +1,27 @@
+# pylint: disable=protected-access
+import asyncio
+from concurrent import futures
 import datetime
+import json
+import threading
+import time
 
 import pytest
 from pytest_mock import MockerFixture
+from requests.exceptions import HTTPError
 
+from riot import async_client
 from riot import client
+from riot.utils import api_keys
+from riot.utils import archive
+from riot.utils import connection_pool
+from riot.utils import dto
+from riot.utils import match_store
+from riot.utils import metrics
 from riot.utils import platform_and_region
+from riot.utils import rate_limit
+from riot.utils import scheduler
+from riot.utils import search
 from riot.utils import types
 
 
@@ -105,3 +122,336 @@ def test_get_league_entries_by_tier(
 
     # Verify the call
     mock_get_league_entries.assert_called_once_with(tier=tier, division=division, **test_config)
+
+
+def _response(mocker: MockerFixture, status_code: int, payload=None, headers: dict | None = None):
+    response = mocker.MagicMock(status_code=status_code, ok=status_code < 400, headers=headers or {})
+    response.content = json.dumps(payload).encode()
+    response.raise_for_status.side_effect = (
+        HTTPError(f"{status_code}", response=response) if status_code >= 400 else None
+    )
+    return response
+
+
+def test_request_retries_429_after_retry_after(
+    mocker: MockerFixture, riot_client: client.RiotApiClient, test_config: dict[str, str]
+):
+    mock_sleep = mocker.patch.object(client.time, "sleep")
+    mock_penalize = mocker.patch.object(riot_client._rate_limiter, "penalize")
+    mocker.patch.object(
+        riot_client._session,
+        "request",
+        side_effect=[
+            _response(mocker, 429, headers={"Retry-After": "7", "X-Rate-Limit-Type": "method"}),
+            _response(mocker, 200, payload=["KR_1", "KR_2"]),
+        ],
+    )
+
+    match_ids = riot_client.get_match_ids_by_puuids(["puuid"], start_time=0, end_time=1, **test_config)
+
+    assert match_ids == [["KR_1", "KR_2"]]
+    assert match_ids.failures == []
+    mock_sleep.assert_called_once_with(7.0)
+    assert mock_penalize.call_args.args[1:] == (7.0, "method")
+
+
+def test_bulk_methods_return_partial_results_and_failures(
+    mocker: MockerFixture, riot_client: client.RiotApiClient, test_config: dict[str, str], match_payload: dict
+):
+    mocker.patch.object(client.time, "sleep")
+    mocker.patch.object(
+        riot_client._session,
+        "request",
+        side_effect=[
+            _response(mocker, 200, payload=match_payload),
+            _response(mocker, 404),
+            _response(mocker, 503),
+            _response(mocker, 200, payload=match_payload),
+        ],
+    )
+
+    match_data = riot_client.get_match_data_by_match_ids(["KR_1", "KR_2", "KR_3"], **test_config)
+
+    assert len(match_data) == 2
+    assert [(f.key, f.status_code, f.permanent) for f in match_data.failures] == [("KR_2", 404, True)]
+
+
+def test_match_store_hits_skip_network_and_rate_limiter(
+    mocker: MockerFixture, tmp_path, test_config: dict[str, str], match_payload: dict
+):
+    store = match_store.MatchStore(tmp_path / "matches.sqlite")
+    riot_client = client.RiotApiClient(match_store=store)
+    mock_request = mocker.patch.object(
+        riot_client._session, "request", return_value=_response(mocker, 200, payload=match_payload)
+    )
+    mock_acquire = mocker.spy(riot_client._rate_limiter, "acquire")
+
+    first = riot_client.get_match_data_by_match_ids(["KR_7348987032"], **test_config)
+    second = riot_client.get_match_data_by_match_ids(["KR_7348987032"], **test_config)
+
+    assert first == second
+    assert mock_request.call_count == 1
+    assert mock_acquire.call_count == 1
+    assert store.contains(["KR_7348987032"]) == {"KR_7348987032"}
+
+
+@pytest.mark.parametrize(
+    "available, count, max_match_ids, expected_calls",
+    [
+        (45, 20, None, [(0, 20), (20, 20), (40, 20)]),
+        (40, 20, None, [(0, 20), (20, 20), (40, 20)]),
+        (100, 20, 30, [(0, 20), (20, 10)]),
+    ],
+)
+def test_iter_match_ids_by_puuid_paginates(
+    mocker: MockerFixture,
+    riot_client: client.RiotApiClient,
+    test_config: dict[str, str],
+    available: int,
+    count: int,
+    max_match_ids: int | None,
+    expected_calls: list[tuple[int, int]],
+):
+    all_match_ids = [f"KR_{i}" for i in range(available)]
+    mock_get_match_ids = mocker.patch.object(
+        riot_client,
+        "_get_match_ids_by_puuid",
+        side_effect=lambda puuid, start, count, **kwargs: all_match_ids[start : start + count],
+    )
+
+    match_ids = list(
+        riot_client.iter_match_ids_by_puuid(
+            "puuid", max_match_ids=max_match_ids, **{**test_config, "count": count}, start_time=0, end_time=1
+        )
+    )
+
+    assert match_ids == all_match_ids[:max_match_ids]
+    assert [(c.kwargs["start"], c.kwargs["count"]) for c in mock_get_match_ids.call_args_list] == expected_calls
+
+
+def test_iter_match_ids_by_puuid_rejects_empty_pages(riot_client: client.RiotApiClient, test_config: dict[str, str]):
+    with pytest.raises(ValueError):
+        next(riot_client.iter_match_ids_by_puuid("puuid", **{**test_config, "count": 0}, start_time=0, end_time=1))
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_league_entries_by_tier_walks_divisions_and_pages(
+    mocker: MockerFixture, riot_client: client.RiotApiClient, test_config: dict[str, str], prefetch: bool
+):
+    pages_per_division = {"I": 2, "II": 0, "III": 1, "IV": 3}
+    mock_get_league_entries = mocker.patch.object(
+        riot_client,
+        "get_league_entries_by_tier",
+        side_effect=lambda tier, division, page, **kwargs: (
+            [f"{division}-{page}"] if page <= pages_per_division[division] else []
+        ),
+    )
+
+    entries = list(riot_client.iter_league_entries_by_tier(types.TierType.GOLD, prefetch=prefetch, **test_config))
+
+    assert entries == ["I-1", "I-2", "III-1", "IV-1", "IV-2", "IV-3"]
+    assert mock_get_league_entries.call_count == sum(pages_per_division.values()) + len(pages_per_division)
+
+
+def test_fetched_matches_are_archived(
+    mocker: MockerFixture, tmp_path, test_config: dict[str, str], match_payload: dict
+):
+    writer = archive.MatchArchiveWriter(tmp_path)
+    riot_client = client.RiotApiClient(match_archive=writer)
+    mocker.patch.object(riot_client._session, "request", return_value=_response(mocker, 200, payload=match_payload))
+
+    riot_client.get_match_data_by_match_ids(["KR_7348987032"], **test_config)
+    writer.close()
+
+    assert archive.MatchArchiveReader(tmp_path).get("KR_7348987032") == match_payload
+
+
+def test_metrics_hooks_see_attempts_and_fetches(
+    mocker: MockerFixture, test_config: dict[str, str], match_payload: dict
+):
+    hook = mocker.MagicMock(spec=metrics.MetricsHook)
+    riot_metrics = metrics.Metrics()
+    riot_client = client.RiotApiClient(metrics_hooks=[hook, riot_metrics])
+    mocker.patch.object(client.time, "sleep")
+    mocker.patch.object(riot_client._rate_limiter, "penalize")
+    mocker.patch.object(
+        riot_client._session,
+        "request",
+        side_effect=[
+            _response(mocker, 503),
+            _response(mocker, 200, payload=match_payload),
+        ],
+    )
+
+    riot_client.get_match_data_by_match_ids(["KR_7348987032"], **test_config)
+
+    assert [call.args[0].status_code for call in hook.on_request.call_args_list] == [503, 200]
+    fetch = hook.on_fetch.call_args.args[0]
+    assert (fetch.query_type, fetch.endpoint, fetch.host, fetch.cached) == ("match", "match", "asia", False)
+    assert fetch.parse_time > 0
+    assert riot_metrics.counter("riot_retries_total", endpoint="match") == 1
+    assert riot_metrics.counter("riot_response_bytes_total") == len(json.dumps(match_payload)) + len(b"null")
+
+
+def test_warm_up_opens_per_host_pools_reused_by_requests(local_api_base: str, test_config: dict[str, str]):
+    riot_client = client.RiotApiClient(
+        pool_config=connection_pool.PoolConfig(max_connections=2, max_connections_per_host={"asia": 3})
+    )
+    riot_client._api_base = local_api_base
+
+    riot_client.warm_up(search.SearchConfig.load_default_config())
+    warmed = {stats.host: stats for stats in riot_client.pool_stats()}
+    assert warmed["kr"].max_connections == 2 and warmed["asia"].max_connections == 3
+    assert 1 <= warmed["asia"].connections_opened <= 3
+
+    for _ in range(5):
+        riot_client._get_match_ids_by_puuid("puuid", start_time=0, end_time=1, **test_config)
+    asia = {stats.host: stats for stats in riot_client.pool_stats()}["asia"]
+
+    assert asia.connections_opened == warmed["asia"].connections_opened
+    assert asia.requests == warmed["asia"].requests + 5
+    assert asia.reuse_rate > 0.5
+
+
+def test_concurrent_fetches_of_one_match_share_a_request(
+    mocker: MockerFixture, test_config: dict[str, str], match_payload: dict
+):
+    riot_metrics = metrics.Metrics()
+    riot_client = client.RiotApiClient(metrics_hooks=[riot_metrics])
+    callers = threading.Barrier(4)
+
+    def slow_request(**kwargs):  # pylint: disable=unused-argument
+        time.sleep(0.05)
+        return _response(mocker, 200, payload=match_payload)
+
+    mock_request = mocker.patch.object(riot_client._session, "request", side_effect=slow_request)
+
+    def fetch(_) -> dto.MatchDto:
+        callers.wait()
+        return riot_client._get_match_data_by_match_id("KR_7348987032", **test_config)
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        matches = list(executor.map(fetch, range(4)))
+
+    assert mock_request.call_count == 1
+    assert len({id(match) for match in matches}) == 4
+    assert riot_metrics.counter("riot_coalesced_total") == 3
+
+
+def test_coalesced_match_id_lists_are_not_shared(mocker: MockerFixture, test_config: dict[str, str]):
+    riot_client = client.RiotApiClient()
+    callers = threading.Barrier(4)
+
+    def slow_request(**kwargs):  # pylint: disable=unused-argument
+        time.sleep(0.05)
+        return _response(mocker, 200, payload=["KR_1", "KR_2"])
+
+    mock_request = mocker.patch.object(riot_client._session, "request", side_effect=slow_request)
+
+    def fetch(_) -> list[str]:
+        callers.wait()
+        return riot_client._get_match_ids_by_puuid("puuid", start_time=0, end_time=1, **test_config)
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        match_ids = list(executor.map(fetch, range(4)))
+
+    assert mock_request.call_count == 1
+    assert match_ids == [["KR_1", "KR_2"]] * 4
+    assert len({id(ids) for ids in match_ids}) == 4
+
+
+def test_coalesced_match_id_lists_are_not_shared_async(mocker: MockerFixture, test_config: dict[str, str]):
+    riot_client = async_client.AsyncRiotApiClient()
+
+    async def slow_request(*args):  # pylint: disable=unused-argument
+        await asyncio.sleep(0.01)
+        return ["KR_1", "KR_2"]
+
+    mock_request = mocker.patch.object(riot_client, "_get_and_cache", side_effect=slow_request)
+
+    async def fetch(mutate: bool) -> list[str]:
+        match_ids = await riot_client._get_match_ids_by_puuid("puuid", start_time=0, end_time=1, **test_config)
+        if mutate:
+            match_ids.append("MUTATED")
+        return match_ids
+
+    async def fetch_all() -> list[list[str]]:
+        return await asyncio.gather(fetch(True), fetch(False))
+
+    match_ids = asyncio.run(fetch_all())
+
+    assert mock_request.call_count == 1
+    assert match_ids == [["KR_1", "KR_2", "MUTATED"], ["KR_1", "KR_2"]]
+
+
+def test_request_scheduler_hands_out_rate_limit_slots(mocker: MockerFixture, test_config: dict[str, str]):
+    request_scheduler = scheduler.RequestScheduler()
+    with pytest.raises(ValueError):
+        client.RiotApiClient(rate_limiter=rate_limit.RateLimiter(), request_scheduler=request_scheduler)
+
+    riot_client = client.RiotApiClient(request_scheduler=request_scheduler)
+    acquire = mocker.spy(request_scheduler, "acquire")
+    mocker.patch.object(riot_client._session, "request", return_value=_response(mocker, 200, payload=["KR_1"]))
+
+    with scheduler.priority(scheduler.Priority.INTERACTIVE):
+        riot_client._get_match_ids_by_puuid("puuid", start_time=0, end_time=1, **test_config)
+
+    assert riot_client._rate_limiter is request_scheduler.rate_limiter
+    assert acquire.call_args.args[0][:2] == ("asia", types.EndpointType.MATCH_IDS_BY_PUUID)
+
+
+def test_api_keys_rejected_with_403_leave_the_rotation(mocker: MockerFixture, test_config: dict[str, str]):
+    pool = api_keys.ApiKeyPool(["RGAPI-revoked", "RGAPI-valid"])
+    riot_client = client.RiotApiClient(api_key_pool=pool)
+    mocker.patch.object(client.time, "sleep")
+
+    def request(headers: dict[str, str], **kwargs):  # pylint: disable=unused-argument
+        if headers["X-Riot-Token"] == "RGAPI-revoked":
+            return _response(mocker, 403)
+        return _response(mocker, 200, payload=["KR_1"])
+
+    mock_request = mocker.patch.object(riot_client._session, "request", side_effect=request)
+
+    for i in range(4):
+        assert riot_client._get_match_ids_by_puuid(f"puuid-{i}", start_time=0, end_time=1, **test_config) == ["KR_1"]
+
+    assert pool.active == [api_keys.fingerprint("RGAPI-valid")]
+    tokens = [call.kwargs["headers"]["X-Riot-Token"] for call in mock_request.call_args_list]
+    assert tokens.count("RGAPI-revoked") == 1
+
+
+def test_requests_every_key_rejects_keep_the_keys(mocker: MockerFixture, test_config: dict[str, str]):
+    pool = api_keys.ApiKeyPool(["RGAPI-1", "RGAPI-2"])
+    riot_client = client.RiotApiClient(api_key_pool=pool)
+    mock_request = mocker.patch.object(riot_client._session, "request", return_value=_response(mocker, 403))
+
+    with pytest.raises(HTTPError):
+        riot_client._get_match_ids_by_puuid("puuid", start_time=0, end_time=1, **test_config)
+
+    assert mock_request.call_count == 2
+    assert len(pool) == 2
+
+
+def test_lazy_match_fetches_keep_the_payload(
+    mocker: MockerFixture, riot_client: client.RiotApiClient, test_config: dict[str, str], match_payload: dict
+):
+    mocker.patch.object(riot_client._session, "request", return_value=_response(mocker, 200, payload=match_payload))
+
+    matches = riot_client.get_match_data_by_match_ids(["KR_7348987032"], lazy=True, **test_config)
+
+    assert isinstance(matches[0], dto.LazyMatchDto)
+    assert matches[0].info.participants[0].placement == 1
+    assert matches[0] == dto.MatchDto.from_dict(match_payload)
+
+
+def test_projected_match_fetches_return_slim_records(
+    mocker: MockerFixture, riot_client: client.RiotApiClient, test_config: dict[str, str], match_payload: dict
+):
+    mocker.patch.object(riot_client._session, "request", return_value=_response(mocker, 200, payload=match_payload))
+    projection = dto.MatchProjection(["placement", "augments"])
+
+    matches = riot_client.get_match_data_by_match_ids(["KR_7348987032"], projection=projection, **test_config)
+
+    assert matches[0].metadata.match_id == "KR_7348987032"
+    assert [p.placement for p in matches[0].info.participants] == list(range(1, 9))
+    assert set(matches[0].info.participants[0].model_dump()) == {"placement", "augments"}
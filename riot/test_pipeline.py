@@ -0,0 +1,178 @@
+import itertools
+import threading
+
+from pytest_mock import MockerFixture
+from requests.exceptions import HTTPError
+
+from riot import client
+from riot import pipeline
+from riot.utils import checkpoint
+from riot.utils import dto
+from riot.utils import platform_and_region
+from riot.utils import search
+from riot.utils import types
+
+
+def test_pipeline_streams_through_stages_and_counts_errors():
+    def explode(n: int) -> list[int]:
+        if n == 3:
+            raise ValueError("boom")
+        return [n, n]
+
+    crawl = pipeline.Pipeline(
+        source=range(5),
+        stages=[
+            pipeline.Stage(name="double", fn=explode, workers=3),
+            pipeline.Stage(name="square", fn=lambda n: [n * n]),
+        ],
+        queue_size=1,
+    )
+
+    outputs = sorted(crawl.run())
+
+    assert outputs == [0, 0, 1, 1, 4, 4, 16, 16]
+    assert [(s.name, s.consumed, s.produced, s.errors) for s in crawl.stats] == [
+        ("source", 5, 5, 0),
+        ("double", 5, 8, 1),
+        ("square", 8, 8, 0),
+    ]
+
+
+def test_pipeline_stops_its_threads_when_the_consumer_stops_early():
+    crawl = pipeline.Pipeline(
+        source=itertools.count(),
+        stages=[pipeline.Stage(name="double", fn=lambda n: [n, n], workers=2)],
+        queue_size=1,
+    )
+
+    outputs = crawl.run()
+    assert len([next(outputs) for _ in range(3)]) == 3
+    outputs.close()
+
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
+
+
+def test_multi_platform_crawl_stops_its_threads_when_the_consumer_stops_early():
+    crawl = pipeline.MultiPlatformCrawl(
+        {
+            platform: pipeline.Pipeline(
+                source=itertools.count(), stages=[pipeline.Stage(name="double", fn=lambda n: [n, n])], queue_size=1
+            )
+            for platform in [platform_and_region.Platform.KR, platform_and_region.Platform.NA1]
+        },
+        queue_size=1,
+    )
+
+    outputs = crawl.run()
+    next(outputs)
+    outputs.close()
+
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith(("crawl-", "pipeline-"))]
+
+
+def test_crawl_pipeline_fetches_each_match_once(mocker: MockerFixture, match_payload: dict):
+    riot_client = client.RiotApiClient()
+    entries = [mocker.MagicMock(summoner_id=f"summoner-{i}", inactive=i == 2) for i in range(4)]
+    mocker.patch.object(riot_client, "iter_league_entries_by_tier", return_value=iter(entries))
+    mocker.patch.object(
+        riot_client,
+        "_get_summoner_data_by_summoner_id",
+        side_effect=lambda summoner_id, **kwargs: mocker.MagicMock(puuid=summoner_id.replace("summoner", "puuid")),
+    )
+    mocker.patch.object(
+        riot_client, "iter_match_ids_by_puuid", side_effect=lambda puuid, **kwargs: iter(["KR_1", "KR_2"])
+    )
+    mock_get_match = mocker.patch.object(
+        riot_client,
+        "_get_match_data_by_match_id",
+        side_effect=lambda match_id, **kwargs: dto.MatchDto.from_dict(
+            {**match_payload, "metadata": {**match_payload["metadata"], "match_id": match_id}}
+        ),
+    )
+
+    crawl = pipeline.build_crawl_pipeline(
+        riot_client, types.TierType.GOLD, search.SearchConfig.load_default_config(), workers=2
+    )
+    matches = list(crawl.run())
+
+    assert sorted(m.metadata.match_id for m in matches) == ["KR_1", "KR_2"]
+    assert mock_get_match.call_count == 2
+    assert crawl.stats[1].consumed == 3
+
+
+def test_crawl_pipeline_resumes_from_checkpoint(mocker: MockerFixture, tmp_path, match_payload: dict):
+    store = checkpoint.CheckpointStore(tmp_path / "checkpoint.sqlite")
+    store.record_match_ids("puuid-0", ["KR_1", "KR_2"], end_time=1000)
+    store.mark_completed("KR_1")
+    riot_client = client.RiotApiClient()
+    mocker.patch.object(
+        riot_client,
+        "iter_league_entries_by_tier",
+        return_value=iter([mocker.MagicMock(summoner_id="summoner-0", inactive=False)]),
+    )
+    mocker.patch.object(
+        riot_client, "_get_summoner_data_by_summoner_id", return_value=mocker.MagicMock(puuid="puuid-0")
+    )
+    mock_iter_match_ids = mocker.patch.object(
+        riot_client, "iter_match_ids_by_puuid", return_value=iter(["KR_3", "KR_2", "KR_1"])
+    )
+    mocker.patch.object(
+        riot_client,
+        "_get_match_data_by_match_id",
+        side_effect=lambda match_id, **kwargs: dto.MatchDto.from_dict(
+            {**match_payload, "metadata": {**match_payload["metadata"], "match_id": match_id}}
+        ),
+    )
+    search_config = search.SearchConfig.load_default_config(start_time=0, end_time=2000)
+
+    crawl = pipeline.build_crawl_pipeline(riot_client, types.TierType.GOLD, search_config, checkpoint_store=store)
+    matches = list(crawl.run())
+
+    assert sorted(m.metadata.match_id for m in matches) == ["KR_2", "KR_3"]
+    assert mock_iter_match_ids.call_args.kwargs["start_time"] == 1000
+    assert store.pending() == []
+    assert store.watermark("puuid-0") == 2000
+
+
+def test_crawl_pipeline_records_missing_matches_as_failed(mocker: MockerFixture, tmp_path):
+    store = checkpoint.CheckpointStore(tmp_path / "checkpoint.sqlite")
+    store.record_match_ids("puuid-0", ["KR_1"], end_time=1000)
+    riot_client = client.RiotApiClient()
+    mocker.patch.object(riot_client, "iter_league_entries_by_tier", return_value=iter([]))
+    mock_get_match = mocker.patch.object(
+        riot_client,
+        "_get_match_data_by_match_id",
+        side_effect=HTTPError("404", response=mocker.MagicMock(status_code=404)),
+    )
+    search_config = search.SearchConfig.load_default_config(start_time=0, end_time=2000)
+
+    crawl = pipeline.build_crawl_pipeline(riot_client, types.TierType.GOLD, search_config, checkpoint_store=store)
+    assert not list(crawl.run())
+    assert crawl.stats[-1].errors == 1
+    assert store.pending() == [] and store.failed() == ["KR_1"]
+
+    # A resumed run does not retry it.
+    crawl = pipeline.build_crawl_pipeline(riot_client, types.TierType.GOLD, search_config, checkpoint_store=store)
+    assert not list(crawl.run())
+    assert mock_get_match.call_count == 1
+
+
+def test_multi_platform_crawl_routes_each_platform_to_its_region(mocker: MockerFixture):
+    riot_client = client.RiotApiClient()
+    mock_build = mocker.patch.object(
+        pipeline,
+        "build_crawl_pipeline",
+        side_effect=lambda riot_api_client, tier, search_config, **kwargs: pipeline.Pipeline(
+            source=[search_config.region], stages=[]
+        ),
+    )
+
+    crawl = pipeline.build_multi_platform_crawl(
+        riot_client,
+        types.TierType.CHALLENGER,
+        [platform_and_region.Platform.NA1, platform_and_region.Platform.KR, platform_and_region.Platform.VN2],
+        workers=2,
+    )
+
+    assert sorted(crawl.run()) == [("kr", "asia"), ("na1", "americas"), ("vn2", "sea")]
+    assert all(c.kwargs == {"workers": 2} for c in mock_build.call_args_list)
@@ -0,0 +1,306 @@
+"""Vectorized composition statistics over batches of `MatchDto`s.
+
+Every participant gets one row holding its placement. Each feature it fielded is recorded as a
+`(participant row, feature code)` pair. The features are active traits per tier (`TFT12_Faerie:2`), units per star
+level (`TFT12_Lux:2`), items and augments. Picks, placement sums and top 4 counts per feature are then
+`numpy.bincount`s over the codes instead of Python loops over `ParticipantDto`s.
+
+A feature counts once per participant, e.g. two copies of a unit or an item held by two units count as one pick.
+
+Matches held in a `compact.CompactMatchStore` are aggregated straight from its interned columns by
+`composition_stats_from_store`, without any Python work per participant.
+
+Usage:
+    stats = analytics.composition_stats(matches, tft_set_number=12)
+    stats = stats.merge(analytics.composition_stats(more_matches, tft_set_number=12))
+    for row in stats.table("units", min_picks=100):
+        ...
+"""
+
+import dataclasses
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+
+from riot.utils import compact
+from riot.utils import dto
+
+KINDS = ("traits", "units", "items", "augments")
+
+_TOP_4 = 4
+
+
+class FeatureRow(NamedTuple):
+    key: str
+    picks: int
+    pick_rate: float
+    avg_placement: float
+    top4_rate: float
+
+
+@dataclasses.dataclass
+class FeatureStats:
+    """Per-feature sums, aligned with `keys`. Sums rather than means so that partial aggregates merge exactly."""
+
+    keys: list[str]
+    picks: np.ndarray
+    placement_sum: np.ndarray
+    top4: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "FeatureStats":
+        return cls(
+            keys=[], picks=np.zeros(0, np.int64), placement_sum=np.zeros(0, np.int64), top4=np.zeros(0, np.int64)
+        )
+
+    @property
+    def avg_placement(self) -> np.ndarray:
+        return self.placement_sum / np.maximum(self.picks, 1)
+
+    @property
+    def top4_rate(self) -> np.ndarray:
+        return self.top4 / np.maximum(self.picks, 1)
+
+    def merge(self, other: "FeatureStats") -> "FeatureStats":
+        index = {key: i for i, key in enumerate(self.keys)}
+        keys = self.keys + [key for key in other.keys if key not in index]
+        index.update((key, i) for i, key in enumerate(keys))
+        positions = np.fromiter((index[key] for key in other.keys), dtype=np.int64, count=len(other.keys))
+
+        def combine(mine: np.ndarray, theirs: np.ndarray) -> np.ndarray:
+            merged = np.zeros(len(keys), dtype=np.int64)
+            merged[: len(mine)] = mine
+            merged[positions] += theirs
+            return merged
+
+        return FeatureStats(
+            keys=keys,
+            picks=combine(self.picks, other.picks),
+            placement_sum=combine(self.placement_sum, other.placement_sum),
+            top4=combine(self.top4, other.top4),
+        )
+
+
+@dataclasses.dataclass
+class CompositionStats:
+    num_matches: int
+    num_participants: int
+    features: dict[str, FeatureStats]
+
+    def merge(self, other: "CompositionStats") -> "CompositionStats":
+        """Combine the aggregates of two disjoint batches of matches."""
+        return CompositionStats(
+            num_matches=self.num_matches + other.num_matches,
+            num_participants=self.num_participants + other.num_participants,
+            features={kind: self.features[kind].merge(other.features[kind]) for kind in KINDS},
+        )
+
+    def pick_rate(self, kind: str) -> np.ndarray:
+        """Share of participants fielding each feature of `kind`."""
+        return self.features[kind].picks / max(self.num_participants, 1)
+
+    def table(self, kind: str, min_picks: int = 1) -> list[FeatureRow]:
+        """Features of `kind` picked at least `min_picks` times, best average placement first."""
+        stats = self.features[kind]
+        pick_rate, avg_placement, top4_rate = self.pick_rate(kind), stats.avg_placement, stats.top4_rate
+        selected = np.flatnonzero(stats.picks >= min_picks)
+        selected = selected[np.argsort(avg_placement[selected], kind="stable")]
+        return [
+            FeatureRow(
+                key=stats.keys[i],
+                picks=int(stats.picks[i]),
+                pick_rate=float(pick_rate[i]),
+                avg_placement=float(avg_placement[i]),
+                top4_rate=float(top4_rate[i]),
+            )
+            for i in selected
+        ]
+
+
+class _Occurrences(NamedTuple):
+    """Features of one kind: participant row, feature code and, for traits and units, tier of every occurrence."""
+
+    rows: np.ndarray
+    codes: np.ndarray
+    tiers: np.ndarray | None = None
+
+
+def _aggregate(
+    occurrences: _Occurrences, name_of: Callable[[int], str], placements: np.ndarray, participants: np.ndarray
+) -> FeatureStats:
+    rows, codes, tiers = occurrences
+    keep = participants[rows]
+    rows, codes = rows[keep], codes[keep]
+    if not codes.size:
+        return FeatureStats.empty()
+
+    # Group by (name, tier): fold the tier into the code.
+    stride = 1
+    if tiers is not None:
+        tiers = tiers[keep]
+        stride = int(tiers.max()) + 1
+        codes = codes * stride + tiers
+
+    # Renumber the codes that occur to 0..n-1.
+    present = np.flatnonzero(np.bincount(codes))
+    renumber = np.zeros(present[-1] + 1, dtype=np.int64)
+    renumber[present] = np.arange(len(present))
+    codes = renumber[codes]
+    if tiers is None:
+        keys = [name_of(code) for code in present.tolist()]
+    else:
+        keys = [f"{name_of(code // stride)}:{code % stride}" for code in present.tolist()]
+
+    # Deduplicate (row, code) pairs so a feature counts once per participant.
+    num_keys = len(keys)
+    pairs = np.sort(rows * num_keys + codes)
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    codes, placement = pairs % num_keys, placements[pairs // num_keys]
+    return FeatureStats(
+        keys=keys,
+        picks=np.bincount(codes, minlength=num_keys),
+        placement_sum=np.bincount(codes, weights=placement, minlength=num_keys).astype(np.int64),
+        top4=np.bincount(codes, weights=placement <= _TOP_4, minlength=num_keys).astype(np.int64),
+    )
+
+
+def _composition_stats(
+    num_matches: int,
+    placements: np.ndarray,
+    participants: np.ndarray,
+    occurrences: dict[str, _Occurrences],
+    name_of: Callable[[int], str],
+) -> CompositionStats:
+    return CompositionStats(
+        num_matches=num_matches,
+        num_participants=int(participants.sum()),
+        features={kind: _aggregate(occurrences[kind], name_of, placements, participants) for kind in KINDS},
+    )
+
+
+def composition_stats(
+    matches: Iterable[dto.MatchDto],
+    game_version: str | None = None,
+    tft_set_number: int | None = None,
+) -> CompositionStats:
+    """Aggregate placements per trait tier, unit star level, item and augment.
+
+    Args:
+        matches: Matches to aggregate, e.g. the output of `get_match_data_by_match_ids`.
+        game_version: Only count matches whose `game_version` contains this, e.g. `"14.23"`.
+        tft_set_number: Only count matches of this set.
+
+    Returns:
+        CompositionStats: Aggregates that can be merged with those of other batches.
+    """
+    num_matches = 0
+    placements = []
+    vocabulary = {}
+
+    def intern(name: str) -> int:
+        return vocabulary.setdefault(name, len(vocabulary))
+
+    rows = {kind: [] for kind in KINDS}
+    codes = {kind: [] for kind in KINDS}
+    tiers = {"traits": [], "units": []}
+
+    # The only per-participant Python work: copy attributes into flat lists, all grouping happens in NumPy.
+    for match in matches:
+        info = match.info
+        if game_version is not None and game_version not in info.game_version:
+            continue
+        if tft_set_number is not None and info.tft_set_number != tft_set_number:
+            continue
+
+        num_matches += 1
+        for participant in info.participants:
+            row = len(placements)
+            placements.append(participant.placement)
+
+            traits = [trait for trait in participant.traits if trait.tier_current > 0]
+            rows["traits"] += [row] * len(traits)
+            codes["traits"] += [intern(trait.name) for trait in traits]
+            tiers["traits"] += [trait.tier_current for trait in traits]
+
+            units = participant.units
+            rows["units"] += [row] * len(units)
+            codes["units"] += [intern(unit.character_id) for unit in units]
+            tiers["units"] += [unit.tier for unit in units]
+
+            item_names = [item_name for unit in units for item_name in unit.item_names]
+            rows["items"] += [row] * len(item_names)
+            codes["items"] += [intern(item_name) for item_name in item_names]
+
+            rows["augments"] += [row] * len(participant.augments)
+            codes["augments"] += [intern(augment) for augment in participant.augments]
+
+    return _composition_stats(
+        num_matches=num_matches,
+        placements=np.asarray(placements, dtype=np.int64),
+        participants=np.ones(len(placements), dtype=bool),
+        occurrences={
+            kind: _Occurrences(
+                rows=np.asarray(rows[kind], dtype=np.int64),
+                codes=np.asarray(codes[kind], dtype=np.int64),
+                tiers=np.asarray(tiers[kind], dtype=np.int64) if kind in tiers else None,
+            )
+            for kind in KINDS
+        },
+        name_of=list(vocabulary).__getitem__,
+    )
+
+
+def _column(store: compact.CompactMatchStore, table: str, name: str) -> np.ndarray:
+    values = store.column(table, name)
+    return np.frombuffer(values, dtype=values.typecode).astype(np.int64)
+
+
+def _parents(ends: np.ndarray) -> np.ndarray:
+    """Parent row of every child record, given the parents' end offsets."""
+    return np.repeat(np.arange(len(ends)), np.diff(ends, prepend=0))
+
+
+def composition_stats_from_store(
+    store: compact.CompactMatchStore,
+    game_version: str | None = None,
+    tft_set_number: int | None = None,
+) -> CompositionStats:
+    """`composition_stats` over a `CompactMatchStore`, whose interned columns are used as NumPy arrays directly.
+
+    No Python work per participant is left, which makes this the fast path for large collections.
+    """
+    lookup = store.strings.lookup
+    matches = np.ones(len(store), dtype=bool)
+    if tft_set_number is not None:
+        matches &= _column(store, "matches", "tft_set_number") == tft_set_number
+    if game_version is not None:
+        versions = _column(store, "matches", "game_version")
+        matches &= np.isin(versions, [v for v in np.unique(versions).tolist() if game_version in lookup(v)])
+
+    participant_rows = _parents(_column(store, "matches", "participants_end"))
+    unit_rows = _parents(_column(store, "participants", "units_end"))
+    trait_tiers = _column(store, "traits", "tier_current")
+    active = trait_tiers > 0
+    return _composition_stats(
+        num_matches=int(matches.sum()),
+        placements=_column(store, "participants", "placement"),
+        participants=matches[participant_rows],
+        occurrences={
+            "traits": _Occurrences(
+                rows=_parents(_column(store, "participants", "traits_end"))[active],
+                codes=_column(store, "traits", "name")[active],
+                tiers=trait_tiers[active],
+            ),
+            "units": _Occurrences(
+                rows=unit_rows, codes=_column(store, "units", "character_id"), tiers=_column(store, "units", "tier")
+            ),
+            "items": _Occurrences(
+                rows=unit_rows[_parents(_column(store, "units", "item_names_end"))],
+                codes=_column(store, "item_names", "name"),
+            ),
+            "augments": _Occurrences(
+                rows=_parents(_column(store, "participants", "augments_end")), codes=_column(store, "augments", "name")
+            ),
+        },
+        name_of=lookup,
+    )
@@ -0,0 +1,79 @@
+"""Pools of several Riot API keys.
+
+Every key has its own application and method rate limits, so a crawl spreading its requests over N keys gets N times
+the throughput of one. `ApiKeyPool` picks the key with the most budget left on the request's routing host for every
+attempt; the rate limiter keeps separate buckets per key, identified by `fingerprint` so raw keys never end up in
+bucket names of shared backends:
+
+    RIOT_API_KEYS=RGAPI-first,RGAPI-second python crawl.py
+
+A key answered with 401 or 403 is retried with another key. If that succeeds the rejected key is taken out of rotation
+(revoked or expired); if every key is rejected the request itself is at fault and all keys stay in rotation.
+"""
+
+import hashlib
+import threading
+from typing import Iterable, Sequence
+
+from loguru import logger
+
+from riot.utils import rate_limit
+
+_REJECTED_STATUS_CODES = (401, 403)
+
+
+def fingerprint(api_key: str) -> str:
+    """Stable identifier of `api_key` for bucket names and logs."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class ApiKeyPool:
+    """Thread safe; clients may share one pool."""
+
+    def __init__(self, api_keys: Sequence[str]):
+        if not api_keys:
+            raise ValueError("At least one API key is required")
+        self._api_keys = {fingerprint(api_key): api_key for api_key in api_keys}
+        self._active = list(self._api_keys)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    @property
+    def active(self) -> list[str]:
+        """Fingerprints of the keys in rotation."""
+        with self._lock:
+            return list(self._active)
+
+    def choose(
+        self,
+        rate_limiter: rate_limit.RateLimiter,
+        key: rate_limit.RateLimitKey,
+        exclude: Iterable[rate_limit.RateLimitKey] = (),
+    ) -> rate_limit.RateLimitKey | None:
+        """`key` bound to the active API key with the most budget left, or None if every active key is excluded."""
+        excluded = {excluded_key.api_key_id for excluded_key in exclude}
+        candidates = [key._replace(api_key_id=api_key_id) for api_key_id in self.active if api_key_id not in excluded]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        remaining = rate_limiter.remaining_many(candidates)
+        return max(zip(remaining, candidates), key=lambda pair: pair[0])[1]
+
+    def api_key(self, key: rate_limit.RateLimitKey | None) -> str:
+        """The API key `key` is bound to, the first active one for requests without a key."""
+        if key is None or not key.api_key_id:
+            return self._api_keys[self.active[0]]
+        return self._api_keys[key.api_key_id]
+
+    @staticmethod
+    def is_rejection(status_code: int) -> bool:
+        return status_code in _REJECTED_STATUS_CODES
+
+    def disable(self, key: rate_limit.RateLimitKey, status_code: int) -> None:
+        """Take the API key of `key` out of rotation. The last active key is never disabled."""
+        with self._lock:
+            if key.api_key_id not in self._active or len(self._active) == 1:
+                return
+            self._active.remove(key.api_key_id)
+        logger.warning(f"API key {key.api_key_id} was rejected with {status_code}, taken out of rotation")
@@ -0,0 +1,190 @@
+"""Append-only archive of raw `tft/match/v1/matches/{id}` payloads.
+
+The archive directory holds numbered segments, `segment-00000.ndjson.gz`, ..., and one sidecar `index.tsv`. Every
+match is appended to the current segment as its own gzip member holding one JSON line, so a segment is a regular
+gzipped NDJSON file (`zcat segment-00000.ndjson.gz | jq ...` works), and the index records
+`match_id<TAB>segment<TAB>offset<TAB>length` of the member, so a single match is read back by decompressing one
+member of a memory-mapped segment. Keeping the raw JSON lets matches be re-parsed when `dto.py` gains fields.
+
+Segment data is flushed before its index line is written, so an interrupted writer at worst leaves unindexed bytes
+at the end of a segment, which are never read.
+"""
+
+import gzip
+import mmap
+import os
+import pathlib
+import threading
+from typing import Any, BinaryIO, Iterator, NamedTuple
+
+import orjson
+
+from riot.utils import dto
+
+_INDEX_FILE = "index.tsv"
+_DEFAULT_MAX_SEGMENT_BYTES = 256 * 1024 * 1024
+
+
+class ArchiveEntry(NamedTuple):
+    segment: int
+    offset: int
+    length: int
+
+
+def _segment_path(directory: pathlib.Path, segment: int) -> pathlib.Path:
+    return directory / f"segment-{segment:05d}.ndjson.gz"
+
+
+def _load_index(directory: pathlib.Path) -> dict[str, ArchiveEntry]:
+    index = {}
+    path = directory / _INDEX_FILE
+    if not path.exists():
+        return index
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            # A torn last line of an interrupted writer is ignored.
+            if len(fields) == 4:
+                index[fields[0]] = ArchiveEntry(*map(int, fields[1:]))
+    return index
+
+
+class MatchArchiveWriter:
+    """Appends match payloads to the archive in `directory`, skipping match ids already archived.
+
+    Usage:
+        with archive.MatchArchiveWriter("tft_archive") as writer:
+            writer.append(match_id, payload)
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_segment_bytes: int = _DEFAULT_MAX_SEGMENT_BYTES):
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._index = _load_index(self._directory)
+
+        self._segment = max((entry.segment for entry in self._index.values()), default=0)
+        self._segment_file = self._open_segment()
+        index_path = self._directory / _INDEX_FILE
+        self._index_file = open(index_path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def __enter__(self) -> "MatchArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def append(self, match_id: str, payload: dict[str, Any] | bytes) -> bool:
+        """Archive `payload`, a decoded match or its raw JSON body. Returns False if `match_id` was archived already."""
+        raw = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        record = gzip.compress(raw + b"\n", mtime=0)
+        with self._lock:
+            if match_id in self._index:
+                return False
+            if self._segment_file.tell() and self._segment_file.tell() + len(record) > self._max_segment_bytes:
+                self._rotate()
+            entry = ArchiveEntry(self._segment, self._segment_file.tell(), len(record))
+            self._segment_file.write(record)
+            self._segment_file.flush()
+            self._index_file.write(f"{match_id}\t{entry.segment}\t{entry.offset}\t{entry.length}\n")
+            self._index_file.flush()
+            self._index[match_id] = entry
+        return True
+
+    def _open_segment(self) -> BinaryIO:
+        path = _segment_path(self._directory, self._segment)
+        return open(path, "ab")  # pylint: disable=consider-using-with
+
+    def _rotate(self) -> None:
+        self._segment_file.close()
+        self._segment += 1
+        self._segment_file = self._open_segment()
+
+    def close(self) -> None:
+        with self._lock:
+            self._segment_file.close()
+            self._index_file.close()
+
+
+class MatchArchiveReader:
+    """Random access and sequential scans over an archive through memory-mapped segments.
+
+    The reader sees the matches indexed when it was opened.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self._directory = pathlib.Path(directory)
+        self._index = _load_index(self._directory)
+        self._segments: dict[int, mmap.mmap] = {}
+
+    def __enter__(self) -> "MatchArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def match_ids(self) -> list[str]:
+        return list(self._index)
+
+    def _segment(self, segment: int) -> mmap.mmap:
+        if segment not in self._segments:
+            with open(_segment_path(self._directory, segment), "rb") as f:
+                self._segments[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._segments[segment]
+
+    def _read(self, entry: ArchiveEntry) -> bytes:
+        return gzip.decompress(self._segment(entry.segment)[entry.offset : entry.offset + entry.length])
+
+    def get_raw(self, match_id: str) -> bytes | None:
+        """Raw JSON of `match_id`, or None if it is not archived."""
+        entry = self._index.get(match_id)
+        return None if entry is None else self._read(entry)
+
+    def get(self, match_id: str) -> dict[str, Any] | None:
+        raw = self.get_raw(match_id)
+        return None if raw is None else orjson.loads(raw)
+
+    def get_match(
+        self,
+        match_id: str,
+        strict: bool = False,
+        lazy: bool = False,
+        projection: dto.MatchProjection | None = None,
+    ) -> Any:
+        raw = self.get_raw(match_id)
+        return None if raw is None else dto.match_parser(lazy, projection).from_json(raw, strict=strict)
+
+    def scan_raw(self) -> Iterator[tuple[str, bytes]]:
+        """Yield `(match_id, raw JSON)` in on-disk order, reading every segment front to back."""
+        for match_id, entry in sorted(self._index.items(), key=lambda item: item[1]):
+            yield match_id, self._read(entry)
+
+    def scan(
+        self, strict: bool = False, lazy: bool = False, projection: dto.MatchProjection | None = None
+    ) -> Iterator[Any]:
+        """Yield every archived match: as `LazyMatchDto`s if `lazy`, as records of `projection`'s fields if given.
+
+        Projected fields are validated straight from the raw JSON, the others are never turned into Python objects.
+        """
+        match_dto = dto.match_parser(lazy, projection)
+        for _, raw in self.scan_raw():
+            yield match_dto.from_json(raw, strict=strict)
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
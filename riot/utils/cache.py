@@ -0,0 +1,84 @@
+"""In-process TTL + LRU cache for decoded API responses."""
+
+import collections
+import dataclasses
+import threading
+import time
+from typing import Any, Hashable
+
+from riot.utils import types
+
+DEFAULT_TTLS = {
+    types.QueryType.LEAGUE: 300.0,
+    types.QueryType.SUMMONER: 300.0,
+}
+_DEFAULT_MAX_SIZE = 10_000
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def make_key(url: str, params: dict | None = None) -> tuple[str, tuple]:
+    return url, tuple(sorted((params or {}).items()))
+
+
+class ResponseCache:
+    """Size bounded LRU cache whose entries expire after a per `QueryType` TTL.
+
+    Query types without a TTL (by default `QueryType.MATCH`) are never cached.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[types.QueryType, float] | None = None,
+        max_size: int = _DEFAULT_MAX_SIZE,
+    ):
+        self._ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._max_size = max_size
+        self._entries: collections.OrderedDict[Hashable, tuple[float, Any]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl(self, query_type: types.QueryType) -> float:
+        return self._ttls.get(query_type, 0.0)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, query_type: types.QueryType) -> None:
+        ttl = self.ttl(query_type)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,97 @@
+"""Checkpoints for resumable, incremental crawls.
+
+For every player the store keeps a watermark: the `end_time` up to which its match ids were listed. Match ids are
+recorded as pending in the same transaction and marked completed once fetched, or failed if they can never be fetched
+(404), so a crawl interrupted halfway can pick up the pending matches and only list new matches since each player's
+watermark.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Iterable
+
+from riot.utils import sqlite_utils
+
+# Values of `match_ids.status`.
+_PENDING = 0
+_COMPLETED = 1
+_FAILED = 2
+
+
+class CheckpointStore:
+    def __init__(self, path: str | os.PathLike):
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS watermarks (puuid TEXT PRIMARY KEY, end_time INTEGER)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS match_ids (match_id TEXT PRIMARY KEY, status INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(match_ids)")]
+            if "completed" in columns:
+                # Checkpoints written before failures were recorded: their 0/1 flags are the pending/completed statuses.
+                self._connection.execute("ALTER TABLE match_ids RENAME COLUMN completed TO status")
+
+    def watermark(self, puuid: str) -> int | None:
+        with self._lock:
+            row = self._connection.execute("SELECT end_time FROM watermarks WHERE puuid = ?", (puuid,)).fetchone()
+        return row[0] if row else None
+
+    def start_time(self, puuid: str, default: int) -> int:
+        """`startTime` to list `puuid`'s matches with: its watermark, or `default` if that is later."""
+        watermark = self.watermark(puuid)
+        return default if watermark is None else max(default, watermark)
+
+    def record_match_ids(self, puuid: str, match_ids: Iterable[str], end_time: int) -> None:
+        """Record `match_ids` as pending and advance `puuid`'s watermark to `end_time`, atomically."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO match_ids (match_id) VALUES (?)", [(match_id,) for match_id in match_ids]
+            )
+            self._connection.execute(
+                "INSERT INTO watermarks VALUES (?, ?) ON CONFLICT(puuid) DO UPDATE SET end_time = MAX(end_time, ?)",
+                (puuid, end_time, end_time),
+            )
+
+    def _mark(self, match_id: str, status: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO match_ids VALUES (?, ?) ON CONFLICT(match_id) DO UPDATE SET status = ?",
+                (match_id, status, status),
+            )
+
+    def mark_completed(self, match_id: str) -> None:
+        self._mark(match_id, _COMPLETED)
+
+    def mark_failed(self, match_id: str) -> None:
+        """Record that `match_id` can never be fetched (e.g. 404), so resumed runs do not retry it."""
+        self._mark(match_id, _FAILED)
+
+    def _with_status(self, status: int) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT match_id FROM match_ids WHERE status = ? ORDER BY rowid", (status,))
+            return [row[0] for row in rows]
+
+    def pending(self) -> list[str]:
+        """Match ids recorded but not fetched yet, e.g. by an interrupted run."""
+        return self._with_status(_PENDING)
+
+    def failed(self) -> list[str]:
+        """Match ids marked as permanently failed."""
+        return self._with_status(_FAILED)
+
+    def completed(self, match_ids: Iterable[str]) -> set[str]:
+        """Return the subset of `match_ids` already done with: fetched or permanently failed."""
+        with self._lock:
+            return sqlite_utils.select_in(
+                self._connection,
+                f"SELECT match_id FROM match_ids WHERE status != {_PENDING} AND match_id IN ({{placeholders}})",
+                list(match_ids),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,223 @@
+"""Columnar (Arrow / Parquet) export of `MatchDto`s.
+
+Matches are flattened into normalized tables joined by `match_id` / `puuid`:
+
+    matches       one row per match
+    participants  one row per (match_id, puuid)
+    units         one row per unit on a participant's board
+    traits        one row per trait of a participant
+    augments      one row per augment pick of a participant
+
+Names drawn from small vocabularies (units, items, traits, augments, game versions) are dictionary encoded.
+"""
+
+import os
+import pathlib
+from typing import Iterable
+
+from pyarrow import parquet as pq
+import pyarrow as pa
+
+from riot.utils import dto
+
+_NAME = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMAS = {
+    "matches": pa.schema(
+        [
+            ("match_id", pa.string()),
+            ("data_version", pa.string()),
+            ("game_datetime", pa.float64()),
+            ("game_length", pa.float64()),
+            ("game_version", _NAME),
+            ("game_variation", pa.string()),
+            ("queue_id", pa.int32()),
+            ("tft_set_number", pa.int16()),
+        ]
+    ),
+    "participants": pa.schema(
+        [
+            ("match_id", pa.string()),
+            ("puuid", pa.string()),
+            ("placement", pa.int8()),
+            ("level", pa.int8()),
+            ("gold_left", pa.int16()),
+            ("last_round", pa.int16()),
+            ("players_eliminated", pa.int8()),
+            ("time_eliminated", pa.float32()),
+            ("total_damage_to_players", pa.int32()),
+            ("riot_id_game_name", pa.string()),
+            ("riot_id_tag_line", pa.string()),
+        ]
+    ),
+    "units": pa.schema(
+        [
+            ("match_id", pa.string()),
+            ("puuid", pa.string()),
+            ("character_id", _NAME),
+            ("rarity", pa.int8()),
+            ("tier", pa.int8()),
+            ("chosen", _NAME),
+            ("item_names", pa.list_(_NAME)),
+        ]
+    ),
+    "traits": pa.schema(
+        [
+            ("match_id", pa.string()),
+            ("puuid", pa.string()),
+            ("name", _NAME),
+            ("num_units", pa.int8()),
+            ("style", pa.int8()),
+            ("tier_current", pa.int8()),
+            ("tier_total", pa.int8()),
+        ]
+    ),
+    "augments": pa.schema(
+        [
+            ("match_id", pa.string()),
+            ("puuid", pa.string()),
+            ("slot", pa.int8()),
+            ("augment", _NAME),
+        ]
+    ),
+}
+
+
+class MatchTableBuilder:
+    """Accumulates matches column by column and turns them into Arrow tables."""
+
+    def __init__(self):
+        self._columns = {table: {field.name: [] for field in schema} for table, schema in SCHEMAS.items()}
+        self.num_matches = 0
+
+    def add(self, match: dto.MatchDto) -> None:
+        match_id = match.metadata.match_id
+        info = match.info
+        self._append(
+            "matches",
+            match_id=match_id,
+            data_version=match.metadata.data_version,
+            game_datetime=info.game_datetime,
+            game_length=info.game_length,
+            game_version=info.game_version,
+            game_variation=info.game_variation,
+            queue_id=info.queue_id,
+            tft_set_number=info.tft_set_number,
+        )
+
+        for participant in info.participants:
+            puuid = participant.puuid
+            self._append(
+                "participants",
+                match_id=match_id,
+                puuid=puuid,
+                placement=participant.placement,
+                level=participant.level,
+                gold_left=participant.gold_left,
+                last_round=participant.last_round,
+                players_eliminated=participant.players_eliminated,
+                time_eliminated=participant.time_eliminated,
+                total_damage_to_players=participant.total_damage_to_players,
+                riot_id_game_name=participant.riot_id_game_name,
+                riot_id_tag_line=participant.riot_id_tag_line,
+            )
+            for unit in participant.units:
+                self._append(
+                    "units",
+                    match_id=match_id,
+                    puuid=puuid,
+                    character_id=unit.character_id,
+                    rarity=unit.rarity,
+                    tier=unit.tier,
+                    chosen=unit.chosen,
+                    item_names=unit.item_names,
+                )
+            for trait in participant.traits:
+                self._append(
+                    "traits",
+                    match_id=match_id,
+                    puuid=puuid,
+                    name=trait.name,
+                    num_units=trait.num_units,
+                    style=trait.style,
+                    tier_current=trait.tier_current,
+                    tier_total=trait.tier_total,
+                )
+            for slot, augment in enumerate(participant.augments):
+                self._append("augments", match_id=match_id, puuid=puuid, slot=slot, augment=augment)
+
+        self.num_matches += 1
+
+    def extend(self, matches: Iterable[dto.MatchDto]) -> None:
+        for match in matches:
+            self.add(match)
+
+    def _append(self, table: str, **row) -> None:
+        columns = self._columns[table]
+        for name, value in row.items():
+            columns[name].append(value)
+
+    def to_tables(self) -> dict[str, pa.Table]:
+        return {table: pa.Table.from_pydict(self._columns[table], schema=schema) for table, schema in SCHEMAS.items()}
+
+    def clear(self) -> None:
+        for columns in self._columns.values():
+            for values in columns.values():
+                values.clear()
+        self.num_matches = 0
+
+
+def to_tables(matches: Iterable[dto.MatchDto]) -> dict[str, pa.Table]:
+    builder = MatchTableBuilder()
+    builder.extend(matches)
+    return builder.to_tables()
+
+
+class ParquetMatchWriter:
+    """Streams matches into one Parquet file per table, `<directory>/<table>.parquet`.
+
+    Matches are buffered and flushed as one row group every `matches_per_row_group` matches, so memory stays
+    bounded however many matches are written.
+
+    Usage:
+        with columnar.ParquetMatchWriter("tft_matches") as writer:
+            for match in crawl.run():
+                writer.write(match)
+    """
+
+    def __init__(self, directory: str | os.PathLike, matches_per_row_group: int = 10_000, compression: str = "zstd"):
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._matches_per_row_group = matches_per_row_group
+        self._builder = MatchTableBuilder()
+        self._writers = {
+            table: pq.ParquetWriter(self._directory / f"{table}.parquet", schema, compression=compression)
+            for table, schema in SCHEMAS.items()
+        }
+
+    def __enter__(self) -> "ParquetMatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, match: dto.MatchDto) -> None:
+        self._builder.add(match)
+        if self._builder.num_matches >= self._matches_per_row_group:
+            self.flush()
+
+    def write_many(self, matches: Iterable[dto.MatchDto]) -> None:
+        for match in matches:
+            self.write(match)
+
+    def flush(self) -> None:
+        if not self._builder.num_matches:
+            return
+        for table, data in self._builder.to_tables().items():
+            self._writers[table].write_table(data)
+        self._builder.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
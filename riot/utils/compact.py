@@ -0,0 +1,293 @@
+"""Compact in-memory store for large match collections.
+
+A `MatchDto` keeps a pydantic model per participant, unit and trait, each with its own copies of names drawn from
+vocabularies of a few hundred strings. `CompactMatchStore` interns every string into an integer id and keeps
+matches, participants, units, traits and augments in flat `array.array` columns linked by offsets, which takes a
+small fraction of the memory. Matches are converted back to `MatchDto`s on demand.
+"""
+
+import array
+import sys
+from typing import Iterable, Iterator
+
+from riot.utils import dto
+
+_NONE = -1
+
+
+class Vocabulary:
+    """Bidirectional string <-> integer id mapping."""
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str | None) -> int:
+        if value is None:
+            return _NONE
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def lookup(self, string_id: int) -> str | None:
+        return None if string_id == _NONE else self._strings[string_id]
+
+    def nbytes(self) -> int:
+        return sum(sys.getsizeof(s) for s in self._strings) + sys.getsizeof(self._ids) + sys.getsizeof(self._strings)
+
+
+class _Columns:
+    """Named `array.array` columns of one record type."""
+
+    def __init__(self, **typecodes: str):
+        self.__dict__.update({name: array.array(typecode) for name, typecode in typecodes.items()})
+
+    def append(self, **values: int | float) -> None:
+        for name, value in values.items():
+            self.__dict__[name].append(value)
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self.__dict__.values())
+
+
+class CompactMatchStore:
+    """Append-only match collection with interned strings and array-backed columns.
+
+    Usage:
+        store = compact.CompactMatchStore(riot_api_client.get_match_data_by_match_ids(match_ids))
+        match = store.get("KR_7348987032")
+    """
+
+    def __init__(self, matches: Iterable[dto.MatchDto] = ()):
+        self.strings = Vocabulary()
+        self._match_ids: list[str] = []
+        self._index: dict[str, int] = {}
+        # Every record type stores the end offset of its children; the start is the previous record's end.
+        self._matches = _Columns(
+            data_version="i",
+            game_datetime="d",
+            game_length="d",
+            game_version="i",
+            game_variation="i",
+            queue_id="i",
+            tft_set_number="h",
+            participants_end="I",
+            metadata_puuids_end="I",
+        )
+        self._metadata_puuids = _Columns(puuid="i")
+        self._participants = _Columns(
+            puuid="i",
+            placement="b",
+            level="b",
+            gold_left="h",
+            last_round="h",
+            players_eliminated="b",
+            time_eliminated="d",
+            total_damage_to_players="i",
+            riot_id_game_name="i",
+            riot_id_tag_line="i",
+            augments_end="I",
+            traits_end="I",
+            units_end="I",
+        )
+        self._augments = _Columns(name="i")
+        self._traits = _Columns(name="i", num_units="b", style="b", tier_current="b", tier_total="b")
+        self._units = _Columns(
+            character_id="i",
+            chosen="i",
+            name="i",
+            rarity="b",
+            tier="b",
+            items_end="I",
+            item_names_end="I",
+        )
+        self._items = _Columns(item_id="i")
+        self._item_names = _Columns(name="i")
+        self._tables = {
+            "matches": self._matches,
+            "metadata_puuids": self._metadata_puuids,
+            "participants": self._participants,
+            "augments": self._augments,
+            "traits": self._traits,
+            "units": self._units,
+            "items": self._items,
+            "item_names": self._item_names,
+        }
+        self.extend(matches)
+
+    def __len__(self) -> int:
+        return len(self._match_ids)
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._index
+
+    def __getitem__(self, index: int) -> dto.MatchDto:
+        return self.to_match_dto(index)
+
+    def __iter__(self) -> Iterator[dto.MatchDto]:
+        for index in range(len(self)):
+            yield self.to_match_dto(index)
+
+    @property
+    def match_ids(self) -> list[str]:
+        return list(self._match_ids)
+
+    def column(self, table: str, name: str) -> array.array:
+        """Raw column of one record type, e.g. `column("units", "character_id")`, for vectorized consumers.
+
+        String columns hold ids into `strings`, -1 for None. Records of a child table belong to the parent record
+        whose `<table>_end` offset they precede, e.g. `column("participants", "units_end")`.
+        """
+        return getattr(self._tables[table], name)
+
+    def add(self, match: dto.MatchDto) -> None:
+        intern = self.strings.intern
+        metadata, info = match.metadata, match.info
+        if metadata.match_id in self._index:
+            return
+
+        for participant in info.participants:
+            self._augments.name.extend(intern(augment) for augment in participant.augments)
+            for trait in participant.traits:
+                self._traits.append(
+                    name=intern(trait.name),
+                    num_units=trait.num_units,
+                    style=trait.style,
+                    tier_current=trait.tier_current,
+                    tier_total=trait.tier_total,
+                )
+            for unit in participant.units:
+                self._items.item_id.extend(unit.items)
+                self._item_names.name.extend(intern(item_name) for item_name in unit.item_names)
+                self._units.append(
+                    character_id=intern(unit.character_id),
+                    chosen=intern(unit.chosen),
+                    name=intern(unit.name),
+                    rarity=unit.rarity,
+                    tier=unit.tier,
+                    items_end=len(self._items.item_id),
+                    item_names_end=len(self._item_names.name),
+                )
+            self._participants.append(
+                puuid=intern(participant.puuid),
+                placement=participant.placement,
+                level=participant.level,
+                gold_left=participant.gold_left,
+                last_round=participant.last_round,
+                players_eliminated=participant.players_eliminated,
+                time_eliminated=participant.time_eliminated,
+                total_damage_to_players=participant.total_damage_to_players,
+                riot_id_game_name=intern(participant.riot_id_game_name),
+                riot_id_tag_line=intern(participant.riot_id_tag_line),
+                augments_end=len(self._augments.name),
+                traits_end=len(self._traits.name),
+                units_end=len(self._units.character_id),
+            )
+
+        self._metadata_puuids.puuid.extend(intern(puuid) for puuid in metadata.participants_puuids)
+        self._matches.append(
+            data_version=intern(metadata.data_version),
+            game_datetime=info.game_datetime,
+            game_length=info.game_length,
+            game_version=intern(info.game_version),
+            game_variation=intern(info.game_variation),
+            queue_id=info.queue_id,
+            tft_set_number=info.tft_set_number,
+            participants_end=len(self._participants.puuid),
+            metadata_puuids_end=len(self._metadata_puuids.puuid),
+        )
+        self._index[metadata.match_id] = len(self._match_ids)
+        self._match_ids.append(metadata.match_id)
+
+    def extend(self, matches: Iterable[dto.MatchDto]) -> None:
+        for match in matches:
+            self.add(match)
+
+    def get(self, match_id: str) -> dto.MatchDto | None:
+        index = self._index.get(match_id)
+        return None if index is None else self.to_match_dto(index)
+
+    @staticmethod
+    def _span(ends: array.array, index: int) -> range:
+        return range(ends[index - 1] if index else 0, ends[index])
+
+    def to_match_dto(self, index: int) -> dto.MatchDto:
+        lookup = self.strings.lookup
+        matches, participants, units, traits = self._matches, self._participants, self._units, self._traits
+        participant_rows = self._span(matches.participants_end, index)
+
+        return dto.MatchDto.model_validate(
+            {
+                "metadata": {
+                    "data_version": lookup(matches.data_version[index]),
+                    "match_id": self._match_ids[index],
+                    "participants_puuids": [
+                        lookup(self._metadata_puuids.puuid[i]) for i in self._span(matches.metadata_puuids_end, index)
+                    ],
+                },
+                "info": {
+                    "game_datetime": matches.game_datetime[index],
+                    "game_length": matches.game_length[index],
+                    "game_version": lookup(matches.game_version[index]),
+                    "game_variation": lookup(matches.game_variation[index]),
+                    "queue_id": matches.queue_id[index],
+                    "tft_set_number": matches.tft_set_number[index],
+                    "participants": [
+                        {
+                            "augments": [
+                                lookup(self._augments.name[a]) for a in self._span(participants.augments_end, p)
+                            ],
+                            "gold_left": participants.gold_left[p],
+                            "last_round": participants.last_round[p],
+                            "level": participants.level[p],
+                            "placement": participants.placement[p],
+                            "players_eliminated": participants.players_eliminated[p],
+                            "puuid": lookup(participants.puuid[p]),
+                            "riot_id_game_name": lookup(participants.riot_id_game_name[p]),
+                            "riot_id_tag_line": lookup(participants.riot_id_tag_line[p]),
+                            "time_eliminated": participants.time_eliminated[p],
+                            "total_damage_to_players": participants.total_damage_to_players[p],
+                            "traits": [
+                                {
+                                    "name": lookup(traits.name[t]),
+                                    "num_units": traits.num_units[t],
+                                    "style": traits.style[t],
+                                    "tier_current": traits.tier_current[t],
+                                    "tier_total": traits.tier_total[t],
+                                }
+                                for t in self._span(participants.traits_end, p)
+                            ],
+                            "units": [
+                                {
+                                    "items": [self._items.item_id[i] for i in self._span(units.items_end, u)],
+                                    "item_names": [
+                                        lookup(self._item_names.name[i]) for i in self._span(units.item_names_end, u)
+                                    ],
+                                    "character_id": lookup(units.character_id[u]),
+                                    "chosen": lookup(units.chosen[u]),
+                                    "name": lookup(units.name[u]),
+                                    "rarity": units.rarity[u],
+                                    "tier": units.tier[u],
+                                }
+                                for u in self._span(participants.units_end, p)
+                            ],
+                        }
+                        for p in participant_rows
+                    ],
+                },
+            }
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the store, in bytes."""
+        return (
+            sum(columns.nbytes() for columns in self._tables.values())
+            + sum(sys.getsizeof(match_id) for match_id in self._match_ids)
+            + sys.getsizeof(self._index)
+            + self.strings.nbytes()
+        )
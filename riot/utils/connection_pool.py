@@ -0,0 +1,83 @@
+"""Per-host connection pool configuration for the Riot API clients.
+
+Every routing host (`kr`, `asia`, ...) gets its own pool of kept-alive connections, sized by `PoolConfig`, so
+concurrent crawls reuse sockets instead of paying a TCP + TLS handshake per request:
+
+    pool_config = connection_pool.PoolConfig(max_connections=16, max_connections_per_host={"asia": 32})
+    riot_api_client = client.RiotApiClient(pool_config=pool_config)
+    riot_api_client.warm_up(config)
+    ...
+    logger.info(riot_api_client.pool_stats())
+"""
+
+import dataclasses
+import socket
+from typing import Any
+
+from requests import adapters
+from urllib3 import connection
+
+
+@dataclasses.dataclass(frozen=True)
+class PoolConfig:
+    """
+    Args:
+        max_connections: Connections kept per host. Defaults to `requests`' pool size for the sync client and to
+            `max_concurrency` for the async client.
+        max_connections_per_host: Overrides of `max_connections` per routing value, e.g. `{"asia": 32}`.
+        keep_alive: Reuse connections across requests. Sockets additionally get TCP keep-alive probes so idle pooled
+            connections are not silently dropped by NATs.
+        keep_alive_timeout: Seconds an idle connection is kept open by the async client. `requests` keeps idle
+            connections until the server closes them.
+        block: Make the sync client wait for a free connection instead of opening one that is discarded afterwards
+            when more threads than `max_connections` hit one host.
+    """
+
+    max_connections: int | None = None
+    max_connections_per_host: dict[str, int] = dataclasses.field(default_factory=dict)
+    keep_alive: bool = True
+    keep_alive_timeout: float = 60.0
+    block: bool = False
+
+    def max_connections_for(self, routing_value: str | None, default: int) -> int:
+        if routing_value in self.max_connections_per_host:
+            return self.max_connections_per_host[routing_value]
+        return self.max_connections or default
+
+
+@dataclasses.dataclass(frozen=True)
+class PoolStats:
+    """Connection usage of one routing host. `host` is None for requests made without a routing value."""
+
+    host: str | None
+    max_connections: int
+    connections_opened: int
+    requests: int
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests sent over an already open connection."""
+        return 1 - self.connections_opened / self.requests if self.requests else 0.0
+
+
+class KeepAliveAdapter(adapters.HTTPAdapter):
+    """`HTTPAdapter` with one bounded pool per host whose sockets send TCP keep-alive probes."""
+
+    def __init__(self, pool_maxsize: int, pool_block: bool = False, keep_alive: bool = True, hosts: int = 1):
+        self.max_connections = pool_maxsize
+        self._socket_options = list(connection.HTTPConnection.default_socket_options)
+        if keep_alive:
+            self._socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        super().__init__(pool_connections=hosts, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any) -> None:
+        super().init_poolmanager(connections, maxsize, block=block, socket_options=self._socket_options, **pool_kwargs)
+
+    def stats(self, host: str | None) -> PoolStats:
+        pools = [self.poolmanager.pools[key] for key in self.poolmanager.pools.keys()]
+        return PoolStats(
+            host=host,
+            max_connections=self.max_connections,
+            connections_opened=sum(pool.num_connections for pool in pools),
+            requests=sum(pool.num_requests for pool in pools),
+        )
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import functools
+import typing
+from typing import Any, Callable, Iterable, Self
+
+import orjson
 import pydantic
 
 
@@ -142,123 +147,277 @@ class LeagueListDto(pydantic.BaseModel):
         """
 
 
-class MetadataDto(pydantic.BaseModel):
-    data_version: str
-    match_id: str
-    participants_puuids: list[str]
+class _MatchDtoBase(pydantic.BaseModel):
+    """Base of the match DTOs, validated straight from Riot's payload through field aliases.
+
+    Validation runs once, inside pydantic-core, instead of converting every field by hand in Python first.
+    `strict=True` additionally rejects values of the wrong JSON type instead of coercing them.
+    """
+
+    model_config = pydantic.ConfigDict(populate_by_name=True)
 
     @classmethod
-    def from_dict(cls, d: dict[str, str | list[str]]) -> MetadataDto:
-        return cls(
-            data_version=d["data_version"],
-            match_id=d["match_id"],
-            participants_puuids=d["participants"],
-        )
+    def from_dict(cls, d: dict[str, Any], strict: bool = False) -> Self:
+        return cls.model_validate(d, strict=strict)
 
+    @classmethod
+    def from_json(cls, raw: bytes | str, strict: bool = False) -> Self:
+        """Parse and validate a raw JSON response body in a single pass."""
+        return cls.model_validate_json(raw, strict=strict)
 
-class TraitDto(pydantic.BaseModel):
+
+class MetadataDto(_MatchDtoBase):
+    data_version: str
+    match_id: str
+    participants_puuids: list[str] = pydantic.Field(validation_alias="participants")
+
+
+class TraitDto(_MatchDtoBase):
     name: str
     num_units: int
     style: int
     tier_current: int
     tier_total: int
 
-    @classmethod
-    def from_dict(cls, d: dict[str, str]) -> TraitDto:
-        return cls(
-            name=d["name"],
-            num_units=int(d["num_units"]),
-            style=int(d["style"]),
-            tier_current=int(d["tier_current"]),
-            tier_total=int(d["tier_total"]),
-        )
-
 
-class UnitDto(pydantic.BaseModel):
-    items: list[int]
-    item_names: list[str]
+class UnitDto(_MatchDtoBase):
+    items: list[int] = []
+    item_names: list[str] = pydantic.Field(validation_alias="itemNames")
     character_id: str
-    chosen: str | None
+    chosen: str | None = None
     name: str
     rarity: int
     tier: int
 
-    @classmethod
-    def from_dict(cls, d: dict[str, str, list]) -> UnitDto:
-        return cls(
-            items=d.get("items", []),
-            item_names=d["itemNames"],
-            character_id=d["character_id"],
-            chosen=d.get("chosen", None),
-            name=d["name"],
-            rarity=int(d["rarity"]),
-            tier=int(d["tier"]),
-        )
-
 
-class ParticipantDto(pydantic.BaseModel):
-    augments: list[str]
+class ParticipantDto(_MatchDtoBase):
+    augments: list[str] = []
     gold_left: int
     last_round: int
     level: int
     placement: int
     players_eliminated: int
     puuid: str
-    riot_id_game_name: str | None
-    riot_id_tag_line: str | None
+    riot_id_game_name: str | None = pydantic.Field(None, validation_alias="riotIdGameName")
+    riot_id_tag_line: str | None = pydantic.Field(None, validation_alias="riotIdTagline")
     time_eliminated: float
     total_damage_to_players: int
     traits: list[TraitDto]
     units: list[UnitDto]
 
-    @classmethod
-    def from_dict(cls, d: dict[str, str | dict | list]) -> ParticipantDto:
-        return cls(
-            augments=d.get("augments", []),
-            gold_left=int(d["gold_left"]),
-            last_round=int(d["last_round"]),
-            level=int(d["level"]),
-            placement=int(d["placement"]),
-            players_eliminated=int(d["players_eliminated"]),
-            puuid=d["puuid"],
-            riot_id_game_name=d.get("riotIdGameName", None),
-            riot_id_tag_line=d.get("riotIdTagline", None),
-            time_eliminated=float(d["time_eliminated"]),
-            total_damage_to_players=int(d["total_damage_to_players"]),
-            traits=[TraitDto.from_dict(t) for t in d["traits"]],
-            units=[UnitDto.from_dict(u) for u in d["units"]],
-        )
 
-
-class InfoDto(pydantic.BaseModel):
+class InfoDto(_MatchDtoBase):
     game_datetime: float
     game_length: float
     game_version: str
-    game_variation: str | None
+    game_variation: str | None = None
     participants: list[ParticipantDto]
     queue_id: int
     tft_set_number: int
 
-    @classmethod
-    def from_dict(cls, d: dict[str, str | dict]) -> InfoDto:
-        return cls(
-            game_datetime=float(d["game_datetime"]),
-            game_length=float(d["game_length"]),
-            game_variation=d.get("game_variation", None),
-            game_version=d["game_version"],
-            participants=[ParticipantDto.from_dict(p) for p in d["participants"]],
-            queue_id=int(d["queue_id"]),
-            tft_set_number=int(d["tft_set_number"]),
-        )
-
 
-class MatchDto(pydantic.BaseModel):
+class MatchDto(_MatchDtoBase):
     metadata: MetadataDto
     info: InfoDto
 
+
+def _dto_type(annotation: Any) -> tuple[type[_MatchDtoBase] | None, bool]:
+    """The match DTO `annotation` holds, and whether it is a list of them."""
+    is_list = typing.get_origin(annotation) is list
+    if is_list:
+        annotation = typing.get_args(annotation)[0]
+    if isinstance(annotation, type) and issubclass(annotation, _MatchDtoBase):
+        return annotation, is_list
+    return None, False
+
+
+def _has_dto_fields(model: type[_MatchDtoBase]) -> bool:
+    return any(_dto_type(field.annotation)[0] is not None for field in model.model_fields.values())
+
+
+@functools.cache
+def _field_converters(model: type[_MatchDtoBase]) -> dict[str, tuple[str, Callable[[Any, bool], Any]]]:
+    """Field name -> (payload key, converter of the payload value) of `model`.
+
+    Fields holding DTOs with DTO fields of their own (`info`, `participants`) become `LazyDto`s, all others are
+    validated whole.
+    """
+    converters = {}
+    for name, field in model.model_fields.items():
+        alias = field.validation_alias if isinstance(field.validation_alias, str) else name
+        nested, is_list = _dto_type(field.annotation)
+        if nested is not None and _has_dto_fields(nested):
+            converters[name] = (alias, functools.partial(_lazy_list if is_list else LazyDto, nested))
+        else:
+            converters[name] = (alias, functools.partial(_validate, pydantic.TypeAdapter(field.annotation)))
+    return converters
+
+
+def _lazy_list(model: type[_MatchDtoBase], value: list[dict[str, Any]], strict: bool) -> list[LazyDto]:
+    return [LazyDto(model, item, strict) for item in value]
+
+
+def _validate(adapter: pydantic.TypeAdapter, value: Any, strict: bool) -> Any:
+    return adapter.validate_python(value, strict=strict)
+
+
+class LazyDto:
+    """Read-only view of a match DTO over its decoded payload, validating every field on first access.
+
+    Attributes read like those of the DTO, so a filter reading only `info.game_version` or each participant's
+    `placement` never builds the `TraitDto`s and `UnitDto`s it skips. DTOs whose fields are all leaves (`TraitDto`,
+    `UnitDto`, `MetadataDto`) are built whole when accessed. Anything else of the DTO's API, like `model_dump()`,
+    validates the whole payload once and is served by the resulting DTO.
+
+    Values of wrong type, and missing fields, only raise `pydantic.ValidationError` when accessed. The payload is
+    never modified, it may be shared with caches.
+    """
+
+    def __init__(self, model: type[_MatchDtoBase], payload: dict[str, Any], strict: bool = False):
+        self._model = model
+        self._payload = payload
+        self._strict = strict
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set yet; values are stored on the instance once validated.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        converters = _field_converters(self._model)
+        if name not in converters:
+            return getattr(self.materialize(), name)
+
+        alias, converter = converters[name]
+        # Like the DTOs (`populate_by_name`), the alias takes precedence over the field name.
+        if alias in self._payload:
+            value = converter(self._payload[alias], self._strict)
+        elif name in self._payload:
+            value = converter(self._payload[name], self._strict)
+        else:
+            field = self._model.model_fields[name]
+            if field.is_required():
+                self.materialize()  # Raises the validation error of the missing field.
+            value = field.get_default(call_default_factory=True)
+        self.__dict__[name] = value
+        return value
+
+    def materialize(self) -> _MatchDtoBase:
+        """The whole DTO, validated from the payload once."""
+        if "_materialized" not in self.__dict__:
+            self.__dict__["_materialized"] = self._model.model_validate(self._payload, strict=self._strict)
+        return self.__dict__["_materialized"]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyDto):
+            return self.materialize() == other.materialize()
+        if isinstance(other, pydantic.BaseModel):
+            return self.materialize() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._model.__name__}({self._payload!r})"
+
+
+class LazyMatchDto(LazyDto):
+    """Lazily validated `MatchDto`."""
+
+    def __init__(self, payload: dict[str, Any], strict: bool = False):
+        super().__init__(MatchDto, payload, strict)
+
     @classmethod
-    def from_dict(cls, d: dict[str, str | dict]) -> MatchDto:
-        return cls(
-            metadata=MetadataDto.from_dict(d["metadata"]),
-            info=InfoDto.from_dict(d["info"]),
+    def from_dict(cls, d: dict[str, Any], strict: bool = False) -> LazyMatchDto:
+        return cls(d, strict)
+
+    @classmethod
+    def from_json(cls, raw: bytes | str, strict: bool = False) -> LazyMatchDto:
+        return cls(orjson.loads(raw), strict)
+
+
+# A projection is a tree of selected fields: field name -> selected fields of its DTO, empty to keep the whole field.
+_FieldTree = tuple[tuple[str, "_FieldTree"], ...]
+
+
+@functools.cache
+def _project(model: type[_MatchDtoBase], tree: _FieldTree) -> type[_MatchDtoBase]:
+    """A slim copy of `model` with only the fields of `tree`, validated from the same payload keys."""
+    fields: dict[str, Any] = {}
+    for name, subtree in tree:
+        field = model.model_fields[name]
+        if not subtree:
+            fields[name] = (field.annotation, field)
+            continue
+        nested, is_list = _dto_type(field.annotation)
+        projected = _project(nested, subtree)
+        fields[name] = (
+            list[projected] if is_list else projected,
+            pydantic.Field(validation_alias=field.validation_alias),
         )
+    return pydantic.create_model(f"{model.__name__}Projection", __base__=_MatchDtoBase, **fields)
+
+
+def _is_field_path(model: type[_MatchDtoBase] | None, names: tuple[str, ...]) -> bool:
+    if not names:
+        return True
+    if model is None or names[0] not in model.model_fields:
+        return False
+    return _is_field_path(_dto_type(model.model_fields[names[0]].annotation)[0], names[1:])
+
+
+def _resolve(path: str) -> tuple[str, ...]:
+    """`path` from the match down. Paths may also start at `InfoDto` or `ParticipantDto`, e.g. `traits.name`."""
+    names = tuple(path.split("."))
+    for prefix in [(), ("info",), ("info", "participants")]:
+        if _is_field_path(MatchDto, (*prefix, *names)):
+            return (*prefix, *names)
+    raise ValueError(f"Unknown match field {path!r}")
+
+
+class MatchProjection:
+    """Parses match payloads into slim records holding only the selected fields, for jobs keeping many matches.
+
+    Fields are dotted paths from `MatchDto`, `InfoDto` or `ParticipantDto`; selecting a DTO keeps it whole:
+
+        projection = dto.MatchProjection(["placement", "traits.name", "traits.tier_current", "augments"])
+        record = projection.from_dict(payload)
+        record.info.participants[0].traits[0].tier_current
+
+    Records are pydantic models with the same field names and nesting as `MatchDto`. `metadata` is always kept, so
+    records stay identifiable. Other fields of the payload are skipped by the validator without being converted;
+    `from_json` does so straight from the raw bytes.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        paths = sorted({_resolve(path) for path in [*fields, "metadata"]})
+        # A selected DTO is kept whole, selections inside it are moot.
+        self.fields = [
+            path for path in paths if not any(path[: len(other)] == other for other in paths if other != path)
+        ]
+        self.model = _project(MatchDto, self._tree(self.fields))
+
+    @classmethod
+    def _tree(cls, paths: list[tuple[str, ...]]) -> _FieldTree:
+        children: dict[str, list[tuple[str, ...]]] = {}
+        for path in paths:
+            children.setdefault(path[0], [])
+            if len(path) > 1:
+                children[path[0]].append(path[1:])
+        return tuple((name, cls._tree(subpaths)) for name, subpaths in children.items())
+
+    def from_dict(self, d: dict[str, Any], strict: bool = False) -> _MatchDtoBase:
+        return self.model.model_validate(d, strict=strict)
+
+    def from_json(self, raw: bytes | str, strict: bool = False) -> _MatchDtoBase:
+        return self.model.model_validate_json(raw, strict=strict)
+
+    def __repr__(self) -> str:
+        return f"MatchProjection({['.'.join(path) for path in self.fields]!r})"
+
+
+def match_parser(
+    lazy: bool = False, projection: MatchProjection | None = None
+) -> type[MatchDto] | type[LazyMatchDto] | MatchProjection:
+    """What parses match payloads with `from_dict` / `from_json`: `MatchDto`, `LazyMatchDto` or `projection`."""
+    if lazy and projection is not None:
+        raise ValueError("Matches are either parsed lazily or projected")
+    return projection or (LazyMatchDto if lazy else MatchDto)
@@ -1,3 +1,7 @@
+import dataclasses
+from typing import Iterable
+
+
 def err_code_to_err_msg(error_code: int) -> str:
     match error_code:
         case 400:
@@ -24,3 +28,29 @@ def err_code_to_err_msg(error_code: int) -> str:
             return "Gateway Timeout"
         case _:
             return "Unknown Error"
+
+
+def is_permanent(status_code: int | None) -> bool:
+    """Whether a fetch failing with `status_code` fails the same way when retried."""
+    return status_code == 404
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchFailure:
+    """A single item a bulk method gave up on."""
+
+    key: str
+    status_code: int | None
+    message: str
+
+    @property
+    def permanent(self) -> bool:
+        return is_permanent(self.status_code)
+
+
+class BulkResult(list):
+    """Results of a bulk method; items that could not be fetched are listed in `failures` instead."""
+
+    def __init__(self, results: Iterable = (), failures: list[FetchFailure] | None = None):
+        super().__init__(results)
+        self.failures: list[FetchFailure] = failures or []
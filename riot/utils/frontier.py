@@ -0,0 +1,61 @@
+"""Deduplicating crawl frontier for match ids.
+
+Every TFT match has 8 participants, so the per-puuid id lists returned by `get_match_ids_by_puuids` overlap
+heavily. `MatchFrontier` merges them into one ordered set and remembers which matches were already fetched and
+which players they covered.
+"""
+
+from typing import Iterable
+
+from riot.utils import dto
+
+
+class MatchFrontier:
+    def __init__(self, match_ids: Iterable[str] = ()):
+        # dict keeps insertion order, value tells whether the match was fetched already.
+        self._match_ids: dict[str, bool] = {}
+        self._seeded_puuids: set[str] = set()
+        self._covered_puuids: set[str] = set()
+        self.add(match_ids)
+
+    def __len__(self) -> int:
+        return len(self._match_ids)
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._match_ids
+
+    def add(self, match_ids: Iterable[str]) -> int:
+        """Add match ids, ignoring ones already known. Returns the number of new ids."""
+        before = len(self._match_ids)
+        for match_id in match_ids:
+            self._match_ids.setdefault(match_id, False)
+        return len(self._match_ids) - before
+
+    def extend(self, match_id_lists: Iterable[Iterable[str]], puuids: Iterable[str] | None = None) -> int:
+        """Merge per-puuid match id lists, e.g. the output of `get_match_ids_by_puuids`.
+
+        Args:
+            match_id_lists: One list of match ids per player.
+            puuids: Players the lists belong to, recorded as seeded.
+
+        Returns:
+            int: Number of new match ids.
+        """
+        self._seeded_puuids.update(puuids or [])
+        return sum(self.add(match_ids) for match_ids in match_id_lists)
+
+    def pending(self) -> list[str]:
+        """Match ids not fetched yet, in the order they were first seen."""
+        return [match_id for match_id, fetched in self._match_ids.items() if not fetched]
+
+    def mark_fetched(self, match: dto.MatchDto) -> None:
+        self._match_ids[match.metadata.match_id] = True
+        self._covered_puuids.update(match.metadata.participants_puuids)
+
+    def is_covered(self, puuid: str) -> bool:
+        """Whether `puuid` appeared in at least one fetched match."""
+        return puuid in self._covered_puuids
+
+    def discovered_puuids(self) -> list[str]:
+        """Players seen in fetched matches that were not used as seeds yet, to widen the crawl."""
+        return sorted(self._covered_puuids - self._seeded_puuids)
@@ -0,0 +1,59 @@
+"""Persistent SQLite store for raw `tft/match/v1/matches/{id}` payloads.
+
+Finished matches never change, so a payload fetched once can be served from disk forever.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable
+import zlib
+
+from riot.utils import sqlite_utils
+
+
+class MatchStore:
+    def __init__(self, path: str | os.PathLike):
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS matches (match_id TEXT PRIMARY KEY, payload BLOB)")
+
+    def __contains__(self, match_id: str) -> bool:
+        return bool(self.contains([match_id]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def get(self, match_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute("SELECT payload FROM matches WHERE match_id = ?", (match_id,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, match_id: str, payload: dict[str, Any]) -> None:
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO matches VALUES (?, ?)", (match_id, blob))
+
+    def contains(self, match_ids: Iterable[str]) -> set[str]:
+        """Return the subset of `match_ids` already in the store."""
+        with self._lock:
+            return sqlite_utils.select_in(
+                self._connection, "SELECT match_id FROM matches WHERE match_id IN ({placeholders})", list(match_ids)
+            )
+
+    def missing(self, match_ids: Iterable[str]) -> list[str]:
+        """Return `match_ids` not yet in the store, preserving order."""
+        match_ids = list(match_ids)
+        found = self.contains(match_ids)
+        return [match_id for match_id in match_ids if match_id not in found]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,160 @@
+"""Metrics and tracing hooks for the Riot API clients.
+
+Clients report every HTTP attempt as a `RequestEvent` and every `_fetch` as a `FetchEvent` to the hooks they were
+given. Custom sinks subclass `MetricsHook`. `Metrics` aggregates the events in memory and exports them in the
+Prometheus text format:
+
+    riot_metrics = metrics.Metrics()
+    riot_api_client = client.RiotApiClient(metrics_hooks=[riot_metrics])
+    ...
+    print(riot_metrics.to_prometheus())
+"""
+
+import bisect
+import dataclasses
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PARSE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestEvent:
+    """One HTTP attempt. Retries of a request are separate events with a higher `attempt`."""
+
+    query_type: str
+    endpoint: str
+    host: str
+    attempt: int
+    limiter_wait: float
+    latency: float
+    status_code: int | None = None
+    response_bytes: int = 0
+    decode_time: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchEvent:
+    """One `_fetch` call, from cache lookup to the parsed result, including all of its attempts."""
+
+    query_type: str
+    endpoint: str
+    host: str
+    latency: float
+    parse_time: float
+    cached: bool
+    coalesced: bool = False
+
+
+class MetricsHook:
+    """Receives client events. Override the methods of interest; hooks must be thread-safe."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    def on_fetch(self, event: FetchEvent) -> None:
+        pass
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        # [per-bucket counts..., +Inf count, sum]
+        series = self.series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+
+class Metrics(MetricsHook):
+    """In-memory aggregation of client events, labelled by query type, endpoint and routing host."""
+
+    _LABELS = ("query_type", "endpoint", "host")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, parse_buckets: tuple[float, ...] = PARSE_BUCKETS):
+        self._lock = threading.Lock()
+        self._histograms = {
+            "riot_request_duration_seconds": _Histogram(buckets),
+            "riot_rate_limit_wait_seconds": _Histogram(buckets),
+            "riot_fetch_duration_seconds": _Histogram(buckets),
+            "riot_parse_duration_seconds": _Histogram(parse_buckets),
+        }
+        self._counters: dict[str, dict[tuple, float]] = {
+            "riot_responses_total": {},
+            "riot_response_bytes_total": {},
+            "riot_retries_total": {},
+            "riot_cache_hits_total": {},
+            "riot_coalesced_total": {},
+        }
+
+    def _count(self, name: str, labels: tuple, value: float = 1) -> None:
+        self._counters[name][labels] = self._counters[name].get(labels, 0) + value
+
+    def on_request(self, event: RequestEvent) -> None:
+        labels = (event.query_type, event.endpoint, event.host)
+        status = str(event.status_code) if event.status_code is not None else "error"
+        with self._lock:
+            self._histograms["riot_request_duration_seconds"].observe(labels, event.latency)
+            self._histograms["riot_rate_limit_wait_seconds"].observe(labels, event.limiter_wait)
+            self._count("riot_responses_total", labels + (status,))
+            self._count("riot_response_bytes_total", labels, event.response_bytes)
+            if event.attempt:
+                self._count("riot_retries_total", labels)
+            if event.decode_time:
+                self._histograms["riot_parse_duration_seconds"].observe(labels + ("decode",), event.decode_time)
+
+    def on_fetch(self, event: FetchEvent) -> None:
+        labels = (event.query_type, event.endpoint, event.host)
+        with self._lock:
+            self._histograms["riot_fetch_duration_seconds"].observe(labels, event.latency)
+            self._histograms["riot_parse_duration_seconds"].observe(labels + ("dto",), event.parse_time)
+            if event.cached:
+                self._count("riot_cache_hits_total", labels)
+            if event.coalesced:
+                self._count("riot_coalesced_total", labels)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Sum of counter `name` over the series matching `labels`.
+
+        e.g. `counter("riot_responses_total", status="429")`.
+        """
+        with self._lock:
+            return sum(
+                value
+                for series, value in self._counters[name].items()
+                if all(dict(zip(self._label_names(name), series)).get(k) == v for k, v in labels.items())
+            )
+
+    @classmethod
+    def _label_names(cls, name: str) -> tuple[str, ...]:
+        if name == "riot_responses_total":
+            return cls._LABELS + ("status",)
+        if name == "riot_parse_duration_seconds":
+            return cls._LABELS + ("stage",)
+        return cls._LABELS
+
+    @classmethod
+    def _format_labels(cls, name: str, series: tuple, **extra: str) -> str:
+        pairs = list(zip(cls._label_names(name), series)) + list(extra.items())
+        return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                lines.append(f"# TYPE {name} histogram")
+                for series, values in sorted(histogram.series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), values[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._format_labels(name, series, le=str(bound))} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(name, series)} {values[-1]}")
+                    lines.append(f"{name}_count{self._format_labels(name, series)} {cumulative}")
+            for name, counter in self._counters.items():
+                lines.append(f"# TYPE {name} counter")
+                for series, value in sorted(counter.items()):
+                    lines.append(f"{name}{self._format_labels(name, series)} {value}")
+        return "\n".join(lines) + "\n"
@@ -24,3 +24,29 @@ class Region(enum.StrEnum):
     AMERICAS = "americas"
     ASIA = "asia"
     EUROPE = "europe"
+    SEA = "sea"
+
+
+# Regional routing value serving the match endpoints of each platform.
+PLATFORM_TO_REGION = {
+    Platform.BR1: Region.AMERICAS,
+    Platform.LA1: Region.AMERICAS,
+    Platform.LA2: Region.AMERICAS,
+    Platform.NA1: Region.AMERICAS,
+    Platform.EUN1: Region.EUROPE,
+    Platform.EUW1: Region.EUROPE,
+    Platform.TR1: Region.EUROPE,
+    Platform.RU: Region.EUROPE,
+    Platform.JP1: Region.ASIA,
+    Platform.KR: Region.ASIA,
+    Platform.OC1: Region.SEA,
+    Platform.PH2: Region.SEA,
+    Platform.SG2: Region.SEA,
+    Platform.TH2: Region.SEA,
+    Platform.TW2: Region.SEA,
+    Platform.VN2: Region.SEA,
+}
+
+
+def region_of(platform: Platform) -> Region:
+    return PLATFORM_TO_REGION[Platform(platform)]
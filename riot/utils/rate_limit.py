@@ -0,0 +1,332 @@
+"""Header driven rate limiting for the Riot API.
+
+Riot enforces an application limit per routing host (`kr`, `asia`, ...) and an additional method limit per
+(routing host, endpoint). Both are reported back on every response:
+
+    X-App-Rate-Limit: 20:1,100:120
+    X-App-Rate-Limit-Count: 3:1,17:120
+    X-Method-Rate-Limit: 2000:60
+    X-Method-Rate-Limit-Count: 4:60
+
+`RateLimiter` keeps one bucket per routing value and one per (routing value, endpoint) and learns the actual
+limits and counts from those headers, so a production key gets its full quota without code changes.
+
+Buckets live in a `RateLimitBackend`, in process memory by default. Limiters of several processes or hosts sharing
+one key share their buckets through a `shared_rate_limit` backend instead, so together they stay within the quota.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import dataclasses
+import itertools
+import json
+import math
+import threading
+import time
+from typing import Callable, Mapping, NamedTuple, Sequence, TypeVar
+
+# Development key limits, used until the first response tells us the real ones.
+DEFAULT_APP_LIMITS = "20:1,100:120"
+
+_T = TypeVar("_T")
+
+APP_RATE_LIMIT_HEADER = "X-App-Rate-Limit"
+APP_RATE_LIMIT_COUNT_HEADER = "X-App-Rate-Limit-Count"
+METHOD_RATE_LIMIT_HEADER = "X-Method-Rate-Limit"
+METHOD_RATE_LIMIT_COUNT_HEADER = "X-Method-Rate-Limit-Count"
+
+
+class RateLimitKey(NamedTuple):
+    routing_value: str
+    endpoint: str
+    # `api_keys.fingerprint` of the API key the request is sent with, every key has its own buckets.
+    api_key_id: str = ""
+
+
+def parse_rate_limit_header(value: str | None) -> dict[float, int]:
+    """Parse `"20:1,100:120"` into `{1.0: 20, 120.0: 100}` (window seconds -> request count)."""
+    if not value:
+        return {}
+
+    parsed = {}
+    for pair in value.split(","):
+        count, _, seconds = pair.strip().partition(":")
+        if not count or not seconds:
+            continue
+        parsed[float(seconds)] = int(count)
+    return parsed
+
+
+@dataclasses.dataclass
+class _Window:
+    limit: int
+    period: float
+    count: int = 0
+    started_at: float = 0.0
+
+    def refresh(self, now: float) -> None:
+        if now - self.started_at >= self.period:
+            self.count = 0
+            self.started_at = now
+
+    def wait_time(self, now: float, headroom: float = 0.0) -> float:
+        self.refresh(now)
+        if self.count < self.limit - math.ceil(self.limit * headroom):
+            return 0.0
+        ends_at = self.started_at + self.period
+        if self.count < self.limit:
+            # Slots held back as headroom are released over the last `headroom` share of the window.
+            return max(0.0, ends_at - self.period * headroom - now)
+        return ends_at - now
+
+
+class _Bucket:
+    def __init__(self, limits: dict[float, int] | None = None):
+        self._windows: dict[float, _Window] = {}
+        self.blocked_until = 0.0
+        self.set_limits(limits or {})
+
+    @property
+    def limits(self) -> dict[float, int]:
+        return {period: window.limit for period, window in self._windows.items()}
+
+    def set_limits(self, limits: dict[float, int]) -> None:
+        self._windows = {
+            period: (
+                dataclasses.replace(self._windows[period], limit=limit)
+                if period in self._windows
+                else _Window(limit=limit, period=period)
+            )
+            for period, limit in limits.items()
+        }
+
+    def sync_counts(self, counts: dict[float, int], now: float) -> None:
+        for period, count in counts.items():
+            window = self._windows.get(period)
+            if window is None:
+                continue
+            window.refresh(now)
+            window.count = max(window.count, count)
+
+    def wait_time(self, now: float, headroom: float = 0.0) -> float:
+        return max([self.blocked_until - now, *(window.wait_time(now, headroom) for window in self._windows.values())])
+
+    def remaining(self, now: float) -> float:
+        for window in self._windows.values():
+            window.refresh(now)
+        return min((window.limit - window.count for window in self._windows.values()), default=math.inf)
+
+    def consume(self, now: float) -> None:
+        for window in self._windows.values():
+            if window.count == 0:
+                window.started_at = now
+            window.count += 1
+
+    def dumps(self) -> str:
+        windows = [[w.period, w.limit, w.count, w.started_at] for w in self._windows.values()]
+        return json.dumps({"blocked_until": self.blocked_until, "windows": windows})
+
+    @classmethod
+    def loads(cls, state: str) -> _Bucket:
+        data = json.loads(state)
+        bucket = cls()
+        bucket.blocked_until = data["blocked_until"]
+        bucket._windows = {
+            period: _Window(limit=limit, period=period, count=count, started_at=started_at)
+            for period, limit, count, started_at in data["windows"]
+        }
+        return bucket
+
+
+class RateLimitBackend(abc.ABC):
+    """Where the buckets of `RateLimiter`s live. Limiters built on the same backend share their buckets."""
+
+    def now(self) -> float:
+        """Clock of the bucket windows, which must be the same for every limiter sharing the backend."""
+        return time.monotonic()
+
+    @abc.abstractmethod
+    def transact(self, names: Sequence[str], fn: Callable[[dict[str, _Bucket]], _T], read_only: bool = False) -> _T:
+        """Atomically apply `fn` to the buckets `names`.
+
+        `fn` gets the existing buckets by name, may modify them and add missing ones, and every bucket in the dict is
+        stored afterwards, unless the transaction is `read_only`: then changes are dropped and nothing is written.
+        Backends may call `fn` more than once, so it must not have other side effects.
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Keeps buckets in process memory, shared by the limiters of one process."""
+
+    def __init__(self):
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def transact(self, names: Sequence[str], fn: Callable[[dict[str, _Bucket]], _T], read_only: bool = False) -> _T:
+        with self._lock:
+            buckets = {name: self._buckets[name] for name in names if name in self._buckets}
+            result = fn(buckets)
+            if not read_only:
+                self._buckets.update(buckets)
+            return result
+
+
+class SharedRateLimitBackend(RateLimitBackend):
+    """Base of backends keeping buckets as JSON outside the process, on the wall clock shared by all processes.
+
+    Subclasses implement `_transact_states`, the atomic read-modify-write of serialized buckets.
+    """
+
+    def now(self) -> float:
+        return time.time()
+
+    def transact(self, names: Sequence[str], fn: Callable[[dict[str, _Bucket]], _T], read_only: bool = False) -> _T:
+        def apply(states: dict[str, str | None]) -> tuple[_T, dict[str, str]]:
+            buckets = {name: _Bucket.loads(state) for name, state in states.items() if state is not None}
+            result = fn(buckets)
+            return result, {} if read_only else {name: bucket.dumps() for name, bucket in buckets.items()}
+
+        return self._transact_states(names, apply, read_only)
+
+    @abc.abstractmethod
+    def _transact_states(
+        self,
+        names: Sequence[str],
+        apply: Callable[[dict[str, str | None]], tuple[_T, dict[str, str]]],
+        read_only: bool,
+    ) -> _T:
+        """Read the states of `names` (None if missing), store the states `apply` returns and return its result.
+
+        `read_only` transactions store nothing, so they only need a consistent read, without taking write locks.
+        """
+
+
+class RateLimiter:
+    """Per routing value (app) and per (routing value, endpoint) (method) rate limiter.
+
+    Thread safe; `acquire` blocks the calling thread while `acquire_async` yields to the event loop.
+    """
+
+    def __init__(self, default_app_limits: str = DEFAULT_APP_LIMITS, backend: RateLimitBackend | None = None):
+        self._default_app_limits = parse_rate_limit_header(default_app_limits)
+        self._backend = backend or InMemoryRateLimitBackend()
+
+    @staticmethod
+    def _bucket_names(key: RateLimitKey) -> tuple[str, str]:
+        """Backend names of the (app, method) buckets of `key`."""
+        app_name, method_name = f"app:{key.routing_value}", f"method:{key.routing_value}:{key.endpoint}"
+        if key.api_key_id:
+            return f"{key.api_key_id}:{app_name}", f"{key.api_key_id}:{method_name}"
+        return app_name, method_name
+
+    def _transact_many(
+        self, keys: Sequence[RateLimitKey], fn: Callable[[_Bucket, _Bucket, float], _T], read_only: bool = False
+    ) -> list[_T]:
+        """Apply `fn(app bucket, method bucket, now)` to the buckets of every key in one backend transaction."""
+        names = [self._bucket_names(key) for key in keys]
+
+        def apply(buckets: dict[str, _Bucket]) -> list[_T]:
+            now = self._backend.now()
+            results = []
+            for app_name, method_name in names:
+                if app_name not in buckets:
+                    buckets[app_name] = _Bucket(self._default_app_limits)
+                if method_name not in buckets:
+                    buckets[method_name] = _Bucket()
+                results.append(fn(buckets[app_name], buckets[method_name], now))
+            return results
+
+        return self._backend.transact(list(dict.fromkeys(itertools.chain(*names))), apply, read_only)
+
+    def _transact(self, key: RateLimitKey, fn: Callable[[_Bucket, _Bucket, float], _T], read_only: bool = False) -> _T:
+        """Apply `fn(app bucket, method bucket, now)` to the buckets of `key` in one backend transaction."""
+        return self._transact_many([key], fn, read_only)[0]
+
+    def reserve(self, key: RateLimitKey, headroom: float = 0.0) -> float:
+        """Take a slot for `key` if one is free.
+
+        Args:
+            key: Buckets to take the slot from.
+            headroom: Share of every window to leave free for other callers, until the window is about to end.
+
+        Returns:
+            float: 0 if the request may be sent now, otherwise the number of seconds to wait before retrying.
+        """
+
+        def take(app_bucket: _Bucket, method_bucket: _Bucket, now: float) -> float:
+            wait = max(bucket.wait_time(now, headroom) for bucket in (app_bucket, method_bucket))
+            if wait > 0:
+                return wait
+
+            for bucket in (app_bucket, method_bucket):
+                bucket.consume(now)
+            return 0.0
+
+        return self._transact(key, take)
+
+    @staticmethod
+    def _remaining(app_bucket: _Bucket, method_bucket: _Bucket, now: float) -> float:
+        wait = max(bucket.wait_time(now) for bucket in (app_bucket, method_bucket))
+        if wait > 0:
+            return -wait
+        return min(bucket.remaining(now) for bucket in (app_bucket, method_bucket))
+
+    def remaining(self, key: RateLimitKey) -> float:
+        """Requests `key` may still send in the current windows, or minus the seconds until it may send again."""
+        return self._transact(key, self._remaining, read_only=True)
+
+    def remaining_many(self, keys: Sequence[RateLimitKey]) -> list[float]:
+        """`remaining` of every key, read in one backend transaction."""
+        return self._transact_many(keys, self._remaining, read_only=True)
+
+    def acquire(self, key: RateLimitKey) -> float:
+        """Block until a request for `key` may be sent. Returns the total time spent waiting."""
+        waited = 0.0
+        while (wait := self.reserve(key)) > 0:
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def acquire_async(self, key: RateLimitKey) -> float:
+        waited = 0.0
+        while (wait := self.reserve(key)) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def update_from_headers(self, key: RateLimitKey, headers: Mapping[str, str]) -> None:
+        """Learn limits and current counts for `key` from a response's rate limit headers."""
+
+        def update(app_bucket: _Bucket, method_bucket: _Bucket, now: float) -> None:
+            for bucket, limit_header, count_header in [
+                (app_bucket, APP_RATE_LIMIT_HEADER, APP_RATE_LIMIT_COUNT_HEADER),
+                (method_bucket, METHOD_RATE_LIMIT_HEADER, METHOD_RATE_LIMIT_COUNT_HEADER),
+            ]:
+                limits = parse_rate_limit_header(headers.get(limit_header))
+                if limits and limits != bucket.limits:
+                    bucket.set_limits(limits)
+                bucket.sync_counts(parse_rate_limit_header(headers.get(count_header)), now)
+
+        self._transact(key, update)
+
+    def penalize(self, key: RateLimitKey, seconds: float, rate_limit_type: str | None = None) -> None:
+        """Block the bucket a 429 was attributed to (`X-Rate-Limit-Type`) for `seconds`.
+
+        `application` blocks every endpoint of the routing value, `method` only this endpoint. Service level 429s
+        are not caused by our usage and leave the buckets untouched.
+        """
+
+        def block(app_bucket: _Bucket, method_bucket: _Bucket, now: float) -> None:
+            bucket = {"application": app_bucket, "method": method_bucket}.get(rate_limit_type or "")
+            if bucket is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+
+        self._transact(key, block)
+
+    def limits(self, key: RateLimitKey) -> tuple[dict[float, int], dict[float, int]]:
+        """Currently known (app, method) limits for `key`."""
+        return self._transact(
+            key, lambda app_bucket, method_bucket, _: (app_bucket.limits, method_bucket.limits), read_only=True
+        )
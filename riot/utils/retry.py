@@ -0,0 +1,62 @@
+"""Retry policies for transient Riot API failures.
+
+429 responses are retried after `Retry-After` seconds when the header is present. 500/502/503/504 and 429s
+without `Retry-After` (typically `X-Rate-Limit-Type: service`) use jittered exponential backoff. Everything else,
+404 included, is treated as permanent and never retried.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import random
+from typing import Mapping
+
+RETRY_AFTER_HEADER = "Retry-After"
+RATE_LIMIT_TYPE_HEADER = "X-Rate-Limit-Type"
+
+
+class RateLimitType(enum.StrEnum):
+    APPLICATION = "application"
+    METHOD = "method"
+    SERVICE = "service"
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+    retry_status_codes: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter exponential backoff for the `attempt`-th retry (0 based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def next_delay(
+        self, attempt: int, status_code: int | None, headers: Mapping[str, str] | None = None
+    ) -> float | None:
+        """Seconds to wait before retrying a failed request, or None if it must not be retried.
+
+        Args:
+            attempt: Number of retries already made for this request.
+            status_code: Response status code, None for connection errors and timeouts.
+            headers: Response headers, if a response was received.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if status_code is None:
+            return self.backoff(attempt)
+        if status_code not in self.retry_status_codes:
+            return None
+
+        retry_after = (headers or {}).get(RETRY_AFTER_HEADER)
+        if status_code == 429 and retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff(attempt)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
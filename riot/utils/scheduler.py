@@ -0,0 +1,182 @@
+"""Priority scheduling of requests sharing one rate budget.
+
+`RateLimiter.acquire` lets waiting callers race for freed slots, so a backfill fanning out over many threads or tasks
+takes most of the budget and starves the occasional interactive lookup. `RequestScheduler` queues callers instead
+and hands out slots in order:
+
+* Strictly by `Priority`: a waiting `INTERACTIVE` request always gets the next free slot of its buckets before any
+  `BACKFILL` request does.
+* Lower priorities leave headroom: by default `BACKFILL` requests may use 90% of every rate limit window up front,
+  so interactive requests arriving mid-window find a free slot instead of waiting for the next window. Headroom
+  nobody used is released to backfills over the end of the window, so they keep the capacity left over.
+* Round robin between flows of the same priority, so two bulk jobs split the leftover budget evenly instead of the
+  one with more workers taking it all.
+* A waiter only blocked by its own method limit does not hold back waiters of other endpoints.
+
+Priority and flow apply to the requests made in a `scheduler.priority(...)` block, in the current thread or task:
+
+    request_scheduler = scheduler.RequestScheduler()
+    riot_api_client = client.RiotApiClient(request_scheduler=request_scheduler)
+    with scheduler.priority(scheduler.Priority.BACKFILL, flow="match-backfill"):
+        riot_api_client.get_match_data_by_match_ids(match_ids, **config.as_dict())
+"""
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import itertools
+import math
+import threading
+import time
+from typing import Hashable, Iterator
+
+from riot.utils import rate_limit
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKFILL = 2
+
+
+# Share of every rate limit window requests of a priority leave to higher priorities.
+DEFAULT_HEADROOM = {Priority.INTERACTIVE: 0.0, Priority.NORMAL: 0.0, Priority.BACKFILL: 0.1}
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestClass:
+    priority: Priority = Priority.NORMAL
+    flow: Hashable = None
+
+
+_REQUEST_CLASS = contextvars.ContextVar("request_class", default=RequestClass())
+
+
+@contextlib.contextmanager
+def priority(request_priority: Priority, flow: Hashable = None) -> Iterator[None]:
+    """Schedule the requests made inside the block with `request_priority`, as part of `flow`."""
+    token = _REQUEST_CLASS.set(RequestClass(request_priority, flow))
+    try:
+        yield
+    finally:
+        _REQUEST_CLASS.reset(token)
+
+
+def current_request_class() -> RequestClass:
+    return _REQUEST_CLASS.get()
+
+
+@dataclasses.dataclass(eq=False)
+class _Waiter:
+    key: rate_limit.RateLimitKey
+    request_class: RequestClass
+    granted: bool = False
+    loop: asyncio.AbstractEventLoop | None = None
+    event: asyncio.Event | None = None
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class RequestScheduler:
+    """Hands out the slots of `rate_limiter` to waiting requests by priority, round robin between flows.
+
+    Thread safe; `acquire` blocks the calling thread while `acquire_async` yields to the event loop. Sync and async
+    clients may share one scheduler.
+    """
+
+    def __init__(
+        self, rate_limiter: rate_limit.RateLimiter | None = None, headroom: dict[Priority, float] | None = None
+    ):
+        self.rate_limiter = rate_limiter or rate_limit.RateLimiter()
+        self._headroom = DEFAULT_HEADROOM if headroom is None else headroom
+        self._condition = threading.Condition(threading.Lock())
+        # priority -> flow -> waiters, flows in round robin order.
+        self._queues: dict[Priority, collections.OrderedDict[Hashable, collections.deque[_Waiter]]] = {
+            p: collections.OrderedDict() for p in Priority
+        }
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for flows in self._queues.values() for waiters in flows.values())
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        flows = self._queues[waiter.request_class.priority]
+        flows.setdefault(waiter.request_class.flow, collections.deque()).append(waiter)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        flows = self._queues[waiter.request_class.priority]
+        waiters = flows[waiter.request_class.flow]
+        waiters.remove(waiter)
+        if not waiters:
+            del flows[waiter.request_class.flow]
+
+    def _ordered(self) -> Iterator[_Waiter]:
+        """Waiters in service order: by priority, then alternating between flows, FIFO within a flow."""
+        for flows in self._queues.values():
+            for waiters in itertools.zip_longest(*[list(waiters) for waiters in flows.values()]):
+                yield from (waiter for waiter in waiters if waiter is not None)
+
+    def _dispatch(self) -> float:
+        """Grant free slots to waiters in service order. Returns the seconds until another slot may free up."""
+        blocked: set[tuple[rate_limit.RateLimitKey, float]] = set()
+        next_wait = math.inf
+        granted = False
+        for waiter in list(self._ordered()):
+            headroom = self._headroom.get(waiter.request_class.priority, 0.0)
+            if (waiter.key, headroom) in blocked:
+                continue
+            wait = self.rate_limiter.reserve(waiter.key, headroom)
+            if wait > 0:
+                blocked.add((waiter.key, headroom))
+                next_wait = min(next_wait, wait)
+                continue
+
+            waiter.granted = granted = True
+            self._remove(waiter)
+            # The flow served last moves to the back of its priority's round robin.
+            flows = self._queues[waiter.request_class.priority]
+            if waiter.request_class.flow in flows:
+                flows.move_to_end(waiter.request_class.flow)
+            waiter.wake()
+        if granted:
+            self._condition.notify_all()
+        return next_wait
+
+    def acquire(self, key: rate_limit.RateLimitKey) -> float:
+        """Block until it is this request's turn and a slot for `key` is free. Returns the time spent waiting."""
+        started = time.monotonic()
+        waiter = _Waiter(key, current_request_class())
+        with self._condition:
+            self._enqueue(waiter)
+            try:
+                while not waiter.granted:
+                    wait = self._dispatch()
+                    if not waiter.granted:
+                        self._condition.wait(timeout=None if math.isinf(wait) else wait)
+            finally:
+                if not waiter.granted:
+                    self._remove(waiter)
+        return time.monotonic() - started
+
+    async def acquire_async(self, key: rate_limit.RateLimitKey) -> float:
+        started = time.monotonic()
+        waiter = _Waiter(key, current_request_class(), loop=asyncio.get_running_loop(), event=asyncio.Event())
+        with self._condition:
+            self._enqueue(waiter)
+            wait = self._dispatch()
+        try:
+            while not waiter.granted:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(waiter.event.wait(), timeout=None if math.isinf(wait) else wait)
+                waiter.event.clear()
+                with self._condition:
+                    wait = self._dispatch()
+        finally:
+            with self._condition:
+                if not waiter.granted:
+                    self._remove(waiter)
+        return time.monotonic() - started
@@ -45,6 +45,21 @@ class SearchConfig(pydantic.BaseModel):
         """
         return cls._load_default_config().copy(update=overrides)  # pylint: disable=protected-access
 
+    @classmethod
+    def load_platform_config(cls, platform: platform_and_region.Platform, **overrides) -> SearchConfig:
+        """Load default config routed to `platform` and the region serving its matches.
+
+        Args:
+            platform: Platform to search.
+            **overrides: Overrides for default config.
+
+        Returns:
+            SearchConfig: Default search config for `platform` with overrides.
+        """
+        return cls.load_default_config(
+            **{"platform": platform, "region": platform_and_region.region_of(platform), **overrides}
+        )
+
     def as_dict(self) -> dict:
         return {
             "game_type": self.game_type,
@@ -0,0 +1,113 @@
+"""Rate limit backends sharing one key's buckets between processes and hosts.
+
+Every `RateLimiter` built on the same backend location takes its slots from the same buckets, so N crawler
+processes on one API key together stay within its per-second and per-two-minute limits:
+
+    backend = shared_rate_limit.SQLiteRateLimitBackend("rate_limits.db")  # processes of one host
+    backend = shared_rate_limit.RedisRateLimitBackend("redis://rate-limits:6379/0")  # processes on several hosts
+    riot_api_client = client.RiotApiClient(rate_limiter=rate_limit.RateLimiter(backend=backend))
+
+Windows are kept on the wall clock, so hosts sharing a Redis backend need synchronized clocks (NTP).
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, Sequence, TypeVar
+
+import redis
+
+from riot.utils import rate_limit
+
+_T = TypeVar("_T")
+
+_DEFAULT_KEY_PREFIX = "riot:rate-limit:"
+# Learned limits of idle buckets are forgotten after this long; the defaults apply again until the next response.
+_DEFAULT_TTL = 3600
+
+
+class SQLiteRateLimitBackend(rate_limit.SharedRateLimitBackend):
+    """Buckets in an SQLite database. Transactions take SQLite's write lock, which serializes processes of one host."""
+
+    def __init__(self, path: str | os.PathLike, timeout: float = 30.0):
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, state TEXT)")
+
+    def _transact_states(
+        self,
+        names: Sequence[str],
+        apply: Callable[[dict[str, str | None]], tuple[_T, dict[str, str]]],
+        read_only: bool,
+    ) -> _T:
+        placeholders = ",".join("?" * len(names))
+        query = f"SELECT name, state FROM buckets WHERE name IN ({placeholders})"
+        with self._lock:
+            if read_only:
+                # A single SELECT in autocommit mode reads one consistent snapshot.
+                rows = self._connection.execute(query, list(names)).fetchall()
+                return apply({name: None for name in names} | dict(rows))[0]
+
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(query, list(names)).fetchall()
+                result, states = apply({name: None for name in names} | dict(rows))
+                self._connection.executemany("INSERT OR REPLACE INTO buckets VALUES (?, ?)", states.items())
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisRateLimitBackend(rate_limit.SharedRateLimitBackend):
+    """Buckets in Redis, updated in optimistic `WATCH` / `MULTI` transactions retried on conflicts.
+
+    Args:
+        client: Redis client or URL.
+        key_prefix: Prefix of the bucket keys, e.g. to keep the buckets of several API keys apart.
+        ttl: Seconds an untouched bucket is kept.
+    """
+
+    def __init__(self, client: redis.Redis | str, key_prefix: str = _DEFAULT_KEY_PREFIX, ttl: int = _DEFAULT_TTL):
+        self._redis = redis.Redis.from_url(client) if isinstance(client, str) else client
+        self._key_prefix = key_prefix
+        self._ttl = ttl
+
+    def _transact_states(
+        self,
+        names: Sequence[str],
+        apply: Callable[[dict[str, str | None]], tuple[_T, dict[str, str]]],
+        read_only: bool,
+    ) -> _T:
+        keys = [self._key_prefix + name for name in names]
+        if read_only:
+            # MGET is atomic, no WATCH needed when nothing is written back.
+            return apply(self._decode(names, self._redis.mget(keys)))[0]
+
+        with self._redis.pipeline() as pipeline:
+            while True:
+                try:
+                    pipeline.watch(*keys)
+                    values = pipeline.mget(keys)
+                    result, states = apply(self._decode(names, values))
+                    pipeline.multi()
+                    for name, state in states.items():
+                        pipeline.set(self._key_prefix + name, state, ex=self._ttl)
+                    pipeline.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+
+    @staticmethod
+    def _decode(names: Sequence[str], values: list[bytes | None]) -> dict[str, str | None]:
+        return {name: value.decode() if value is not None else None for name, value in zip(names, values)}
+
+    def close(self) -> None:
+        self._redis.close()
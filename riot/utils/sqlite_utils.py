@@ -0,0 +1,20 @@
+"""Helpers shared by the SQLite backed stores."""
+
+import sqlite3
+from typing import Sequence
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds is 999.
+_MAX_QUERY_PARAMS = 500
+
+
+def select_in(connection: sqlite3.Connection, query: str, values: Sequence[str]) -> set[str]:
+    """First column of the rows `query` selects for `values`.
+
+    `query` holds one `IN ({placeholders})` clause, filled in for chunks of `values` small enough for any SQLite build.
+    """
+    found = set()
+    for i in range(0, len(values), _MAX_QUERY_PARAMS):
+        chunk = values[i : i + _MAX_QUERY_PARAMS]
+        rows = connection.execute(query.format(placeholders=",".join("?" * len(chunk))), chunk).fetchall()
+        found.update(row[0] for row in rows)
+    return found
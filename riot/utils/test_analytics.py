@@ -0,0 +1,91 @@
+import collections
+from typing import Callable
+
+import pytest
+
+from riot.utils import analytics
+from riot.utils import compact
+from riot.utils import dto
+
+
+def _make_matches(make_match_payload: Callable[..., dict], num_matches: int) -> list[dto.MatchDto]:
+    matches = []
+    for i in range(num_matches):
+        match = dto.MatchDto.from_dict(make_match_payload(f"KR_{i}"))
+        for participant in match.info.participants:
+            if (participant.placement + i) % 3 == 0:
+                participant.units[1].tier = 2
+                participant.units.append(participant.units[0])
+            if (participant.placement + i) % 4 == 0:
+                participant.augments = ["TFT9_Augment_Pandoras"]
+                participant.traits[0].tier_current = 0
+        match.info.tft_set_number = 11 if i % 5 == 0 else 12
+        matches.append(match)
+    return matches
+
+
+def _keys(participant: dto.ParticipantDto, kind: str) -> set[str]:
+    return {
+        "traits": {f"{trait.name}:{trait.tier_current}" for trait in participant.traits if trait.tier_current > 0},
+        "units": {f"{unit.character_id}:{unit.tier}" for unit in participant.units},
+        "items": {item_name for unit in participant.units for item_name in unit.item_names},
+        "augments": set(participant.augments),
+    }[kind]
+
+
+def _naive_stats(matches: list[dto.MatchDto], kind: str) -> dict[str, tuple[int, float, float]]:
+    placements = collections.defaultdict(list)
+    for match in matches:
+        for participant in match.info.participants:
+            for key in _keys(participant, kind):
+                placements[key].append(participant.placement)
+    return {
+        key: (len(values), sum(values) / len(values), sum(v <= 4 for v in values) / len(values))
+        for key, values in placements.items()
+    }
+
+
+@pytest.mark.parametrize("kind", analytics.KINDS)
+def test_matches_naive_aggregation(make_match_payload: Callable[..., dict], kind: str):
+    matches = _make_matches(make_match_payload, 20)
+    stats = analytics.composition_stats(matches)
+
+    assert stats.num_participants == 160
+    assert {row.key: (row.picks, row.avg_placement, row.top4_rate) for row in stats.table(kind)} == pytest.approx(
+        _naive_stats(matches, kind)
+    )
+
+
+def test_filters_and_merges_partial_aggregates(make_match_payload: Callable[..., dict]):
+    matches = _make_matches(make_match_payload, 20)
+    set_12 = [match for match in matches if match.info.tft_set_number == 12]
+
+    merged = analytics.composition_stats(matches[:7], tft_set_number=12).merge(
+        analytics.composition_stats(matches[7:], tft_set_number=12)
+    )
+    full = analytics.composition_stats(set_12)
+
+    assert merged.num_matches == len(set_12) == 16
+    for kind in analytics.KINDS:
+        assert merged.table(kind) == full.table(kind)
+    assert analytics.composition_stats(matches, game_version="14.21").num_matches == 20
+    assert analytics.composition_stats(matches, game_version="14.22").table("units") == []
+
+
+def test_units_are_grouped_by_star_level(make_match_payload: Callable[..., dict]):
+    stats = analytics.composition_stats(_make_matches(make_match_payload, 1))
+    rows = {row.key: row for row in stats.table("units")}
+
+    assert set(rows) == {"TFT12_Ahri:2", "TFT12_Lux:2", "TFT12_Lux:3"}
+    assert rows["TFT12_Ahri:2"].pick_rate == 1.0
+
+
+@pytest.mark.parametrize("filters", [{}, {"tft_set_number": 12}, {"game_version": "14.21"}, {"game_version": "14.22"}])
+def test_store_columns_aggregate_like_dtos(make_match_payload: Callable[..., dict], filters: dict):
+    matches = _make_matches(make_match_payload, 20)
+    from_dtos = analytics.composition_stats(matches, **filters)
+    from_store = analytics.composition_stats_from_store(compact.CompactMatchStore(matches), **filters)
+
+    assert (from_store.num_matches, from_store.num_participants) == (from_dtos.num_matches, from_dtos.num_participants)
+    for kind in analytics.KINDS:
+        assert sorted(from_store.table(kind)) == sorted(from_dtos.table(kind))
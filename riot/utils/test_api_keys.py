@@ -0,0 +1,79 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from riot.utils import api_keys
+from riot.utils import rate_limit
+
+_KEY = rate_limit.RateLimitKey("asia", "match")
+
+
+@pytest.fixture(name="clock")
+def setup_clock(mocker: MockerFixture) -> list[float]:
+    now = [1000.0]
+    mocker.patch.object(rate_limit.time, "monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_keys_get_separate_buckets(clock: list[float]):  # pylint: disable=unused-argument
+    limiter = rate_limit.RateLimiter(default_app_limits="2:1")
+    first, second = (_KEY._replace(api_key_id=api_keys.fingerprint(k)) for k in ["RGAPI-1", "RGAPI-2"])
+
+    assert limiter.reserve(first) == 0
+    assert limiter.reserve(first) == 0
+    assert limiter.reserve(first) == pytest.approx(1.0)
+    assert limiter.reserve(second) == 0
+    assert limiter.remaining(first) == pytest.approx(-1.0)
+    assert limiter.remaining(second) == 1
+
+
+def test_choose_picks_the_key_with_the_most_budget_left(clock: list[float]):  # pylint: disable=unused-argument
+    limiter = rate_limit.RateLimiter(default_app_limits="10:1")
+    pool = api_keys.ApiKeyPool(["RGAPI-1", "RGAPI-2", "RGAPI-3"])
+
+    chosen = []
+    for _ in range(30):
+        key = pool.choose(limiter, _KEY)
+        assert key[:2] == _KEY[:2]
+        assert limiter.reserve(key) == 0
+        chosen.append(pool.api_key(key))
+
+    # Three keys of 10 requests per second each send 30 requests without waiting.
+    assert sorted(chosen[:3]) == ["RGAPI-1", "RGAPI-2", "RGAPI-3"]
+    assert {api_key: chosen.count(api_key) for api_key in chosen} == {"RGAPI-1": 10, "RGAPI-2": 10, "RGAPI-3": 10}
+
+
+def test_choose_reads_every_key_in_one_transaction(mocker: MockerFixture):
+    limiter = rate_limit.RateLimiter()
+    pool = api_keys.ApiKeyPool(["RGAPI-1", "RGAPI-2", "RGAPI-3"])
+    limiter.reserve(pool.choose(limiter, _KEY))
+    transact = mocker.spy(limiter._backend, "transact")  # pylint: disable=protected-access
+
+    key = pool.choose(limiter, _KEY)
+
+    assert transact.call_count == 1
+    assert len(transact.call_args.args[0]) == 6
+    assert pool.api_key(key) != "RGAPI-1"
+
+
+def test_choose_skips_excluded_and_disabled_keys(clock: list[float]):  # pylint: disable=unused-argument
+    limiter = rate_limit.RateLimiter()
+    pool = api_keys.ApiKeyPool(["RGAPI-1", "RGAPI-2"])
+    first = pool.choose(limiter, _KEY)
+    second = pool.choose(limiter, _KEY, exclude=[first])
+
+    assert pool.api_key(first) != pool.api_key(second)
+    assert pool.choose(limiter, _KEY, exclude=[first, second]) is None
+
+    pool.disable(first, 403)
+    assert len(pool) == 1
+    assert pool.choose(limiter, _KEY) == second
+    # The last key stays in rotation.
+    pool.disable(second, 403)
+    assert pool.active == [second.api_key_id]
+
+
+def test_fingerprint_does_not_contain_the_key():
+    assert "RGAPI-secret" not in api_keys.fingerprint("RGAPI-secret")
+    assert api_keys.fingerprint("RGAPI-secret") == api_keys.fingerprint("RGAPI-secret")
+    with pytest.raises(ValueError):
+        api_keys.ApiKeyPool([])
@@ -0,0 +1,42 @@
+import gzip
+import pathlib
+from typing import Callable
+
+import orjson
+
+from riot.utils import archive
+from riot.utils import dto
+
+
+def test_archived_matches_are_read_back(tmp_path: pathlib.Path, make_match_payload: Callable[..., dict]):
+    payloads = {f"KR_{i}": make_match_payload(f"KR_{i}") for i in range(5)}
+    with archive.MatchArchiveWriter(tmp_path, max_segment_bytes=1024) as writer:
+        for match_id, payload in payloads.items():
+            assert writer.append(match_id, payload)
+        assert not writer.append("KR_0", payloads["KR_0"])
+
+    with archive.MatchArchiveReader(tmp_path) as reader:
+        assert len(reader) == 5
+        assert reader.get("KR_3") == payloads["KR_3"]
+        assert reader.get_match("KR_3") == dto.MatchDto.from_dict(payloads["KR_3"])
+        assert reader.get("KR_9") is None
+        assert [match.metadata.match_id for match in reader.scan()] == list(payloads)
+        assert [match.metadata.match_id for match in reader.scan(lazy=True)] == list(payloads)
+        assert reader.get_match("KR_3", lazy=True) == reader.get_match("KR_3")
+        projection = dto.MatchProjection(["placement"])
+        assert [p.placement for p in reader.get_match("KR_3", projection=projection).info.participants] == list(
+            range(1, 9)
+        )
+
+    assert len(list(tmp_path.glob("segment-*.ndjson.gz"))) > 1
+
+
+def test_segments_are_gzipped_ndjson(tmp_path: pathlib.Path, make_match_payload: Callable[..., dict]):
+    with archive.MatchArchiveWriter(tmp_path) as writer:
+        writer.append("KR_1", make_match_payload("KR_1"))
+    with archive.MatchArchiveWriter(tmp_path) as writer:
+        assert "KR_1" in writer
+        writer.append("KR_2", orjson.dumps(make_match_payload("KR_2")))
+
+    lines = gzip.decompress((tmp_path / "segment-00000.ndjson.gz").read_bytes()).splitlines()
+    assert [orjson.loads(line)["metadata"]["match_id"] for line in lines] == ["KR_1", "KR_2"]
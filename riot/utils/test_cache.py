@@ -0,0 +1,46 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from riot.utils import cache
+from riot.utils import types
+
+
+@pytest.fixture(name="clock")
+def setup_clock(mocker: MockerFixture) -> list[float]:
+    now = [1000.0]
+    mocker.patch.object(cache.time, "monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_query_type_ttl(clock: list[float]):
+    response_cache = cache.ResponseCache(ttls={types.QueryType.LEAGUE: 60.0})
+    key = cache.make_key("https://kr.api.riotgames.com/tft/league/v1/challenger", {"queue": "RANKED_TFT"})
+
+    response_cache.put(key, {"entries": []}, types.QueryType.LEAGUE)
+    assert response_cache.get(key) == {"entries": []}
+
+    clock[0] += 60.0
+    assert response_cache.get(key) is None
+    assert (response_cache.stats.hits, response_cache.stats.misses) == (1, 1)
+
+
+def test_query_types_without_ttl_are_not_cached(clock: list[float]):  # pylint: disable=unused-argument
+    response_cache = cache.ResponseCache()
+    key = cache.make_key("https://asia.api.riotgames.com/tft/match/v1/matches/KR_1")
+
+    response_cache.put(key, {}, types.QueryType.MATCH)
+
+    assert len(response_cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock: list[float]):  # pylint: disable=unused-argument
+    response_cache = cache.ResponseCache(max_size=2)
+    for url in ["a", "b"]:
+        response_cache.put(cache.make_key(url), url, types.QueryType.LEAGUE)
+
+    response_cache.get(cache.make_key("a"))
+    response_cache.put(cache.make_key("c"), "c", types.QueryType.LEAGUE)
+
+    assert response_cache.get(cache.make_key("b")) is None
+    assert response_cache.get(cache.make_key("a")) == "a"
+    assert response_cache.stats.evictions == 1
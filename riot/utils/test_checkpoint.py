@@ -0,0 +1,58 @@
+import pathlib
+import sqlite3
+
+import pytest
+
+from riot.utils import checkpoint
+
+
+@pytest.fixture(name="store")
+def setup_store(tmp_path: pathlib.Path) -> checkpoint.CheckpointStore:
+    return checkpoint.CheckpointStore(tmp_path / "checkpoint.sqlite")
+
+
+def test_watermark_moves_search_window_forward(store: checkpoint.CheckpointStore):
+    assert store.start_time("puuid", default=100) == 100
+
+    store.record_match_ids("puuid", ["KR_1"], end_time=200)
+    store.record_match_ids("puuid", [], end_time=150)
+
+    assert store.watermark("puuid") == 200
+    assert store.start_time("puuid", default=100) == 200
+    assert store.start_time("puuid", default=300) == 300
+
+
+def test_pending_and_completed_survive_reopen(tmp_path: pathlib.Path, store: checkpoint.CheckpointStore):
+    store.record_match_ids("puuid", ["KR_1", "KR_2", "KR_3"], end_time=200)
+    store.mark_completed("KR_2")
+    store.close()
+
+    reopened = checkpoint.CheckpointStore(tmp_path / "checkpoint.sqlite")
+
+    assert reopened.pending() == ["KR_1", "KR_3"]
+    assert reopened.completed(["KR_1", "KR_2"]) == {"KR_2"}
+
+
+def test_failed_matches_are_neither_pending_nor_refetched(store: checkpoint.CheckpointStore):
+    store.record_match_ids("puuid", ["KR_1", "KR_2"], end_time=200)
+    store.mark_failed("KR_1")
+    store.record_match_ids("other-puuid", ["KR_1"], end_time=200)
+
+    assert store.pending() == ["KR_2"]
+    assert store.failed() == ["KR_1"]
+    assert store.completed(["KR_1", "KR_2"]) == {"KR_1"}
+
+
+def test_checkpoints_with_a_completed_flag_are_migrated(tmp_path: pathlib.Path):
+    connection = sqlite3.connect(tmp_path / "checkpoint.sqlite")
+    with connection:
+        connection.execute("CREATE TABLE match_ids (match_id TEXT PRIMARY KEY, completed INTEGER NOT NULL DEFAULT 0)")
+        connection.executemany("INSERT INTO match_ids VALUES (?, ?)", [("KR_1", 0), ("KR_2", 1)])
+    connection.close()
+
+    store = checkpoint.CheckpointStore(tmp_path / "checkpoint.sqlite")
+    store.mark_failed("KR_3")
+
+    assert store.pending() == ["KR_1"]
+    assert store.failed() == ["KR_3"]
+    assert store.completed(["KR_1", "KR_2"]) == {"KR_2"}
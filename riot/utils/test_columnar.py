@@ -0,0 +1,34 @@
+import pathlib
+from typing import Callable
+
+from pyarrow import parquet as pq
+
+from riot.utils import columnar
+from riot.utils import dto
+
+
+def test_matches_are_flattened_into_normalized_tables(match_payload: dict):
+    tables = columnar.to_tables([dto.MatchDto.from_dict(match_payload)])
+
+    assert {name: table.num_rows for name, table in tables.items()} == {
+        "matches": 1,
+        "participants": 8,
+        "units": 16,
+        "traits": 16,
+        "augments": 16,
+    }
+    assert tables["units"].column("character_id").type == columnar.SCHEMAS["units"].field("character_id").type
+    assert tables["units"].column("item_names")[0].as_py() == ["TFT_Item_JeweledGauntlet", "TFT_Item_BlueBuff"]
+
+
+def test_parquet_writer_streams_row_groups(tmp_path: pathlib.Path, make_match_payload: Callable[..., dict]):
+    matches = [dto.MatchDto.from_dict(make_match_payload(f"KR_{i}")) for i in range(5)]
+
+    with columnar.ParquetMatchWriter(tmp_path, matches_per_row_group=2) as writer:
+        writer.write_many(matches)
+
+    participants = pq.ParquetFile(tmp_path / "participants.parquet")
+    assert participants.metadata.num_row_groups == 3
+    assert participants.metadata.num_rows == 40
+    traits = pq.read_table(tmp_path / "traits.parquet")
+    assert set(traits.column("match_id").to_pylist()) == {f"KR_{i}" for i in range(5)}
@@ -0,0 +1,28 @@
+from typing import Callable
+
+from riot.utils import compact
+from riot.utils import dto
+
+
+def test_matches_round_trip(match_payload: dict):
+    match = dto.MatchDto.from_dict(match_payload)
+    match.info.participants[0].units[0].chosen = "TFT12_Faerie"
+    store = compact.CompactMatchStore([match])
+
+    assert len(store) == 1
+    assert match.metadata.match_id in store
+    assert store.get(match.metadata.match_id) == match
+    assert store[0] == match
+    assert store.get("KR_0") is None
+
+
+def test_strings_are_interned_once(make_match_payload: Callable[..., dict]):
+    matches = [dto.MatchDto.from_dict(make_match_payload(f"KR_{i}")) for i in range(10)]
+    store = compact.CompactMatchStore(matches)
+    store.add(matches[0])
+
+    assert len(store) == 10
+    assert store.match_ids == [f"KR_{i}" for i in range(10)]
+    assert list(store) == matches
+    # Only the puuids of the new participants are added, unit / trait / item / augment names are shared.
+    assert len(store.strings) == len(compact.CompactMatchStore(matches[:1]).strings) + 9 * 8
@@ -0,0 +1,83 @@
+import orjson
+import pydantic
+import pytest
+
+from riot.utils import columnar
+from riot.utils import dto
+
+
+def test_lazy_match_reads_like_the_match_dto(match_payload: dict):
+    lazy, match = dto.LazyMatchDto.from_dict(match_payload), dto.MatchDto.from_dict(match_payload)
+
+    assert lazy.info.game_version == match.info.game_version
+    assert lazy.metadata == match.metadata
+    assert [p.placement for p in lazy.info.participants] == [p.placement for p in match.info.participants]
+    assert lazy.info.participants[0].traits == match.info.participants[0].traits
+    assert lazy.info.participants[0].units[1].items == []
+    assert lazy.model_dump() == match.model_dump()
+    assert lazy == match
+    assert {name: table.num_rows for name, table in columnar.to_tables([lazy]).items()} == {
+        name: table.num_rows for name, table in columnar.to_tables([match]).items()
+    }
+
+
+def test_lazy_match_reads_dumped_matches_by_field_name(match_payload: dict):
+    match = dto.MatchDto.from_dict(match_payload)
+    lazy = dto.LazyMatchDto.from_dict(match.model_dump())
+
+    assert lazy.metadata.participants_puuids == match.metadata.participants_puuids
+    assert lazy.info.participants[0].riot_id_game_name == match.info.participants[0].riot_id_game_name == "player1"
+    assert lazy.info.participants[0].units[0].item_names == match.info.participants[0].units[0].item_names
+    assert lazy == match
+
+
+def test_lazy_match_only_validates_accessed_fields(match_payload: dict):
+    lazy = dto.LazyMatchDto.from_dict(match_payload)
+    placements = [participant.placement for participant in lazy.info.participants]
+
+    assert placements == list(range(1, 9))
+    participant = lazy.info.participants[0]
+    assert "placement" in vars(participant)
+    assert "traits" not in vars(participant) and "units" not in vars(participant)
+    assert "_materialized" not in vars(lazy)
+
+
+def test_lazy_match_raises_on_access_of_invalid_fields(match_payload: dict):
+    del match_payload["info"]["participants"][0]["gold_left"]
+    match_payload["info"]["participants"][1]["level"] = "8"
+    lazy = dto.LazyMatchDto.from_dict(match_payload, strict=True)
+
+    assert lazy.info.participants[0].placement == 1
+    with pytest.raises(pydantic.ValidationError):
+        _ = lazy.info.participants[0].gold_left
+    with pytest.raises(pydantic.ValidationError):
+        _ = lazy.info.participants[1].level
+
+
+def test_projection_keeps_only_the_selected_fields(match_payload: dict):
+    projection = dto.MatchProjection(["placement", "traits.name", "traits.tier_current", "augments", "game_version"])
+    record = projection.from_dict(match_payload)
+    match = dto.MatchDto.from_dict(match_payload)
+
+    assert record.metadata == match.metadata
+    assert record.info.game_version == match.info.game_version
+    participant = record.info.participants[0]
+    assert participant.model_dump() == {
+        "augments": match.info.participants[0].augments,
+        "placement": 1,
+        "traits": [{"name": t.name, "tier_current": t.tier_current} for t in match.info.participants[0].traits],
+    }
+    assert not hasattr(participant, "units")
+    assert projection.from_json(orjson.dumps(match_payload)) == record
+
+
+def test_projection_paths_are_resolved_from_the_match_down():
+    projection = dto.MatchProjection(["info.participants.traits", "traits.name", "queue_id"])
+
+    assert "info.participants.traits" in repr(projection)
+    assert projection.fields == [("info", "participants", "traits"), ("info", "queue_id"), ("metadata",)]
+    for path in ["nope", "placement.nope", "traits.nope"]:
+        with pytest.raises(ValueError):
+            dto.MatchProjection([path])
+    with pytest.raises(ValueError):
+        dto.match_parser(lazy=True, projection=projection)
@@ -0,0 +1,25 @@
+from riot.utils import dto
+from riot.utils import frontier
+
+
+def test_overlapping_match_id_lists_are_merged_in_order():
+    match_frontier = frontier.MatchFrontier()
+
+    added = match_frontier.extend([["KR_3", "KR_2"], ["KR_2", "KR_1"], ["KR_3"]], puuids=["a", "b", "c"])
+
+    assert added == 3
+    assert match_frontier.pending() == ["KR_3", "KR_2", "KR_1"]
+
+
+def test_fetched_matches_are_not_pending_and_cover_participants(match_payload: dict):
+    match = dto.MatchDto.from_dict(match_payload)
+    seed = match.metadata.participants_puuids[0]
+    match_frontier = frontier.MatchFrontier()
+    match_frontier.extend([[match.metadata.match_id, "KR_1"]], puuids=[seed])
+
+    match_frontier.mark_fetched(match)
+
+    assert match_frontier.pending() == ["KR_1"]
+    assert match_frontier.is_covered(seed)
+    assert seed not in match_frontier.discovered_puuids()
+    assert len(match_frontier.discovered_puuids()) == 7
@@ -0,0 +1,29 @@
+import pathlib
+
+import pytest
+
+from riot.utils import match_store
+
+
+@pytest.fixture(name="store")
+def setup_store(tmp_path: pathlib.Path) -> match_store.MatchStore:
+    return match_store.MatchStore(tmp_path / "matches.sqlite")
+
+
+def test_put_and_get_roundtrip(store: match_store.MatchStore, match_payload: dict):
+    assert store.get("KR_7348987032") is None
+
+    store.put("KR_7348987032", match_payload)
+
+    assert store.get("KR_7348987032") == match_payload
+    assert "KR_7348987032" in store
+    assert len(store) == 1
+
+
+def test_bulk_membership(store: match_store.MatchStore, match_payload: dict):
+    for match_id in ["KR_1", "KR_3"]:
+        store.put(match_id, match_payload)
+    match_ids = [f"KR_{i}" for i in range(1200)]
+
+    assert store.contains(match_ids) == {"KR_1", "KR_3"}
+    assert store.missing(["KR_3", "KR_2", "KR_1", "KR_0"]) == ["KR_2", "KR_0"]
@@ -0,0 +1,40 @@
+from riot.utils import metrics
+
+
+def test_events_are_exported_in_prometheus_text_format():
+    riot_metrics = metrics.Metrics(buckets=(0.1, 1.0))
+    for attempt, status_code in enumerate([429, 200]):
+        riot_metrics.on_request(
+            metrics.RequestEvent(
+                query_type="match",
+                endpoint="match",
+                host="asia",
+                attempt=attempt,
+                limiter_wait=0.5,
+                latency=0.05,
+                status_code=status_code,
+                response_bytes=100,
+            )
+        )
+    riot_metrics.on_request(
+        metrics.RequestEvent(
+            query_type="league", endpoint="apex-league", host="kr", attempt=0, limiter_wait=0, latency=2
+        )
+    )
+
+    assert riot_metrics.counter("riot_responses_total") == 3
+    assert riot_metrics.counter("riot_responses_total", status="429") == 1
+    assert riot_metrics.counter("riot_responses_total", host="kr", status="error") == 1
+    assert riot_metrics.counter("riot_retries_total", endpoint="match") == 1
+
+    text = riot_metrics.to_prometheus()
+    assert "# TYPE riot_request_duration_seconds histogram" in text
+    assert 'riot_request_duration_seconds_bucket{query_type="match",endpoint="match",host="asia",le="0.1"} 2' in text
+    assert (
+        'riot_request_duration_seconds_bucket{query_type="league",endpoint="apex-league",host="kr",le="1.0"} 0' in text
+    )
+    assert (
+        'riot_request_duration_seconds_bucket{query_type="league",endpoint="apex-league",host="kr",le="+Inf"} 1' in text
+    )
+    assert 'riot_rate_limit_wait_seconds_sum{query_type="match",endpoint="match",host="asia"} 1.0' in text
+    assert 'riot_response_bytes_total{query_type="match",endpoint="match",host="asia"} 200' in text
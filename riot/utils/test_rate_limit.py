@@ -0,0 +1,79 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from riot.utils import rate_limit
+
+
+@pytest.fixture(name="clock")
+def setup_clock(mocker: MockerFixture) -> list[float]:
+    now = [1000.0]
+    mocker.patch.object(rate_limit.time, "monotonic", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("20:1,100:120", {1.0: 20, 120.0: 100}),
+        ("2000:60", {60.0: 2000}),
+        ("", {}),
+        (None, {}),
+    ],
+)
+def test_parse_rate_limit_header(header: str | None, expected: dict[float, int]):
+    assert rate_limit.parse_rate_limit_header(header) == expected
+
+
+def test_buckets_are_separate_per_routing_value(clock: list[float]):  # pylint: disable=unused-argument
+    limiter = rate_limit.RateLimiter(default_app_limits="2:1")
+    kr_league = rate_limit.RateLimitKey("kr", "league-entries")
+    asia_match = rate_limit.RateLimitKey("asia", "match")
+
+    assert limiter.reserve(kr_league) == 0
+    assert limiter.reserve(kr_league) == 0
+    assert limiter.reserve(kr_league) == pytest.approx(1.0)
+    assert limiter.reserve(asia_match) == 0
+
+
+def test_limits_and_counts_are_learned_from_headers(clock: list[float]):
+    limiter = rate_limit.RateLimiter(default_app_limits="20:1,100:120")
+    key = rate_limit.RateLimitKey("asia", "match")
+
+    limiter.update_from_headers(
+        key,
+        {
+            "X-App-Rate-Limit": "500:10,30000:600",
+            "X-App-Rate-Limit-Count": "1:10,1:600",
+            "X-Method-Rate-Limit": "2:10",
+            "X-Method-Rate-Limit-Count": "2:10",
+        },
+    )
+
+    assert limiter.limits(key) == ({10.0: 500, 600.0: 30000}, {10.0: 2})
+    assert limiter.reserve(key) == pytest.approx(10.0)
+    assert limiter.reserve(rate_limit.RateLimitKey("asia", "match-ids-by-puuid")) == 0
+
+    clock[0] += 10.0
+    assert limiter.reserve(key) == 0
+
+
+def test_headroom_is_left_free_until_the_end_of_the_window(clock: list[float]):
+    limiter = rate_limit.RateLimiter(default_app_limits="10:1")
+    key = rate_limit.RateLimitKey("asia", "match")
+
+    assert [limiter.reserve(key, headroom=0.2) for _ in range(8)] == [0.0] * 8
+    assert limiter.reserve(key, headroom=0.2) == pytest.approx(0.8)
+    assert limiter.reserve(key) == 0.0
+
+    clock[0] += 0.8
+    assert limiter.reserve(key, headroom=0.2) == 0.0
+    assert limiter.reserve(key, headroom=0.2) == pytest.approx(0.2)
+
+
+@pytest.mark.parametrize("base", [rate_limit.RateLimitBackend, rate_limit.SharedRateLimitBackend])
+def test_backends_must_implement_their_transactions(base: type[rate_limit.RateLimitBackend]):
+    class Incomplete(base):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
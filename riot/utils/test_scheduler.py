@@ -0,0 +1,117 @@
+# pylint: disable=protected-access
+import asyncio
+import threading
+import time
+
+from riot.utils import rate_limit
+from riot.utils import scheduler
+
+_MATCH = rate_limit.RateLimitKey("asia", "match")
+_MATCH_IDS = rate_limit.RateLimitKey("asia", "match_ids_by_puuid")
+
+
+class _Slots:
+    """Stand-in limiter handing out a fixed number of slots per key."""
+
+    def __init__(self):
+        self.free: dict[rate_limit.RateLimitKey, int] = {}
+
+    def reserve(self, key: rate_limit.RateLimitKey, headroom: float = 0.0) -> float:  # pylint: disable=unused-argument
+        if self.free.get(key, 0) <= 0:
+            return 1.0
+        self.free[key] -= 1
+        return 0.0
+
+
+def _dispatch(request_scheduler: scheduler.RequestScheduler) -> float:
+    with request_scheduler._condition:
+        return request_scheduler._dispatch()
+
+
+def _queue(request_scheduler: scheduler.RequestScheduler, *waiters: tuple) -> list[scheduler._Waiter]:
+    queued = []
+    for key, priority, flow in waiters:
+        waiter = scheduler._Waiter(key, scheduler.RequestClass(priority, flow))
+        request_scheduler._enqueue(waiter)
+        queued.append(waiter)
+    return queued
+
+
+def test_higher_priority_waiters_get_free_slots_first():
+    slots = _Slots()
+    request_scheduler = scheduler.RequestScheduler(slots)
+    backfill = _queue(request_scheduler, *[(_MATCH, scheduler.Priority.BACKFILL, "backfill")] * 3)
+    interactive = _queue(request_scheduler, (_MATCH, scheduler.Priority.INTERACTIVE, None))
+
+    slots.free[_MATCH] = 2
+    assert _dispatch(request_scheduler) == 1.0
+
+    assert interactive[0].granted
+    assert [waiter.granted for waiter in backfill] == [True, False, False]
+    assert len(request_scheduler) == 2
+
+
+def test_flows_of_one_priority_are_served_round_robin():
+    slots = _Slots()
+    request_scheduler = scheduler.RequestScheduler(slots)
+    first = _queue(request_scheduler, *[(_MATCH, scheduler.Priority.BACKFILL, "first")] * 4)
+    second = _queue(request_scheduler, *[(_MATCH, scheduler.Priority.BACKFILL, "second")] * 2)
+
+    slots.free[_MATCH] = 4
+    _dispatch(request_scheduler)
+
+    assert [waiter.granted for waiter in first] == [True, True, False, False]
+    assert [waiter.granted for waiter in second] == [True, True]
+
+
+def test_waiters_blocked_by_their_method_limit_do_not_hold_back_other_endpoints():
+    slots = _Slots()
+    request_scheduler = scheduler.RequestScheduler(slots)
+    blocked = _queue(request_scheduler, (_MATCH, scheduler.Priority.INTERACTIVE, None))
+    other = _queue(request_scheduler, (_MATCH_IDS, scheduler.Priority.BACKFILL, None))
+
+    slots.free[_MATCH_IDS] = 1
+    _dispatch(request_scheduler)
+
+    assert not blocked[0].granted and other[0].granted
+
+
+def test_interactive_requests_skip_queued_backfill():
+    request_scheduler = scheduler.RequestScheduler(rate_limit.RateLimiter(default_app_limits="1:0.02"))
+    granted = []
+
+    async def request(name: str, priority: scheduler.Priority) -> None:
+        with scheduler.priority(priority):
+            await request_scheduler.acquire_async(_MATCH)
+        granted.append(name)
+
+    async def run() -> None:
+        backfill = [asyncio.create_task(request(f"backfill-{i}", scheduler.Priority.BACKFILL)) for i in range(6)]
+        await asyncio.sleep(0.03)
+        await asyncio.gather(request("interactive", scheduler.Priority.INTERACTIVE), *backfill)
+
+    asyncio.run(run())
+
+    assert granted.index("interactive") <= 3
+    assert len(request_scheduler) == 0
+
+
+def test_threads_share_the_budget_by_priority():
+    request_scheduler = scheduler.RequestScheduler(rate_limit.RateLimiter(default_app_limits="1:0.02"))
+    granted = []
+
+    def request(name: str, priority: scheduler.Priority) -> None:
+        with scheduler.priority(priority):
+            request_scheduler.acquire(_MATCH)
+        granted.append(name)
+
+    backfill = [threading.Thread(target=request, args=(f"backfill-{i}", scheduler.Priority.BACKFILL)) for i in range(6)]
+    for thread in backfill:
+        thread.start()
+    time.sleep(0.03)
+    request("interactive", scheduler.Priority.INTERACTIVE)
+    for thread in backfill:
+        thread.join()
+
+    assert granted.index("interactive") <= 3
+    assert len(granted) == 7
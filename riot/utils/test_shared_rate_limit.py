@@ -0,0 +1,102 @@
+# pylint: disable=protected-access
+import multiprocessing
+import pathlib
+import threading
+import time
+
+from fakeredis import TcpFakeServer
+import pytest
+import redis
+
+from riot.utils import rate_limit
+from riot.utils import shared_rate_limit
+
+_KEY = rate_limit.RateLimitKey("asia", "match")
+_LIMIT, _PERIOD = 10, 0.2
+
+
+def _assert_within_limit(grants: list[float]) -> None:
+    """Every `_LIMIT` grants take at least one more window."""
+    grants = sorted(grants)
+    for window in range(1, len(grants) // _LIMIT):
+        assert grants[window * _LIMIT] - grants[0] >= window * _PERIOD - 0.01
+
+
+def _acquire_from_sqlite(path: str, slots: int, grants: multiprocessing.Queue) -> None:
+    limiter = rate_limit.RateLimiter(
+        default_app_limits=f"{_LIMIT}:{_PERIOD}", backend=shared_rate_limit.SQLiteRateLimitBackend(path)
+    )
+    for _ in range(slots):
+        limiter.acquire(_KEY)
+        grants.put(time.time())
+
+
+def test_sqlite_backend_shares_the_budget_between_processes(tmp_path: pathlib.Path):
+    context = multiprocessing.get_context("fork")
+    grants = context.Queue()
+    processes = [
+        context.Process(target=_acquire_from_sqlite, args=(str(tmp_path / "rate_limits.db"), 10, grants))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    _assert_within_limit([grants.get() for _ in range(30)])
+
+
+def test_sqlite_backend_keeps_learned_limits_and_penalties(tmp_path: pathlib.Path):
+    path = tmp_path / "rate_limits.db"
+    limiter = rate_limit.RateLimiter(backend=shared_rate_limit.SQLiteRateLimitBackend(path))
+    limiter.update_from_headers(_KEY, {rate_limit.APP_RATE_LIMIT_HEADER: "500:10"})
+    limiter.penalize(_KEY, 60.0, "method")
+
+    other = rate_limit.RateLimiter(backend=shared_rate_limit.SQLiteRateLimitBackend(path))
+
+    assert other.limits(_KEY) == ({10.0: 500}, {})
+    assert other.reserve(_KEY) == pytest.approx(60.0, abs=1.0)
+
+
+@pytest.fixture(name="redis_url")
+def setup_redis_url():
+    """A fake Redis server listening on a local port, standing in for a shared Redis."""
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+def test_redis_backend_shares_the_budget_between_limiters(redis_url: str):
+    grants = []
+
+    def crawl() -> None:
+        backend = shared_rate_limit.RedisRateLimitBackend(redis.Redis.from_url(redis_url))
+        limiter = rate_limit.RateLimiter(default_app_limits=f"{_LIMIT}:{_PERIOD}", backend=backend)
+        for _ in range(10):
+            limiter.acquire(_KEY)
+            grants.append(time.time())
+        backend.close()
+
+    crawlers = [threading.Thread(target=crawl) for _ in range(3)]
+    for crawler in crawlers:
+        crawler.start()
+    for crawler in crawlers:
+        crawler.join()
+
+    assert len(grants) == 30
+    _assert_within_limit(grants)
+
+
+def test_reads_do_not_write_buckets_back(tmp_path: pathlib.Path, redis_url: str):
+    sqlite_backend = shared_rate_limit.SQLiteRateLimitBackend(tmp_path / "rate_limits.db")
+    redis_client = redis.Redis.from_url(redis_url)
+    for backend in [sqlite_backend, shared_rate_limit.RedisRateLimitBackend(redis_client)]:
+        limiter = rate_limit.RateLimiter(backend=backend)
+        assert limiter.limits(_KEY) == ({1.0: 20, 120.0: 100}, {})
+        assert limiter.remaining(_KEY) == 20
+
+    assert sqlite_backend._connection.execute("SELECT COUNT(*) FROM buckets").fetchone() == (0,)
+    assert redis_client.dbsize() == 0
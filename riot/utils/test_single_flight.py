@@ -0,0 +1,61 @@
+import asyncio
+from concurrent import futures
+import threading
+import time
+
+import pytest
+
+from riot.utils import single_flight
+
+
+def test_concurrent_calls_of_one_key_share_a_single_call():
+    flight = single_flight.SingleFlight()
+    callers = threading.Barrier(4)
+    calls = []
+
+    def fetch() -> dict:
+        calls.append(1)
+        time.sleep(0.05)
+        return {"match_id": "KR_1"}
+
+    def call(_) -> tuple[dict, bool]:
+        callers.wait()
+        return flight.do("KR_1", fetch)
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(call, range(4)))
+
+    assert len(calls) == 1
+    assert all(payload == {"match_id": "KR_1"} for payload, _ in results)
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert len(flight) == 0
+
+
+def test_errors_reach_every_waiting_caller_and_are_not_remembered():
+    flight = single_flight.SingleFlight()
+
+    def fail():
+        raise ValueError("503")
+
+    with pytest.raises(ValueError):
+        flight.do("KR_1", fail)
+    assert flight.do("KR_1", lambda: 1) == (1, False)
+
+
+def test_async_calls_of_one_key_share_a_single_task():
+    flight = single_flight.AsyncSingleFlight()
+    calls = []
+
+    async def fetch() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"match_id": "KR_1"}
+
+    async def run() -> list:
+        return await asyncio.gather(*(flight.do("KR_1", fetch) for _ in range(3)), flight.do("KR_2", fetch))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert [shared for _, shared in results] == [False, True, True, False]
+    assert len(flight) == 0
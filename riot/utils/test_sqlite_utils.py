@@ -0,0 +1,15 @@
+import sqlite3
+
+from riot.utils import sqlite_utils
+
+
+def test_select_in_spans_several_queries():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE ids (id TEXT PRIMARY KEY)")
+    connection.executemany("INSERT INTO ids VALUES (?)", [(str(i),) for i in range(0, 1200, 2)])
+
+    found = sqlite_utils.select_in(
+        connection, "SELECT id FROM ids WHERE id IN ({placeholders})", [str(i) for i in range(1200)]
+    )
+
+    assert found == {str(i) for i in range(0, 1200, 2)}
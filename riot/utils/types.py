@@ -35,3 +35,13 @@ class DivisionType(enum.StrEnum):
     II = "II"
     III = "III"
     IV = "IV"
+
+
+class EndpointType(enum.StrEnum):
+    """Riot API methods, used to key per-endpoint (method) rate limits and policies."""
+
+    APEX_LEAGUE = "apex-league"
+    LEAGUE_ENTRIES = "league-entries"
+    LEAGUE_ENTRIES_BY_SUMMONER = "league-entries-by-summoner"
+    MATCH_IDS_BY_PUUID = "match-ids-by-puuid"
+    MATCH = "match"